@@ -1,35 +1,44 @@
+import os
+import sys
+
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.columnar import read_frame
+from common.faq_compare import FAQ_COLUMNS, compare_on_slug, duplicates_frame, marks, print_duplicates
+
 def compare_faq_content(contentful_file='extracted_faqs.csv',
                        strapi_file='extracted_strapi_faqs.csv',
                        output_missing='result/missing_report.csv',
-                       output_mismatch='result/new_content_mismatches_report.csv'):
+                       output_mismatch='result/new_content_mismatches_report.csv',
+                       output_duplicates='result/duplicate_slugs_report.csv'):
     stats = {
         'contentful_entries': 0,
         'strapi_entries': 0,
         'common_slugs': 0,
         'mismatches': 0,
-        'missing_total': 0
+        'missing_total': 0,
+        'duplicate_slugs': 0
     }
     
     print("Starting FAQ content comparison...")
     
     try:
         print("Loading CSV files...")
-        df_contentful = pd.read_csv(contentful_file)
-        df_strapi = pd.read_csv(strapi_file)
+        df_contentful = read_frame(contentful_file)
+        df_strapi = read_frame(strapi_file)
         
         stats['contentful_entries'] = len(df_contentful)
         stats['strapi_entries'] = len(df_strapi)
         
-        df_contentful.set_index('Slug', inplace=True)
-        df_strapi.set_index('Slug', inplace=True)
-        
-        columns_to_compare = ['Title', 'Description', 'Meta Title', 'Meta Description']
+        columns_to_compare = FAQ_COLUMNS
         
-        print("Analyzing missing slugs...")
-        missing_in_strapi = df_contentful.index.difference(df_strapi.index).tolist()
-        missing_in_contentful = df_strapi.index.difference(df_contentful.index).tolist()
+        print("Comparing content between files...")
+        comparison = compare_on_slug(df_contentful, df_strapi, columns_to_compare)
+        missing_in_strapi = comparison.missing_in_strapi
+        missing_in_contentful = comparison.missing_in_contentful
+        duplicates_df = duplicates_frame(comparison.duplicates)
+        stats['duplicate_slugs'] = len(duplicates_df)
         
         missing_slugs_df = pd.DataFrame({
             'Slug': missing_in_strapi + missing_in_contentful,
@@ -37,32 +46,17 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
         })
         stats['missing_total'] = len(missing_slugs_df)
         
-        print("Comparing content between files...")
-        common_slugs = df_contentful.index.intersection(df_strapi.index)
-        stats['common_slugs'] = len(common_slugs)
-        
-        mismatch_data = []
-        for slug in common_slugs:
-            row_contentful = df_contentful.loc[slug]
-            row_strapi = df_strapi.loc[slug]
-            
-            row_result = {'Slug': slug}
-            
-            for col in columns_to_compare:
-                val_contentful = str(row_contentful[col]).strip() if pd.notna(row_contentful[col]) else ""
-                val_strapi = str(row_strapi[col]).strip() if pd.notna(row_strapi[col]) else ""
-                
-                row_result[col] = '✅' if val_contentful == val_strapi else '❌'
-                
-            mismatch_data.append(row_result)
+        stats['common_slugs'] = len(comparison.equal)
         
-        mismatch_df = pd.DataFrame(mismatch_data)
-        stats['mismatches'] = len(mismatch_df[mismatch_df.eq('❌').any(axis=1)])
+        mismatch_df = marks(comparison.equal, '✅', '❌').reset_index()
+        stats['mismatches'] = int((~comparison.equal).any(axis=1).sum())
         
         print("Saving results...")
         missing_slugs_df.to_csv(output_missing, index=False)
         if not mismatch_df.empty:
             mismatch_df.to_csv(output_mismatch, index=False)
+        if stats['duplicate_slugs']:
+            duplicates_df.to_csv(output_duplicates, index=False)
         
         print("\n" + "="*50)
         print(" FAQ Content Comparison Report ")
@@ -73,6 +67,7 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
         print(f"\nMissing Entries: {stats['missing_total']}")
         print(f"  - Missing in Strapi: {len(missing_in_strapi)}")
         print(f"  - Missing in Contentful: {len(missing_in_contentful)}")
+        print_duplicates(comparison.duplicates)
         print(f"\nContent Mismatches Found: {stats['mismatches']}")
         
         if stats['mismatches'] > 0:
@@ -82,6 +77,8 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
         print("\nOutput Files:")
         print(f"  - Missing Slugs: {output_missing}")
         print(f"  - Content Mismatches: {output_mismatch if not mismatch_df.empty else 'No mismatches found'}")
+        if stats['duplicate_slugs']:
+            print(f"  - Duplicate Slugs: {output_duplicates}")
         
         print("\nComparison completed successfully!")
         
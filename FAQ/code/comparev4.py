@@ -1,9 +1,17 @@
+import os
+import sys
+
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.columnar import read_frame
+from common.faq_compare import FAQ_COLUMNS, compare_on_slug, duplicates_frame, marks, print_duplicates
+
 def compare_faq_content(contentful_file='extracted_faqs.csv', 
                        strapi_file='extracted_strapi_faqs.csv',
                        output_missing='result/missing_report.csv',
-                       output_mismatch='result/content_mismatches_report.csv'):
+                       output_mismatch='result/content_mismatches_report.csv',
+                       output_duplicates='result/duplicate_slugs_report.csv'):
     
     # Initialize statistics
     stats = {
@@ -11,7 +19,8 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
         'strapi_entries': 0,
         'common_slugs': 0,
         'mismatches': 0,
-        'missing_total': 0
+        'missing_total': 0,
+        'duplicate_slugs': 0
     }
     
     print("Starting FAQ content comparison...")
@@ -19,22 +28,21 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
     # Load the CSV files
     print("Loading CSV files...")
     try:
-        df_contentful = pd.read_csv(contentful_file)
-        df_strapi = pd.read_csv(strapi_file)
+        df_contentful = read_frame(contentful_file)
+        df_strapi = read_frame(strapi_file)
         
         stats['contentful_entries'] = len(df_contentful)
         stats['strapi_entries'] = len(df_strapi)
         
-        # Set 'Slug' as the index
-        df_contentful.set_index('Slug', inplace=True)
-        df_strapi.set_index('Slug', inplace=True)
-        
-        columns_to_compare = ['Title', 'Description', 'Meta Title', 'Meta Description']
+        columns_to_compare = FAQ_COLUMNS
         
-        # Find missing slugs
-        print("Analyzing missing slugs...")
-        missing_in_strapi = df_contentful.index.difference(df_strapi.index).tolist()
-        missing_in_contentful = df_strapi.index.difference(df_contentful.index).tolist()
+        # One join on Slug: missing and duplicated slugs, and per-column equality of the common ones
+        print("Comparing content between files...")
+        comparison = compare_on_slug(df_contentful, df_strapi, columns_to_compare)
+        missing_in_strapi = comparison.missing_in_strapi
+        missing_in_contentful = comparison.missing_in_contentful
+        duplicates_df = duplicates_frame(comparison.duplicates)
+        stats['duplicate_slugs'] = len(duplicates_df)
         
         missing_slugs_df = pd.DataFrame({
             'Slug': missing_in_strapi + missing_in_contentful,
@@ -42,32 +50,19 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
         })
         stats['missing_total'] = len(missing_slugs_df)
         
-        # Compare content
-        print("Comparing content between files...")
-        common_slugs = df_contentful.index.intersection(df_strapi.index)
-        stats['common_slugs'] = len(common_slugs)
+        stats['common_slugs'] = len(comparison.equal)
         
         # Create a DataFrame for the comparison report
-        comparison_report = pd.DataFrame(index=common_slugs, columns=columns_to_compare)
-        
-        for slug in common_slugs:
-            row_contentful = df_contentful.loc[slug]
-            row_strapi = df_strapi.loc[slug]
-            
-            for col in columns_to_compare:
-                val_contentful = str(row_contentful[col]).strip() if pd.notna(row_contentful[col]) else ""
-                val_strapi = str(row_strapi[col]).strip() if pd.notna(row_strapi[col]) else ""
-                
-                if val_contentful == val_strapi:
-                    comparison_report.at[slug, col] = '✓'
-                else:
-                    comparison_report.at[slug, col] = '✗'
-                    stats['mismatches'] += 1
+        comparison_report = marks(comparison.equal, '✓', '✗')
+        mismatch_counts = (~comparison.equal).sum()
+        stats['mismatches'] = int(mismatch_counts.sum())
         
         # Save results
         print("Saving results...")
         missing_slugs_df.to_csv(output_missing, index=False)
         comparison_report.to_csv(output_mismatch)
+        if stats['duplicate_slugs']:
+            duplicates_df.to_csv(output_duplicates, index=False)
         
         # Generate detailed report
         print("\n" + "="*50)
@@ -79,19 +74,21 @@ def compare_faq_content(contentful_file='extracted_faqs.csv',
         print(f"\nMissing Entries: {stats['missing_total']}")
         print(f"  - Missing in Strapi: {len(missing_in_strapi)}")
         print(f"  - Missing in Contentful: {len(missing_in_contentful)}")
+        print_duplicates(comparison.duplicates)
         print(f"\nContent Mismatches Found: {stats['mismatches']}")
         
         if stats['mismatches'] > 0:
             print("\nMismatch Summary by Field:")
-            mismatch_counts = comparison_report.apply(lambda x: x.value_counts().get('✗', 0))
             for field, count in mismatch_counts.items():
                 print(f"  - {field}: {count} mismatches")
         
         print("\nOutput Files:")
         print(f"  - Missing Slugs: {output_missing}")
         print(f"  - Content Mismatches: {output_mismatch if stats['mismatches'] > 0 else 'No mismatches found'}")
+        if stats['duplicate_slugs']:
+            print(f"  - Duplicate Slugs: {output_duplicates}")
         
-        if stats['missing_total'] > 0 or stats['mismatches'] > 0:
+        if stats['missing_total'] > 0 or stats['mismatches'] > 0 or stats['duplicate_slugs'] > 0:
             print("\nNote: Please review the output files for detailed differences")
         
         print("\nComparison completed successfully!")
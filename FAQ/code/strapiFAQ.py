@@ -1,7 +1,11 @@
 import json
-import csv
+import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.columnar import open_row_writer
+
 # Load JSON data
 file_path = "strapiFAQ.json"
 with open(file_path, "r", encoding="utf-8") as file:
@@ -29,12 +33,10 @@ for item in data.get("data", []):
     data_dict[entry_id]["metaTitle"] = data_dict[entry_id]["metaTitle"] or meta_title
     data_dict[entry_id]["metaDescription"] += (" " + meta_description if meta_description else "")
 
-# Write to CSV
-output_file = "extracted_strapi_faqs.csv"
-with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
-    fieldnames = ["Id", "Title", "Description", "Slug", "Meta Title", "Meta Description"]
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-    writer.writeheader()
+# Write to CSV (a .arrow/.feather path writes Arrow IPC instead)
+output_file = os.getenv("STRAPI_FAQ_OUTPUT", "extracted_strapi_faqs.csv")
+fieldnames = ["Id", "Title", "Description", "Slug", "Meta Title", "Meta Description"]
+with open_row_writer(output_file, fieldnames) as writer:
     
     for entry_id, values in data_dict.items():
         writer.writerow({
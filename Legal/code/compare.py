@@ -1,10 +1,16 @@
 import csv
 import difflib
+import os
 import re
+import sys
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.normalize import normalize_boolean as normalize_text
+from common.columnar import read_rows
+
 # Configuration
 CONTENTFUL_CSV = "Legal/data/content_extracted_data.csv"
 STRAPI_CSV = "Legal/data/strapi_extracted_data.csv"
@@ -14,16 +20,6 @@ OUTPUT_CSV = "Legal/data/Match.csv"
 CONTENT_SIMILARITY_THRESHOLD = 0.95
 METADATA_SIMILARITY_THRESHOLD = 0.98
 
-BOOLEAN_MAPPING = {"yes": "true", "no": "false"}
-
-def normalize_text(text):
-    """Cleans and normalizes text for comparison."""
-    if not isinstance(text, str):
-        text = str(text)
-    text = re.sub(r'[^a-zA-Z0-9 ]+', ' ', text)  # Remove special characters
-    text = re.sub(r'\s+', ' ', text).strip().lower()  # Convert to lowercase
-    return BOOLEAN_MAPPING.get(text, text)
-
 def clean_title(title):
     """Removes special characters and converts title to lowercase for better matching."""
     if not isinstance(title, str):
@@ -49,18 +45,16 @@ def calculate_field_similarity(text1, text2):
 def load_data(file_path, fields):
     """Loads CSV data into a dictionary for comparison."""
     data = defaultdict(dict)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                title_key = clean_title(row.get('Title', ''))
-                if not title_key:
-                    continue  # Skip if no Title is available
-                
-                for field in fields:
-                    data[title_key][field] = normalize_text(row.get(field, ''))
-            except KeyError as e:
-                print(f"Missing expected field {e} in row: {row}")
+    for row in read_rows(file_path, ['Title'] + fields):  # CSV or Arrow (memory-mapped, only these columns)
+        try:
+            title_key = clean_title(row.get('Title', ''))
+            if not title_key:
+                continue  # Skip if no Title is available
+            
+            for field in fields:
+                data[title_key][field] = normalize_text(row.get(field, ''))
+        except KeyError as e:
+            print(f"Missing expected field {e} in row: {row}")
     return data
 
 # Fields for comparison
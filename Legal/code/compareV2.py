@@ -1,11 +1,20 @@
+import argparse
 import csv
 import difflib
+import os
 import re
+import sys
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.similarity import add_similarity_argument, precompute_similarities
+from common.fingerprint import add_fingerprints, fingerprints_match
+from common.normalize import normalize_boolean as normalize_text
+from common.columnar import read_rows
+
 # Configuration
 CONTENTFUL_CSV = "data/content_extracted_data.csv"
 STRAPI_CSV = "data/strapi_extracted_data.csv"
@@ -16,15 +25,11 @@ SUMMARY_TXT = "data/Match_Summary.txt"
 CONTENT_SIMILARITY_THRESHOLD = 0.95
 METADATA_SIMILARITY_THRESHOLD = 0.98
 
-BOOLEAN_MAPPING = {"yes": "true", "no": "false"}
-
-def normalize_text(text):
-    """Cleans and normalizes text for comparison."""
-    if not isinstance(text, str):
-        text = str(text)
-    text = re.sub(r'[^a-zA-Z0-9 ]+', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip().lower()
-    return BOOLEAN_MAPPING.get(text, text)
+# Similarity engine, chosen with --similarity: "pair" fits a TF-IDF model per pair, "batch" fits one per
+# field for the whole corpus
+parser = argparse.ArgumentParser(description="Compare Contentful and Strapi legal pages field by field")
+add_similarity_argument(parser)
+SIMILARITY_ENGINE = parser.parse_args().similarity
 
 def clean_title(title):
     """Removes special characters and converts title to lowercase for better matching."""
@@ -51,17 +56,16 @@ def calculate_field_similarity(text1, text2):
 def load_data(file_path, fields):
     """Loads CSV data into a dictionary for comparison."""
     data = defaultdict(dict)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                title_key = clean_title(row.get('Title', ''))
-                if not title_key:
-                    continue
-                for field in fields:
-                    data[title_key][field] = normalize_text(row.get(field, ''))
-            except KeyError as e:
-                print(f"Missing expected field {e} in row: {row}")
+    for row in read_rows(file_path, ['Title'] + fields):  # CSV or Arrow (memory-mapped, only these columns)
+        try:
+            title_key = clean_title(row.get('Title', ''))
+            if not title_key:
+                continue
+            for field in fields:
+                data[title_key][field] = normalize_text(row.get(field, ''))
+            add_fingerprints(data[title_key], fields)
+        except KeyError as e:
+            print(f"Missing expected field {e} in row: {row}")
     return data
 
 # Fields for comparison
@@ -74,6 +78,11 @@ strapi_data = load_data(STRAPI_CSV, FIELDS_TO_COMPARE)
 # Get unique Titles for comparison
 all_titles = set(contentful_data.keys()).union(set(strapi_data.keys()))
 
+scores = None
+if SIMILARITY_ENGINE == "batch":
+    scores = precompute_similarities(contentful_data, strapi_data, all_titles,
+                                     {field: field for field in FIELDS_TO_COMPARE})
+
 # Enhanced reporting data structures
 mismatch_counts = defaultdict(int)
 field_mismatches = defaultdict(int)
@@ -98,7 +107,13 @@ for title in all_titles:
             status = 'Missing Data'
             missing_data += 1
         else:
-            similarity = round(calculate_field_similarity(c_value, s_value), 3)
+            if fingerprints_match(contentful_data[title], strapi_data[title], field, field):
+                score = 1.0  # Identical normalized values, no need to score
+            elif scores is not None:
+                score = scores[(title, field)]
+            else:
+                score = calculate_field_similarity(c_value, s_value)
+            similarity = round(score, 3)
             if similarity == 1.0:
                 status = 'Perfect Match'
                 perfect_matches += 1
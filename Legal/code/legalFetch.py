@@ -1,7 +1,11 @@
 import json
-import csv
+import os
 import re
-from html import unescape
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from common.columnar import open_row_writer
+from common.html_text import html_to_text
 
 # Load the JSON file
 json_file_path = "data/strapi.json"
@@ -9,24 +13,22 @@ json_file_path = "data/strapi.json"
 with open(json_file_path, "r", encoding="utf-8") as file:
     data = json.load(file)
 
-# Open CSV file for writing
-csv_file_path = "data/strapi_extracted_data.csv"
+# Open output file for writing (a .arrow/.feather path writes Arrow IPC instead of CSV)
+csv_file_path = os.getenv("LEGAL_STRAPI_OUTPUT", "data/strapi_extracted_data.csv")
 
-with open(csv_file_path, "w", newline="", encoding="utf-8") as csvfile:
-    csv_writer = csv.writer(csvfile)
+# Header (dates removed)
+HEADER = [
+    "ID", "Name", "Title", "Meta Title", "Meta Description",
+    "Canonical", "Contentful ID", "Mapping Name", "Content Menu", "Content"
+]
 
-    # Write header (dates removed)
-    csv_writer.writerow([
-        "ID", "Name", "Title", "Meta Title", "Meta Description",
-        "Canonical", "Contentful ID", "Mapping Name", "Content Menu", "Content"
-    ])
+with open_row_writer(csv_file_path, HEADER) as csv_writer:
 
     def clean_html(text):
         """Removes HTML tags and decodes HTML entities (like &nbsp;, &amp;)"""
         if not isinstance(text, str):
             return "N/A"
-        text = unescape(text)  # Convert HTML entities (e.g., &nbsp; -> space, &amp; -> &)
-        text = re.sub(r"<.*?>", "", text)  # Remove HTML tags
+        text = html_to_text(text, separator="")  # Drop tags (even multi-line ones), decode entities (&nbsp;, &amp;)
         text = re.sub(r"\s+", " ", text).strip()  # Normalize spaces
         return text if text else "N/A"
 
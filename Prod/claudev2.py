@@ -1,10 +1,24 @@
+import argparse
 import csv
 import difflib
-import re
+import os
+import sys
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.similarity import add_similarity_argument, precompute_similarities, threshold_similarity
+from common.parallel_compare import compare_items
+from common.fingerprint import FINGERPRINTS, add_fingerprints, fingerprints_match
+from common.diff_store import (
+    MAX_DIFF_BYTES, MAX_DIFF_LINES, MAX_DIFF_SECONDS, DiffWriter, diff_artifact_path, diff_key, diff_reference,
+    format_references, parse_references
+)
+from common.normalize import normalize_content as normalize_text
+from common.columnar import read_rows
+from common.profiling import PROFILER, add_profile_arguments
+
 # Configuration
 CONTENTFUL_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/updateextracted_contentful_data.csv"
 STRAPI_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/new_Strapi_prod.csv"
@@ -15,14 +29,6 @@ CONTENT_SIMILARITY_THRESHOLD = 0.95  # More lenient for content
 METADATA_SIMILARITY_THRESHOLD = 0.98  # Stricter for metadata fields
 EXACT_MATCH_FIELDS = {'categoryName', 'timeDuration'}  # Fields requiring exact matches
 
-def normalize_text(text):
-    """Enhanced text normalization"""
-    if not isinstance(text, str):
-        text = str(text)
-    text = re.sub(r'\W+', ' ', text)  # Remove non-word characters
-    text = re.sub(r'\s+', ' ', text).strip().lower()
-    return text
-
 def calculate_field_similarity(text1, text2, field_name):
     """Calculate similarity between two fields using appropriate method"""
     if not text1 and not text2:
@@ -43,30 +49,20 @@ def calculate_field_similarity(text1, text2, field_name):
         # Fallback to sequence matcher if TF-IDF fails
         return difflib.SequenceMatcher(None, text1, text2).ratio()
 
-def generate_field_diff(text1, text2, field_name):
-    """Generate detailed diff for field mismatches"""
-    differ = difflib.HtmlDiff(wrapcolumn=60)
-    return differ.make_table(
-        text1.splitlines(), 
-        text2.splitlines(),
-        context=True,
-        numlines=2,
-        fromdesc=f'Contentful {field_name}',
-        todesc=f'Strapi {field_name}'
-    )
-
 def load_data(file_path, fields):
     """Load data with enhanced error handling and validation"""
     data = defaultdict(dict)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                link = row['linkUrl'].strip()
+    rows = read_rows(file_path, ['linkUrl'] + fields)  # CSV or Arrow (memory-mapped, only these columns)
+    for row in PROFILER.iterate(rows, "read"):
+        try:
+            link = row['linkUrl'].strip()
+            with PROFILER.step("normalize"):
                 for field in fields:
                     data[link][field] = normalize_text(row.get(field, ''))
-            except KeyError as e:
-                print(f"Missing expected field {e} in row: {row}")
+            with PROFILER.step("fingerprint"):
+                add_fingerprints(data[link], fields)
+        except KeyError as e:
+            print(f"Missing expected field {e} in row: {row}")
     return data
 
 # Field mappings between systems
@@ -85,88 +81,171 @@ FIELD_MAPPINGS = {
     'timeDuration': 'timeDuration'
 }
 
-# Load datasets
-contentful_data = load_data(CONTENTFUL_CSV, CONTENTFUL_FIELDS)
-strapi_data = load_data(STRAPI_CSV, STRAPI_FIELDS)
-
-# Find all unique URLs
-all_urls = set(contentful_data.keys()).union(set(strapi_data.keys()))
-
-with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
-    writer = csv.writer(csvfile)
-    headers = [
-        'linkUrl', 'status', 'field_similarities', 'field_mismatches',
-        'missing_in_strapi', 'missing_in_contentful', 'detailed_diffs'
-    ]
-    writer.writerow(headers)
-
-    for url in all_urls:
-        row_data = {
-            'linkUrl': url,
-            'status': '✅ Valid',
-            'field_similarities': {},
-            'field_mismatches': [],
-            'missing_in_strapi': '❌' if url not in strapi_data else '',
-            'missing_in_contentful': '❌' if url not in contentful_data else '',
-            'detailed_diffs': {}
-        }
-
-        # Check for existence in both systems
-        if not strapi_data.get(url) or not contentful_data.get(url):
-            row_data['status'] = '❌ Missing'
-            writer.writerow([
-                row_data['linkUrl'],
-                row_data['status'],
-                '',
-                '',
-                row_data['missing_in_strapi'],
-                row_data['missing_in_contentful'],
-                ''
-            ])
-            continue
-
-        # Compare all fields
-        for contentful_field, strapi_field in FIELD_MAPPINGS.items():
-            c_value = contentful_data[url].get(contentful_field, '')
-            s_value = strapi_data[url].get(strapi_field, '')
-
-            if contentful_field in EXACT_MATCH_FIELDS:
-                # Exact match check
-                similarity = 1.0 if c_value == s_value else 0.0
-                if similarity < 1.0:
-                    row_data['field_mismatches'].append(
-                        f"{contentful_field} (Exact match required)"
-                    )
-            else:
-                # Calculate similarity based on field type
-                similarity = calculate_field_similarity(c_value, s_value, contentful_field)
-                threshold = (CONTENT_SIMILARITY_THRESHOLD 
-                           if contentful_field == 'content' 
-                           else METADATA_SIMILARITY_THRESHOLD)
-                
-                if similarity < threshold:
-                    row_data['field_mismatches'].append(
-                        f"{contentful_field} (Similarity: {similarity:.2f})"
-                    )
-                    row_data['detailed_diffs'][contentful_field] = generate_field_diff(
-                        c_value, s_value, contentful_field
-                    )
-
-            row_data['field_similarities'][contentful_field] = round(similarity, 3)
-
-        # Update final status
-        if row_data['field_mismatches']:
-            row_data['status'] = '❌ Mismatch'
-
-        # Write row to CSV
-        writer.writerow([
+HEADERS = [
+    'linkUrl', 'status', 'field_similarities', 'field_mismatches',
+    'missing_in_strapi', 'missing_in_contentful', 'detailed_diffs'
+]
+
+# Validate one URL and build its CSV row. Entries are None when the URL is missing on that side;
+# `scores` holds batch-computed similarities keyed by (url, field), or None to score each pair here.
+# With `bounded`, clear mismatches are settled from an upper bound, shown as "≤0.412" in field_similarities.
+# Mismatching fields only get a reference into the diff artifact; main() writes the diffs afterwards.
+def validate_url(url, contentful_entry, strapi_entry, scores=None, bounded=False, diff_artifact=''):
+    row_data = {
+        'linkUrl': url,
+        'status': '✅ Valid',
+        'field_similarities': {},
+        'field_mismatches': [],
+        'missing_in_strapi': '❌' if strapi_entry is None else '',
+        'missing_in_contentful': '❌' if contentful_entry is None else '',
+        'detailed_diffs': {}
+    }
+
+    # Check for existence in both systems
+    if not strapi_entry or not contentful_entry:
+        row_data['status'] = '❌ Missing'
+        return [
             row_data['linkUrl'],
             row_data['status'],
-            '; '.join([f"{k}: {v}" for k, v in row_data['field_similarities'].items()]),
-            '; '.join(row_data['field_mismatches']),
+            '',
+            '',
             row_data['missing_in_strapi'],
             row_data['missing_in_contentful'],
-            '\n'.join([f"{k}:\n{v}" for k, v in row_data['detailed_diffs'].items()])
-        ])
+            ''
+        ]
+
+    # Compare all fields
+    for contentful_field, strapi_field in FIELD_MAPPINGS.items():
+        c_value = contentful_entry.get(contentful_field, '')
+        s_value = strapi_entry.get(strapi_field, '')
+        exact = True
+
+        if contentful_field in EXACT_MATCH_FIELDS:
+            # Exact match check
+            similarity = 1.0 if c_value == s_value else 0.0
+            if similarity < 1.0:
+                row_data['field_mismatches'].append(
+                    f"{contentful_field} (Exact match required)"
+                )
+        else:
+            threshold = (CONTENT_SIMILARITY_THRESHOLD 
+                       if contentful_field == 'content' 
+                       else METADATA_SIMILARITY_THRESHOLD)
+
+            # Calculate similarity based on field type
+            if fingerprints_match(contentful_entry, strapi_entry, contentful_field, strapi_field):
+                similarity = 1.0  # Identical normalized values, no need to score
+            elif scores is not None:
+                similarity = scores[(url, contentful_field)]
+            elif bounded:
+                with PROFILER.step(f"similarity:{contentful_field}"):
+                    similarity, _, exact = threshold_similarity(c_value, s_value, threshold)
+            else:
+                with PROFILER.step(f"similarity:{contentful_field}"):
+                    similarity = calculate_field_similarity(c_value, s_value, contentful_field)
+            
+            if similarity < threshold:
+                row_data['field_mismatches'].append(
+                    f"{contentful_field} (Similarity: {'' if exact else '≤'}{similarity:.2f})"
+                )
+                row_data['detailed_diffs'][contentful_field] = diff_reference(diff_artifact, diff_key(
+                    contentful_entry[FINGERPRINTS][contentful_field], strapi_entry[FINGERPRINTS][strapi_field]
+                ))
+
+        row_data['field_similarities'][contentful_field] = (
+            round(similarity, 3) if exact else f"≤{round(similarity, 3)}"
+        )
+
+    # Update final status
+    if row_data['field_mismatches']:
+        row_data['status'] = '❌ Mismatch'
+
+    return [
+        row_data['linkUrl'],
+        row_data['status'],
+        '; '.join([f"{k}: {v}" for k, v in row_data['field_similarities'].items()]),
+        '; '.join(row_data['field_mismatches']),
+        row_data['missing_in_strapi'],
+        row_data['missing_in_contentful'],
+        format_references(row_data['detailed_diffs'])
+    ]
 
-print(f"Enhanced validation complete! Results saved to {OUTPUT_CSV}")
\ No newline at end of file
+# validate_url timed as one document for --profile (size = characters of content on both sides)
+def profiled_validate_url(url, contentful_entry, strapi_entry, scores=None, bounded=False, diff_artifact=''):
+    size = len((contentful_entry or {}).get('content', '')) + len((strapi_entry or {}).get('strapi_content', ''))
+    with PROFILER.document(url, size):
+        return validate_url(url, contentful_entry, strapi_entry, scores, bounded, diff_artifact)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Field-by-field validation of Contentful vs Strapi blog exports")
+    parser.add_argument('--contentful', default=CONTENTFUL_CSV)
+    parser.add_argument('--strapi', default=STRAPI_CSV)
+    parser.add_argument('--output', default=OUTPUT_CSV)
+    add_similarity_argument(parser)
+    parser.add_argument('--scoring', choices=['exact', 'bounded'], default='exact',
+                        help="bounded = settle clear mismatches from cheap upper bounds (pair similarity only)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to score URLs (1 = serial); output is identical either way")
+    parser.add_argument('--diff-max-bytes', type=int, default=MAX_DIFF_BYTES, help="Size cap per field diff")
+    parser.add_argument('--diff-max-seconds', type=float, default=MAX_DIFF_SECONDS, help="Time cap per field diff")
+    parser.add_argument('--diff-max-lines', type=int, default=MAX_DIFF_LINES,
+                        help="Lines per side aligned per field diff")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.profile and args.workers > 1:
+        parser.error("--profile measures this process only; run it with --workers 1")
+    return args
+
+def main():
+    args = parse_args()
+    PROFILER.configure(args)
+
+    # Load datasets
+    with PROFILER.stage("load"):
+        contentful_data = load_data(args.contentful, CONTENTFUL_FIELDS)
+        strapi_data = load_data(args.strapi, STRAPI_FIELDS)
+
+    # Find all unique URLs (sorted so the report order is deterministic)
+    all_urls = sorted(set(contentful_data.keys()).union(set(strapi_data.keys())))
+
+    url_scores = defaultdict(dict)
+    if args.similarity == "batch":
+        with PROFILER.stage("batch similarity"):
+            scores = precompute_similarities(
+                contentful_data, strapi_data, all_urls,
+                {c: s for c, s in FIELD_MAPPINGS.items() if c not in EXACT_MATCH_FIELDS}
+            )
+        for (url, field), score in scores.items():
+            url_scores[url][(url, field)] = score
+
+    bounded = args.scoring == "bounded" and args.similarity == "pair"
+    diff_path = diff_artifact_path(args.output)
+    items = [
+        (url, contentful_data.get(url), strapi_data.get(url),
+         url_scores.get(url, {}) if args.similarity == "batch" else None, bounded, diff_path)
+        for url in all_urls
+    ]
+    with PROFILER.stage("compare"):
+        rows = compare_items(profiled_validate_url if args.profile else validate_url, items, workers=args.workers)
+
+    # Diffs only for the referenced mismatches, once per distinct pair of values, capped in size and time
+    with PROFILER.stage("diffs"), DiffWriter(diff_path, context=2, max_bytes=args.diff_max_bytes,
+                                             max_seconds=args.diff_max_seconds,
+                                             max_lines=args.diff_max_lines) as diffs:
+        for url, row in zip(all_urls, rows):
+            for field, key in parse_references(row[-1]):
+                with PROFILER.step(f"diff:{field}"):
+                    diffs.add(contentful_data[url][field], strapi_data[url][FIELD_MAPPINGS[field]], field,
+                              f'Contentful {field}', f'Strapi {field}', key=key)
+
+    with PROFILER.stage("write"), open(args.output, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+    print(f"Enhanced validation complete! Results saved to {args.output}")
+    print(f"🔍 {len(diffs.keys)} field diffs ({diffs.truncated} truncated) saved to {diff_path}")
+    PROFILER.report()
+
+if __name__ == "__main__":
+    main()
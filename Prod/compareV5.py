@@ -1,11 +1,24 @@
+import argparse
 import csv
 import difflib
-import re
+import os
+import sys
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.state_store import StateStore, default_state_path, row_hash
+from common.similarity import add_similarity_argument, precompute_similarities, threshold_similarity
+from common.parallel_compare import compare_items
+from common.fingerprint import FINGERPRINTS, add_fingerprints, fingerprints_match
+from common.normalize import normalize_boolean as normalize_text
+from common.external_sort import DEFAULT_RUN_BYTES, merge_join, sorted_records
+from common.columnar import read_rows
+from common.summary import SummaryCounter, print_breakdown, save_summary, summarize_frame
+from common.profiling import PROFILER, add_profile_arguments
+
 # Configuration
 CONTENTFUL_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/updateextracted_contentful_data.csv"
 STRAPI_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/new_Strapi_prod.csv"
@@ -17,15 +30,6 @@ METADATA_SIMILARITY_THRESHOLD = 0.98
 EXACT_MATCH_FIELDS = {'categoryName', 'timeDuration'}
 BOOLEAN_FIELDS = {'isThisAPrimaryArticle', 'isThisAFeaturedArticle'}
 
-BOOLEAN_MAPPING = {"yes": "true", "no": "false"}
-
-def normalize_text(text):
-    if not isinstance(text, str):
-        text = str(text)
-    text = re.sub(r'[^a-zA-Z0-9 ]+', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip().lower()
-    return BOOLEAN_MAPPING.get(text, text)
-
 def calculate_field_similarity(text1, text2):
     if not text1 and not text2:
         return 1.0
@@ -42,19 +46,36 @@ def calculate_field_similarity(text1, text2):
     except:
         return difflib.SequenceMatcher(None, text1, text2).ratio()
 
+# Accepts the CSV exports or Arrow files (.arrow/.feather), which are read memory-mapped, only `fields`
 def load_data(file_path, fields):
     data = defaultdict(dict)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                link = row['linkUrl'].strip()
+    for row in PROFILER.iterate(read_rows(file_path, ['linkUrl'] + fields), "read"):
+        try:
+            link = row['linkUrl'].strip()
+            with PROFILER.step("normalize"):
                 for field in fields:
                     data[link][field] = normalize_text(row.get(field, ''))
-            except KeyError as e:
-                print(f"Missing expected field {e} in row: {row}")
+            with PROFILER.step("fingerprint"):
+                add_fingerprints(data[link], fields)
+        except KeyError as e:
+            print(f"Missing expected field {e} in row: {row}")
     return data
 
+# Same entries as load_data, but streamed from disk in linkUrl order (see common.external_sort)
+def stream_data(file_path, fields, max_bytes=DEFAULT_RUN_BYTES):
+    def prepare(row):
+        try:
+            link = row['linkUrl'].strip()
+        except (KeyError, AttributeError):
+            print(f"Missing expected field 'linkUrl' in row: {row}")
+            return None
+        with PROFILER.step("normalize"):
+            entry = {field: normalize_text(row.get(field, '')) for field in fields}
+        with PROFILER.step("fingerprint"):
+            return link, add_fingerprints(entry, fields)
+
+    return sorted_records(read_rows(file_path, ['linkUrl'] + fields), prepare, max_bytes=max_bytes)
+
 CONTENTFUL_FIELDS = ['contentfulId', 'title', 'metaTitle', 'metaDescription', 'linkText', 
                     'categoryName', 'timeDuration', 'content']
 STRAPI_FIELDS = ['contentfulId', 'title', 'metaTitle', 'metaDescription', 'linkText', 
@@ -71,30 +92,59 @@ FIELD_MAPPINGS = {
     'contentfulId': 'contentfulId'
 }
 
-# Load data
-contentful_data = load_data(CONTENTFUL_CSV, CONTENTFUL_FIELDS)
-strapi_data = load_data(STRAPI_CSV, STRAPI_FIELDS)
-all_urls = set(contentful_data.keys()).union(set(strapi_data.keys()))
+# Define column order
+base_fields = ['linkUrl']
+content_fields = sorted([f for f in FIELD_MAPPINGS.keys() if f != 'linkUrl'])
+ordered_columns = base_fields + [item for field in content_fields for item in [
+    f'{field}_contentful',
+    f'{field}_strapi',
+    f'{field}_similarity',
+    f'{field}_status'
+]]
+# Bounded scoring adds a per-field column saying whether the verdict came from a bound or an exact score
+bounded_columns = base_fields + [item for field in content_fields for item in [
+    f'{field}_contentful',
+    f'{field}_strapi',
+    f'{field}_similarity',
+    f'{field}_status',
+    f'{field}_scoring'
+]]
 
-# Prepare data for reporting
-results = []
-for url in all_urls:
+# Compare one URL across all mapped fields; returns None when there is nothing to report.
+# `scores` holds batch-computed similarities keyed by (url, field); without it each pair is scored on its own,
+# exactly or (with `bounded`) stopping at an upper bound as soon as it falls below the field's threshold.
+def compare_url(url, contentful_entry, strapi_entry, scores=None, bounded=False):
     row = {'linkUrl': url}
     for contentful_field, strapi_field in FIELD_MAPPINGS.items():
-        c_value = contentful_data.get(url, {}).get(contentful_field, 'MISSING')
-        s_value = strapi_data.get(url, {}).get(strapi_field, 'MISSING')
+        c_value = contentful_entry.get(contentful_field, 'MISSING')
+        s_value = strapi_entry.get(strapi_field, 'MISSING')
 
         # Skip if both values are empty or missing
         if (c_value in ['n a', '', 'MISSING']) and (s_value in ['n a', '', 'MISSING']):
             continue
             
         # Calculate similarity
-        similarity = 'MISSING' if (c_value == 'MISSING' or s_value == 'MISSING') else round(calculate_field_similarity(c_value, s_value), 3)
+        threshold = CONTENT_SIMILARITY_THRESHOLD if contentful_field == 'content' else METADATA_SIMILARITY_THRESHOLD
+        scoring = 'exact'
+        if c_value == 'MISSING' or s_value == 'MISSING':
+            similarity = 'MISSING'
+        elif fingerprints_match(contentful_entry, strapi_entry, contentful_field, strapi_field):
+            similarity = 1.0  # Identical normalized values, no need to score
+        elif scores is not None:
+            similarity = round(scores[(url, contentful_field)], 3)
+        elif bounded:
+            with PROFILER.step(f"similarity:{contentful_field}"):
+                verdict = threshold_similarity(c_value, s_value, threshold, digits=3)
+            similarity = round(verdict.score, 3)
+            scoring = 'exact' if verdict.exact else 'bounded'
+        else:
+            with PROFILER.step(f"similarity:{contentful_field}"):
+                similarity = round(calculate_field_similarity(c_value, s_value), 3)
         
         # Determine match status
         if similarity == 'MISSING':
             status = 'MISSING'
-        elif similarity >= (CONTENT_SIMILARITY_THRESHOLD if contentful_field == 'content' else METADATA_SIMILARITY_THRESHOLD):
+        elif similarity >= threshold:
             status = 'MATCH'
         else:
             status = 'MISMATCH'
@@ -104,42 +154,197 @@ for url in all_urls:
         row[f'{contentful_field}_strapi'] = s_value
         row[f'{contentful_field}_similarity'] = similarity
         row[f'{contentful_field}_status'] = status
+        if bounded:
+            row[f'{contentful_field}_scoring'] = scoring
     
-    if len(row) > 1:  # Only add rows with actual comparisons
-        results.append(row)
+    return row if len(row) > 1 else None  # Only add rows with actual comparisons
 
-# Convert to DataFrame for better organization
-df = pd.DataFrame(results)
+# compare_url timed as one document for --profile (size = characters of content on both sides)
+def profiled_compare_url(url, contentful_entry, strapi_entry, scores=None, bounded=False):
+    size = len(contentful_entry.get('content', '')) + len(strapi_entry.get('strapi_content', ''))
+    with PROFILER.document(url, size):
+        return compare_url(url, contentful_entry, strapi_entry, scores, bounded)
 
-# Define column order
-base_fields = ['linkUrl']
-content_fields = sorted([f for f in FIELD_MAPPINGS.keys() if f != 'linkUrl'])
-ordered_columns = base_fields + [item for field in content_fields for item in [
-    f'{field}_contentful',
-    f'{field}_strapi',
-    f'{field}_similarity',
-    f'{field}_status'
-]]
+# Hash of everything the comparison of one URL depends on (built from the load-time field fingerprints)
+def entry_hash(entry, fields):
+    prints = entry.get(FINGERPRINTS, {}) if entry is not None else {}
+    return row_hash(prints.get(field, 'MISSING') for field in fields)
+
+# Hash of the settings a verdict depends on; a change to any of them invalidates every stored verdict
+def settings_hash(args):
+    return row_hash([CONTENT_SIMILARITY_THRESHOLD, METADATA_SIMILARITY_THRESHOLD, args.similarity, args.scoring])
+
+# Previous report rows keyed by linkUrl (reused for unchanged URLs in incremental mode)
+def load_previous_report(file_path):
+    previous = {}
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                previous[row['linkUrl']] = {key: value for key, value in row.items() if value != ''}
+    return previous
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare Contentful and Strapi blog exports field by field")
+    parser.add_argument('--contentful', default=CONTENTFUL_CSV, help="Contentful CSV or Arrow file")
+    parser.add_argument('--strapi', default=STRAPI_CSV, help="Strapi CSV or Arrow file")
+    parser.add_argument('--output', default=OUTPUT_CSV, help="Report CSV")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only re-compare URLs whose Contentful or Strapi values changed since the last "
+                             "run and merge them into the previous report")
+    parser.add_argument('--state', help="State store path (default: validation_state.sqlite next to the output)")
+    add_similarity_argument(parser)
+    parser.add_argument('--scoring', choices=['exact', 'bounded'], default='exact',
+                        help="bounded = settle clear mismatches from cheap upper bounds (pair similarity only); "
+                             "the report then shows a <field>_scoring column")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to score URLs (1 = serial); output is identical either way")
+    parser.add_argument('--stream', action='store_true',
+                        help="Constant-memory mode: external sort of both exports by linkUrl and a merge join "
+                             "instead of loading them into memory (pair similarity, no incremental/workers)")
+    parser.add_argument('--sort-buffer-mb', type=int, default=DEFAULT_RUN_BYTES // (1024 * 1024),
+                        help="Text held in memory per sorted run in --stream mode")
+    parser.add_argument('--summary-json',
+                        help="Also write the summary (per-field counts, similarity histograms) to this JSON file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.profile and args.workers > 1:
+        parser.error("--profile measures this process only; run it with --workers 1")
+    if args.stream and (args.incremental or args.similarity == 'batch' or args.workers > 1):
+        parser.error("--stream works one pair at a time; it can't be combined with "
+                     "--incremental, --similarity batch or --workers")
+    return args
+
+def print_summary(args, summary, reused=0, settled=None):
+    total_comparisons, mismatches, missing = summary['total'], summary['mismatches'], summary['missing']
+    match_rate = ((total_comparisons - mismatches - missing) / total_comparisons * 100) if total_comparisons > 0 else 0
+
+    # Print beautiful summary
+    print("\n" + "="*50)
+    print("DATA VALIDATION REPORT".center(50))
+    print("="*50)
+    print(f"Total URLs Compared: {total_comparisons}")
+    if args.incremental:
+        print(f"Reused From Previous Run: {reused}")
+    print(f"Perfect Matches: {total_comparisons - mismatches - missing}")
+    print(f"Mismatches Found: {mismatches}")
+    print(f"Missing Data Points: {missing}")
+    print(f"Overall Match Rate: {match_rate:.2f}%")
+    if settled is not None:
+        print(f"Verdicts Settled By Bounds: {settled}")
+    print("="*50)
+    print_breakdown(summary)
+    print("="*50)
+    print(f"Detailed results saved to: {args.output}")
+    if args.summary_json:
+        save_summary(summary, args.summary_json)
+        print(f"Summary saved to: {args.summary_json}")
+    print("="*50)
+
+# Streaming compare: rows are written as the merge join produces them, nothing is kept per URL
+def stream_main(args, bounded):
+    columns = bounded_columns if bounded else ordered_columns
+    max_bytes = args.sort_buffer_mb * 1024 * 1024
+    counter = SummaryCounter(content_fields)
+    settled = 0
+
+    compare_fn = profiled_compare_url if args.profile else compare_url
+
+    # One stage: sorting, joining, comparing and writing are interleaved (the steps split them up)
+    with PROFILER.stage("sort+compare+write"), open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator='\n')
+        writer.writeheader()
+        joined = merge_join(stream_data(args.contentful, CONTENTFUL_FIELDS, max_bytes),
+                            stream_data(args.strapi, STRAPI_FIELDS, max_bytes))
+        for url, contentful_entry, strapi_entry in PROFILER.iterate(joined, "sort+join"):
+            row = compare_fn(url, contentful_entry or {}, strapi_entry or {}, None, bounded)
+            if row is None:
+                continue
+            with PROFILER.step("write"):
+                writer.writerow(row)
+            counter.add(row)
+            settled += sum(1 for column in columns if column.endswith('_scoring') and row.get(column) == 'bounded')
+
+    print_summary(args, counter.summary, settled=settled if bounded else None)
+    PROFILER.report()
+
+def main():
+    args = parse_args()
+    PROFILER.configure(args)
+    bounded = args.scoring == 'bounded' and args.similarity == 'pair'
+    if args.stream:
+        stream_main(args, bounded)
+        return
+
+    # Load data
+    with PROFILER.stage("load"):
+        contentful_data = load_data(args.contentful, CONTENTFUL_FIELDS)
+        strapi_data = load_data(args.strapi, STRAPI_FIELDS)
+    all_urls = set(contentful_data.keys()).union(set(strapi_data.keys()))
+
+    state = StateStore(args.state or default_state_path(args.output))
+    previous_state = state.snapshot('compare') if args.incremental else {}
+    previous_report = load_previous_report(args.output) if args.incremental else {}
+    new_state = {}
+    reused = 0
+    settings = settings_hash(args)
+
+    # Prepare data for reporting
+    results = []
+    to_compare = []
+    for url in sorted(all_urls):
+        c_hash = entry_hash(contentful_data.get(url), CONTENTFUL_FIELDS)
+        s_hash = entry_hash(strapi_data.get(url), STRAPI_FIELDS)
+        new_state[url] = (None, row_hash([c_hash, s_hash, settings]))
+
+        # Unchanged on both sides since the last run: keep the previous verdict
+        previous = previous_state.get(url)
+        if previous and previous[1] == new_state[url][1] and url in previous_report:
+            results.append(previous_report[url])
+            reused += 1
+        else:
+            to_compare.append(url)
+
+    # Batch scores are computed up front and handed to each URL's comparison
+    url_scores = defaultdict(dict)
+    if args.similarity == 'batch':
+        with PROFILER.stage("batch similarity"):
+            # Fitted on every URL (as in a full run), scored for the ones being re-compared only
+            scores = precompute_similarities(contentful_data, strapi_data, sorted(all_urls), FIELD_MAPPINGS,
+                                             score_urls=to_compare)
+        for (url, field), score in scores.items():
+            url_scores[url][(url, field)] = score
+
+    items = [
+        (url, contentful_data.get(url, {}), strapi_data.get(url, {}),
+         url_scores.get(url, {}) if args.similarity == 'batch' else None, bounded)
+        for url in to_compare
+    ]
+    compare_fn = profiled_compare_url if args.profile else compare_url
+    with PROFILER.stage("compare"):
+        results.extend(row for row in compare_items(compare_fn, items, workers=args.workers) if row is not None)
+
+    # Deterministic report order, whatever mix of reused and freshly compared rows we have
+    results.sort(key=lambda row: row['linkUrl'])
+
+    # Convert to DataFrame for better organization
+    columns = bounded_columns if bounded else ordered_columns
+    df = pd.DataFrame(results, columns=columns)
+
+    # Reorder columns and write to CSV
+    with PROFILER.stage("write"):
+        df = df[columns]
+        df.to_csv(args.output, index=False)
+    state.replace_stage('compare', new_state)
+    state.close()
+
+    # Generate summary statistics from the status/similarity columns only
+    with PROFILER.stage("summary"):
+        summary = summarize_frame(df, content_fields)
+    settled = None
+    if bounded:
+        settled = int((df[[column for column in columns if column.endswith('_scoring')]] == 'bounded').sum().sum())
+    print_summary(args, summary, reused=reused, settled=settled)
+    PROFILER.report()
 
-# Reorder columns and write to CSV
-df = df[ordered_columns]
-df.to_csv(OUTPUT_CSV, index=False)
-
-# Generate summary statistics
-total_comparisons = len(df)
-mismatches = len(df[df.apply(lambda row: 'MISMATCH' in row.values, axis=1)])
-missing = len(df[df.apply(lambda row: 'MISSING' in row.values, axis=1)])
-match_rate = ((total_comparisons - mismatches - missing) / total_comparisons * 100) if total_comparisons > 0 else 0
-
-# Print beautiful summary
-print("\n" + "="*50)
-print("DATA VALIDATION REPORT".center(50))
-print("="*50)
-print(f"Total URLs Compared: {total_comparisons}")
-print(f"Perfect Matches: {total_comparisons - mismatches - missing}")
-print(f"Mismatches Found: {mismatches}")
-print(f"Missing Data Points: {missing}")
-print(f"Overall Match Rate: {match_rate:.2f}%")
-print("="*50)
-print(f"Detailed results saved to: {OUTPUT_CSV}")
-print("="*50)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,44 @@
 import csv
 import difflib
-import re
+import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fingerprint import add_fingerprints, fingerprint, fingerprints_match
+from common.normalize import normalize_content, normalize_metadata
+from common.columnar import read_rows
+from common.diff_store import DiffWriter, diff_artifact_path
+
 # Configuration
 CONTENTFUL_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/data/updateextracted_contentful_data.csv"
 STRAPI_CSV = "Prod/csv/new_Strapi_prod.csv"
 OUTPUT_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/Validation_Prod_V2.csv"
+DIFF_ARTIFACT = diff_artifact_path(OUTPUT_CSV)  # content_diff cells reference diffs stored here
 SIMILARITY_THRESHOLD = 0.99  # For content
 METADATA_SIMILARITY_THRESHOLD = 0.99  # For title, metaTitle, metaDescription
 EXACT_MATCH_FIELDS = {'categoryName', 'timeDuration', 'isThisAFeaturedArticle', 'isThisAPrimaryArticle'}
 METADATA_FIELDS = ['title', 'metaTitle', 'metaDescription', 'linkUrl', 'linkText']
 
-def normalize_content(text):
-    """Normalize content fields aggressively."""
-    text = re.sub(r'\W+', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip().lower()
-    return text
-
-def normalize_metadata(text):
-    """Normalize metadata fields preserving punctuation."""
-    return re.sub(r'\s+', ' ', text).strip().lower()
-
 def content_hash(text):
-    """Create a content hash using normalized content."""
-    return hash(normalize_content(text))
-
-def advanced_diff(text1, text2):
-    """Generate HTML diff for content."""
-    differ = difflib.HtmlDiff(wrapcolumn=60)
-    return differ.make_table(
-        text1.splitlines(), 
-        text2.splitlines(),
-        context=True,
-        numlines=3,
-        fromdesc='Contentful',
-        todesc='Strapi'
-    )
+    """Create a stable content fingerprint using normalized content."""
+    return fingerprint(normalize_content(text))
 
 def load_data(file_path, fields):
     """Load data preserving original values and storing normalized content hash."""
     data = defaultdict(dict)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                link = row['linkUrl'].strip()
-                for field in fields:
-                    data[link][field] = row.get(field, '')  # Store original value
-                # Handle content
-                content = row.get('content', '') if 'content' in fields else row.get('strapi_content', '')
-                data[link]['content'] = content
-                data[link]['content_hash'] = content_hash(content)
-            except KeyError as e:
-                print(f"Missing field {e} in row: {row}")
+    for row in read_rows(file_path, ['linkUrl', 'content', 'strapi_content'] + fields):  # CSV or Arrow
+        try:
+            link = row['linkUrl'].strip()
+            for field in fields:
+                data[link][field] = row.get(field, '')  # Store original value
+            # Handle content
+            content = row.get('content', '') if 'content' in fields else row.get('strapi_content', '')
+            data[link]['content'] = content
+            data[link]['content_hash'] = content_hash(content)
+            add_fingerprints(data[link], METADATA_FIELDS, normalize=normalize_metadata)
+        except KeyError as e:
+            print(f"Missing field {e} in row: {row}")
     return data
 
 # Load data with original values
@@ -68,7 +53,7 @@ for field in EXACT_MATCH_FIELDS:
     headers.extend([f'{field}_contentful', f'{field}_strapi', f'{field}_match'])
 headers.extend(['missing_in_strapi', 'missing_in_contentful'])
 
-with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
+with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile, DiffWriter(DIFF_ARTIFACT) as diffs:
     writer = csv.writer(csvfile)
     writer.writerow(headers)
 
@@ -110,10 +95,14 @@ with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
             row['content_similarity'] = round(similarity, 2)
             # Any difference results in mismatch
             row['content_match'] = '❌'
-            row['content_diff'] = advanced_diff(contentful_data[url]['content'], strapi_data[url]['strapi_content'])
+            row['content_diff'] = diffs.add(contentful_data[url]['content'], strapi_data[url]['strapi_content'],
+                                            'content')
 
         # Compare Metadata Fields - more strict checking
         for field in METADATA_FIELDS:
+            if fingerprints_match(contentful_data[url], strapi_data[url], field, field):
+                row[f'{field}_similarity'] = 1.0  # Identical normalized values, no need to score
+                continue
             c_val = normalize_metadata(row[f'{field}_contentful'])
             s_val = normalize_metadata(row[f'{field}_strapi'])
             similarity = difflib.SequenceMatcher(None, c_val, s_val).ratio()
@@ -131,4 +120,5 @@ with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
 
         writer.writerow([row[h] for h in headers])
 
-print(f"Validation complete! Results saved to {OUTPUT_CSV}")
\ No newline at end of file
+print(f"Validation complete! Results saved to {OUTPUT_CSV}")
+print(f"🔍 {len(diffs.keys)} content diffs ({diffs.truncated} truncated) saved to {DIFF_ARTIFACT}")
\ No newline at end of file
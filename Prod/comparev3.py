@@ -1,10 +1,18 @@
+import argparse
 import csv
 import difflib
-import re
+import os
+import sys
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.similarity import add_similarity_argument, precompute_similarities
+from common.fingerprint import add_fingerprints, fingerprints_match
+from common.normalize import normalize_ascii as normalize_text
+from common.columnar import read_rows
+
 # Configuration
 CONTENTFUL_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/updateextracted_contentful_data.csv"
 STRAPI_CSV = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/new_Strapi_prod.csv"
@@ -15,12 +23,11 @@ CONTENT_SIMILARITY_THRESHOLD = 0.99
 METADATA_SIMILARITY_THRESHOLD = 0.99
 EXACT_MATCH_FIELDS = {'categoryName', 'timeDuration'}
 
-def normalize_text(text):
-    if not isinstance(text, str):
-        text = str(text)
-    text = re.sub(r'[^a-zA-Z0-9 ]+', ' ', text)  # Remove special characters
-    text = re.sub(r'\s+', ' ', text).strip().lower()
-    return text
+# Similarity engine, chosen with --similarity: "pair" fits a TF-IDF model per pair, "batch" fits one per
+# field for the whole corpus
+parser = argparse.ArgumentParser(description="Compare Contentful and Strapi blog exports field by field")
+add_similarity_argument(parser)
+SIMILARITY_ENGINE = parser.parse_args().similarity
 
 def calculate_field_similarity(text1, text2):
     if not text1 and not text2:
@@ -40,15 +47,14 @@ def calculate_field_similarity(text1, text2):
 
 def load_data(file_path, fields):
     data = defaultdict(dict)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                link = row['linkUrl'].strip()
-                for field in fields:
-                    data[link][field] = normalize_text(row.get(field, ''))
-            except KeyError as e:
-                print(f"Missing expected field {e} in row: {row}")
+    for row in read_rows(file_path, ['linkUrl'] + fields):  # CSV or Arrow (memory-mapped, only these columns)
+        try:
+            link = row['linkUrl'].strip()
+            for field in fields:
+                data[link][field] = normalize_text(row.get(field, ''))
+            add_fingerprints(data[link], fields)
+        except KeyError as e:
+            print(f"Missing expected field {e} in row: {row}")
     return data
 
 CONTENTFUL_FIELDS = ['title', 'metaTitle', 'metaDescription','linkText', 'categoryName', 'timeDuration', 'content','isThisAPrimaryArticle','isThisAFeaturedArticle']
@@ -73,6 +79,10 @@ strapi_data = load_data(STRAPI_CSV, STRAPI_FIELDS)
 
 all_urls = set(contentful_data.keys()).union(set(strapi_data.keys()))
 
+scores = None
+if SIMILARITY_ENGINE == "batch":
+    scores = precompute_similarities(contentful_data, strapi_data, all_urls, FIELD_MAPPINGS)
+
 with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
     writer = csv.writer(csvfile)
     headers = ['linkUrl', 'field', 'contentful_value', 'strapi_value', 'similarity']
@@ -85,6 +95,10 @@ with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
 
             if c_value == 'MISSING' or s_value == 'MISSING':
                 similarity = 'MISSING'
+            elif fingerprints_match(contentful_data[url], strapi_data[url], contentful_field, strapi_field):
+                similarity = 1.0  # Identical normalized values, no need to score
+            elif scores is not None:
+                similarity = round(scores[(url, contentful_field)], 3)
             else:
                 similarity = round(calculate_field_similarity(c_value, s_value), 3)
             
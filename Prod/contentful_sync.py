@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.contentful_sync import CDN_URL, SyncClient, sync_snapshot
+
+# Pull Contentful entries through the Sync API into a local export the extractors can read.
+# The first run downloads everything; later runs only fetch what changed since the saved sync token.
+#
+#   CONTENTFUL_SPACE_ID=... CONTENTFUL_ACCESS_TOKEN=... python Prod/contentful_sync.py --content-type jswBlogsArticles
+#   python Prod/prod_new.py --input Prod/data/contentful_sync.json
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync Contentful entries into a local JSON export")
+    parser.add_argument("--output", default=os.path.abspath("Prod/data/contentful_sync.json"),
+                        help="Snapshot to create or update; the sync token is kept in <output>.sync.json")
+    parser.add_argument("--space", default=os.getenv("CONTENTFUL_SPACE_ID"), help="Space id (CONTENTFUL_SPACE_ID)")
+    parser.add_argument("--access-token", default=os.getenv("CONTENTFUL_ACCESS_TOKEN"),
+                        help="Content Delivery API token (CONTENTFUL_ACCESS_TOKEN)")
+    parser.add_argument("--environment", default=os.getenv("CONTENTFUL_ENVIRONMENT", "master"))
+    parser.add_argument("--base-url", default=os.getenv("CONTENTFUL_CDN_URL", CDN_URL),
+                        help="API root, e.g. a local mock (CONTENTFUL_CDN_URL)")
+    parser.add_argument("--content-type", help="Only sync entries of this content type (e.g. jswBlogsArticles)")
+    parser.add_argument("--locale", help="Keep only this locale's field values (Delivery API shape); "
+                                         "default keeps every locale, like the manual exports")
+    parser.add_argument("--full", action="store_true", help="Ignore the saved sync token and download everything")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if not args.space or not args.access_token:
+        print("❌ Error: set CONTENTFUL_SPACE_ID and CONTENTFUL_ACCESS_TOKEN (or pass --space / --access-token)")
+        return
+
+    client = SyncClient(args.space, args.access_token, environment=args.environment, base_url=args.base_url)
+    start = time.perf_counter()
+    try:
+        stats = sync_snapshot(client, args.output, content_type=args.content_type, locale=args.locale,
+                              full=args.full)
+    except (requests.RequestException, ValueError) as e:
+        print(f"❌ Sync failed after {client.request_count} requests: {e}")
+        return
+
+    mode = "Delta sync" if stats["delta"] else "Initial sync"
+    print(f"🔄 {mode}: {stats['requests']} requests in {time.perf_counter() - start:.1f}s")
+    print(f"   ➕ {stats['added']} added, ✏️ {stats['updated']} updated, 🗑️ {stats['deleted']} deleted")
+    print(f"✅ {stats['entries']} entries saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,20 @@
 import json
 import csv
 import os
-from collections.abc import Iterable
-import ijson
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.json_stream import ijson_backend
+from common.rich_text import RichTextWalker
+
+# Enhanced text extraction with improved node handling: every text key, hyperlink text
+# repeated ahead of the link's own content, walked iteratively (see common.rich_text)
+TEXT_WALKER = RichTextWalker(text_keys=['value', 'text', 'title', 'description'],
+                             child_keys=['content', 'children'], child_nodes=True, repeat_hyperlinks=True)
 
-# Enhanced text extraction with improved node handling
 def extract_text_from_block(block):
     """Extract text from nested content blocks, including special node types."""
-    content = []
-    
-    if isinstance(block, dict):
-        # Direct text extraction from known keys
-        for text_key in ['value', 'text', 'title', 'description']:
-            if text_key in block and isinstance(block[text_key], str):
-                text = block[text_key].strip()
-                if text:
-                    content.append(text)
-        
-        # Special handling for hyperlinks
-        if block.get('nodeType') == 'hyperlink':
-            link_text = ' '.join(extract_text_from_block(block.get('content', [])))
-            if link_text:
-                content.append(link_text)
-        
-        # Recursive content processing
-        for content_key in ['content', 'children']:
-            if content_key in block:
-                content.extend(extract_text_from_block(block[content_key]))
-                
-    elif isinstance(block, Iterable) and not isinstance(block, str):
-        for item in block:
-            content.extend(extract_text_from_block(item))
-            
-    return content
+    return TEXT_WALKER.extract(block)
 
 # Enhanced content structure parser
 def extract_text_from_content(content_blocks):
@@ -42,7 +24,8 @@ def extract_text_from_content(content_blocks):
     for block in content_blocks:
         try:
             node_type = block.get('nodeType', '').lower()
-            block_text = extract_text_from_block(block)
+            # Tables are walked row by row below, so only the other node types need the whole block
+            block_text = extract_text_from_block(block) if node_type != 'table' else []
             
             # Structural formatting
             if node_type.startswith('heading'):
@@ -97,8 +80,11 @@ def main():
         writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
         writer.writerow(fields)
 
-        with open(json_path, 'r', encoding='utf-8') as file:
-            items = ijson.items(file, 'items.item')
+        # Parse the raw bytes with the fastest ijson backend available
+        backend = ijson_backend()
+        print(f"🔧 ijson backend: {backend.backend_name}")
+        with open(json_path, 'rb') as file:
+            items = backend.items(file, 'items.item')
             
             for idx, item in enumerate(items, 1):
                 try:
@@ -1,43 +1,32 @@
+import argparse
 import json
-import csv
 import os
-from collections.abc import Iterable
-import ijson  # For iterative JSON parsing
+import sys
+import time
 
-# Function to extract text from a content block (handles deep nesting)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.state_store import StateStore, default_state_path, row_hash
+from common.columnar import is_arrow, iter_lists, open_row_writer
+from common.journal import Journal, journal_path, run_signature
+from common.json_stream import ijson_backend, iter_raw_items, load_item
+from common.parallel_compare import imap_ordered
+from common.profiling import PROFILER, add_profile_arguments
+from common.rich_text import RichTextWalker
+
+# Function to report a `content` value that can't be walked
+def report_block_error(block, error):
+    print(f"Block extraction error: {str(error)}")
+    if os.getenv('DEBUG'):
+        print(f"Problem block: {json.dumps(block, indent=2)}")
+
+# First non-empty of value/text/content per node, walked iteratively (see common.rich_text)
+TEXT_WALKER = RichTextWalker(text_keys=['value', 'text', 'content'], first_text_only=True,
+                             strip_prefix=True, on_error=report_block_error)
+
+# Function to extract text from a content block, handling deep nesting and multiple text locations
 def extract_text_from_block(block):
     """Extract text from a content block, handling deep nesting and multiple text locations."""
-    content_text = []
-    
-    try:
-        # Handle text nodes
-        if isinstance(block, dict):
-            # Check multiple possible text locations
-            for key in ['value', 'text', 'content']:
-                if key in block and isinstance(block[key], str):
-                    text = block[key].strip()
-                    if text:
-                        if key == 'value' and text.startswith("Contentful - "):
-                            text = text.replace("Contentful - ", "", 1)
-                        content_text.append(text)
-                        break  # Prioritize first valid text found
-            
-            # Recursive content handling
-            if 'content' in block:
-                for sub_block in block.get('content', []):
-                    content_text.extend(extract_text_from_block(sub_block))
-                    
-        # Handle list-based content structures
-        elif isinstance(block, Iterable) and not isinstance(block, str):
-            for item in block:
-                content_text.extend(extract_text_from_block(item))
-                
-    except Exception as e:
-        print(f"Block extraction error: {str(e)}")
-        if os.getenv('DEBUG'):
-            print(f"Problem block: {json.dumps(block, indent=2)}")
-            
-    return content_text
+    return TEXT_WALKER.extract(block)
 
 # Function to extract structured content from `detailInfo`
 def extract_text_from_content(content_blocks):
@@ -52,11 +41,8 @@ def extract_text_from_content(content_blocks):
         try:
             node_type = block.get('nodeType', 'unknown').lower()
             
-            # Unified content extraction
-            block_text = extract_text_from_block(block)
-            
             if node_type.startswith('heading'):
-                full_text.append('\n' + ' '.join(block_text) + '\n')
+                full_text.append('\n' + ' '.join(extract_text_from_block(block)) + '\n')
             elif node_type in ['unordered-list', 'ordered-list']:
                 list_items = []
                 for item in block.get('content', []):
@@ -73,7 +59,7 @@ def extract_text_from_content(content_blocks):
                     rows.append(' | '.join(cells))
                 full_text.append('\n'.join(rows))
             else:
-                full_text.append(' '.join(block_text))
+                full_text.append(' '.join(extract_text_from_block(block)))
                 
         except Exception as e:
             print(f"⚠️ Error processing block {idx}: {str(e)}")
@@ -95,77 +81,217 @@ def safe_extract(data, key, default="N/A"):
         print(f"⚠️ Error extracting key '{key}': {e}")
         return default
 
+# Define CSV headers
+FIELDS = [
+    "id", "title", "metaTitle", "metaDescription", "categoryName", 
+    "tagsList", "conceptsList", "linkUrl", "createdAt", 
+    "updatedAt", "timeDuration", "content"
+]
+LINK_COLUMN = FIELDS.index("linkUrl")
+UPDATED_AT_COLUMN = FIELDS.index("updatedAt")
+
+# Build the CSV row for one Contentful entry
+def build_row(blog):
+    # Extract metadata fields
+    sys_data = blog.get("sys", {})
+    fields_data = blog.get("fields", {})
+    metadata = blog.get("metadata", {})
+
+    # ID and Dates
+    blog_id = sys_data.get("id", "N/A")
+    created_at = sys_data.get("createdAt", "N/A")
+    updated_at = sys_data.get("updatedAt", "N/A")
+
+    # Fields
+    title = safe_extract(fields_data, "title")
+    meta_title = safe_extract(fields_data, "metaTitle")
+    meta_desc = safe_extract(fields_data, "metaDescription")
+    category = safe_extract(fields_data, "categoryName")
+    link = safe_extract(fields_data, "linkUrl")
+    time_duration = safe_extract(fields_data, "timeDuration")
+
+    # Metadata
+    tags = ", ".join([tag.get("name", "") for tag in metadata.get("tags", [])])
+    concepts = ", ".join(metadata.get("concepts", []))
+
+    # Extract `detailInfo` content safely
+    detail_info = fields_data.get("detailInfo", {})
+    content_blocks = detail_info.get("content", []) if isinstance(detail_info, dict) else []
+    with PROFILER.step("content"):
+        final_content = extract_text_from_content(content_blocks)
+
+    return [
+        blog_id, title, meta_title, meta_desc, category,
+        tags, concepts, link, created_at, updated_at,
+        time_duration, final_content
+    ]
+
+# linkUrl -> sys.updatedAt of entries whose previous row can be reused (incremental mode), per process
+REUSABLE = {}
+
+def init_worker(reusable):
+    global REUSABLE
+    REUSABLE = reusable
+
+# Extract one entry: (link, updated_at, row, error); row is None when the previous row can be reused
+def extract_entry(blog):
+    try:
+        link = safe_extract(blog.get("fields", {}), "linkUrl")
+        updated_at = blog.get("sys", {}).get("updatedAt", "N/A")
+
+        # Unchanged since the last run: reuse the previous row instead of re-walking the rich text
+        if link in REUSABLE and REUSABLE[link] == updated_at:
+            return link, updated_at, None, None
+        return link, updated_at, build_row(blog), None
+    except Exception as e:
+        return None, None, None, str(e)
+
+# extract_entry timed as one document for --profile (size = characters of extracted content)
+def profiled_extract_entry(blog):
+    start = time.perf_counter()
+    result = extract_entry(blog)
+    link, _, row, _ = result
+    PROFILER.record_document(link, len(row[-1]) if row else 0, time.perf_counter() - start)
+    return result
+
+# Same for the raw JSON text of an entry, parsed in the worker (--workers)
+def extract_raw_entry(raw):
+    try:
+        blog = load_item(raw)
+    except Exception as e:
+        return None, None, None, str(e)
+    return extract_entry(blog)
+
+# (position in the export, entry) -> (position, result), so results are journaled by position
+def extract_indexed_entry(item):
+    idx, blog = item
+    return idx, (profiled_extract_entry if PROFILER.enabled else extract_entry)(blog)
+
+def extract_indexed_raw_entry(item):
+    idx, raw = item
+    return idx, extract_raw_entry(raw)
+
+# Entries of the export not yet in the journal of an interrupted run, with their positions
+def pending_entries(items, journal):
+    return ((idx, item) for idx, item in enumerate(items) if idx not in journal)
+
+# Rows of the previous output keyed by linkUrl (reused for unchanged entries in incremental mode)
+def load_previous_rows(csv_file):
+    previous = {}
+    if os.path.exists(csv_file):
+        reader = iter_lists(csv_file)
+        if next(reader, None) == FIELDS:
+            for row in reader:
+                previous[row[LINK_COLUMN]] = row
+    return previous
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract Contentful blog entries into a CSV")
+    # Use absolute paths for reliability
+    parser.add_argument("--input", default=os.path.abspath("NewScript/prod/resut.json"), help="Contentful export JSON")
+    parser.add_argument("--output", default=os.path.abspath("update.csv"),
+                        help="Output path; a .arrow/.feather extension writes Arrow IPC instead of CSV")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-extract entries whose sys.updatedAt changed since the last run")
+    parser.add_argument("--state", help="State store path (default: validation_state.sqlite next to the output)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes that parse and extract entries (1 = serial); output is identical either way")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Entries handed to a worker at a time")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Start over instead of resuming from the journal of an interrupted run")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.profile and args.workers > 1:
+        parser.error("--profile measures this process only; run it with --workers 1")
+    return args
+
 # Main function to process JSON and write to CSV
 def main():
-    # Use absolute paths for reliability
-    json_file_path = os.path.abspath("NewScript/prod/resut.json")
-    csv_file = os.path.abspath("update.csv")
+    args = parse_args()
+    PROFILER.configure(args)
+    json_file_path = args.input
+    csv_file = args.output
 
     if not os.path.exists(json_file_path):
         print(f"❌ Error: File '{json_file_path}' not found.")
         return
 
-    # Define CSV headers
-    fields = [
-        "id", "title", "metaTitle", "metaDescription", "categoryName", 
-        "tagsList", "conceptsList", "linkUrl", "createdAt", 
-        "updatedAt", "timeDuration", "content"
-    ]
+    state = StateStore(args.state or default_state_path(csv_file))
+    previous_state = state.snapshot("extract") if args.incremental else {}
+    previous_rows = load_previous_rows(csv_file) if args.incremental else {}
+    reusable = {link: previous[0] for link, previous in previous_state.items() if link in previous_rows}
+    new_state = {}
+    reused = 0
+    processed = 0
 
-    # Open CSV file for writing
-    with open(csv_file, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(fields)  # Write header
+    # Every extracted row goes to a journal first, so an interrupted run picks up where it stopped
+    run = run_signature(os.path.abspath(__file__), [json_file_path], incremental=args.incremental)
+    with Journal(journal_path(csv_file), run, fresh=args.fresh) as journal:
+        resumed = len(journal)
+        if journal.resumed:
+            print(f"♻️ Resuming: {resumed} entries already extracted by the interrupted run")
 
-        # Stream JSON items one by one
-        with open(json_file_path, "r", encoding="utf-8") as file:
-            blogs = ijson.items(file, "items.item")
-            
-            for count, blog in enumerate(blogs, 1):
-                try:
-                    # Extract metadata fields
-                    sys_data = blog.get("sys", {})
-                    fields_data = blog.get("fields", {})
-                    metadata = blog.get("metadata", {})
-
-                    # ID and Dates
-                    blog_id = sys_data.get("id", "N/A")
-                    created_at = sys_data.get("createdAt", "N/A")
-                    updated_at = sys_data.get("updatedAt", "N/A")
-
-                    # Fields
-                    title = safe_extract(fields_data, "title")
-                    meta_title = safe_extract(fields_data, "metaTitle")
-                    meta_desc = safe_extract(fields_data, "metaDescription")
-                    category = safe_extract(fields_data, "categoryName")
-                    link = safe_extract(fields_data, "linkUrl")
-                    time_duration = safe_extract(fields_data, "timeDuration")
-
-                    # Metadata
-                    tags = ", ".join([tag.get("name", "") for tag in metadata.get("tags", [])])
-                    concepts = ", ".join(metadata.get("concepts", []))
-
-                    # Extract `detailInfo` content safely
-                    detail_info = fields_data.get("detailInfo", {})
-                    content_blocks = detail_info.get("content", []) if isinstance(detail_info, dict) else []
-                    final_content = extract_text_from_content(content_blocks)
-
-                    # Write data row
-                    writer.writerow([
-                        blog_id, title, meta_title, meta_desc, category,
-                        tags, concepts, link, created_at, updated_at,
-                        time_duration, final_content
-                    ])
+        if args.workers > 1:
+            # One reader splits the export into raw entries; workers parse and extract them,
+            # and imap hands the rows back in file order. Read as text: the C scanner that finds the
+            # entries needs str, and decoding costs far less than scanning bytes in Python (see json_stream)
+            file = open(json_file_path, "r", encoding="utf-8")
+            entries = imap_ordered(extract_indexed_raw_entry, pending_entries(iter_raw_items(file, "items"), journal),
+                                   workers=args.workers, chunk_size=args.chunk_size, initializer=init_worker,
+                                   initargs=(reusable,))
+        else:
+            # Stream JSON items one by one, from the raw bytes with the fastest ijson backend available
+            backend = ijson_backend()
+            print(f"🔧 ijson backend: {backend.backend_name}")
+            file = open(json_file_path, "rb")
+            items = PROFILER.iterate(backend.items(file, "items.item"), "parse")
+            entries = imap_ordered(extract_indexed_entry, pending_entries(items, journal),
+                                   initializer=init_worker, initargs=(reusable,))
+
+        # Rows arrive in export order, so unless the journal already had some they go straight to the output
+        # too; a resumed run assembles the output from the journal at the end. Either way into a temporary
+        # file, so the previous output stays readable until it is complete
+        direct = len(journal) == 0
+        tmp_file = f"{csv_file}.tmp"
+        with open_row_writer(tmp_file, FIELDS, arrow=is_arrow(csv_file)) as writer:  # Writes the header
+            with file, PROFILER.stage("extract"):
+                for idx, (link, updated_at, row, error) in entries:
+                    processed += 1
+                    if error is not None:
+                        print(f"⚠️ Error processing item {idx + 1}: {error}")
+                        continue
+                    if row is None:
+                        row = previous_rows[link]
+                        reused += 1
+
+                    with PROFILER.step("journal"):
+                        journal.record(idx, row)
+                    if direct:
+                        with PROFILER.step("write"):
+                            writer.writerow(row)
+                        new_state[row[LINK_COLUMN]] = (row[UPDATED_AT_COLUMN], row_hash(row))
 
                     # Progress Indicator
-                    if count % 100 == 0:
-                        print(f"Processed {count} items...")
-                
-                except Exception as e:
-                    print(f"⚠️ Error processing item {count}: {e}")
-                    continue
+                    if (idx + 1) % 100 == 0:
+                        print(f"Processed {idx + 1} items...")
+
+            if not direct:
+                with PROFILER.stage("write"):
+                    for idx in sorted(journal.keys()):
+                        row = journal.rows(idx)
+                        writer.writerow(row)
+                        new_state[row[LINK_COLUMN]] = (row[UPDATED_AT_COLUMN], row_hash(row))
+
+    os.replace(tmp_file, csv_file)
+    journal.remove()
+    state.replace_stage("extract", new_state)
+    state.close()
 
+    count = resumed + processed
+    if args.incremental:
+        print(f"♻️ Incremental: reused {reused} unchanged rows, re-extracted {processed - reused}")
     print(f"✅ Successfully processed {count} items. Output saved to {csv_file}")
+    PROFILER.report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,29 +1,22 @@
+import argparse
 import json
 import csv
 import os
-import ijson  # For handling large JSON files
+import sys
+import time
 from bs4 import BeautifulSoup  # To clean HTML tags
 
-# Function to clean and extract text from deeply nested content
-def extract_text_from_block(block):
-    """Recursively extracts and cleans text from nested content structures."""
-    content_text = []
-    
-    if isinstance(block, dict):
-        # Check for text in known keys
-        if "value" in block and isinstance(block["value"], str):
-            content_text.append(block["value"].strip())
-
-        # Process nested content
-        if "content" in block and isinstance(block["content"], list):
-            for sub_block in block["content"]:
-                content_text.extend(extract_text_from_block(sub_block))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.json_stream import ijson_backend
+from common.profiling import PROFILER, add_profile_arguments
+from common.rich_text import RichTextWalker
 
-    elif isinstance(block, list):  # Handle list-based content
-        for item in block:
-            content_text.extend(extract_text_from_block(item))
+# Function to clean and extract text from deeply nested content (iterative, see common.rich_text)
+TEXT_WALKER = RichTextWalker(keep_empty=True, list_children=True, containers=list)
 
-    return content_text
+def extract_text_from_block(block):
+    """Extracts and cleans text from nested content structures."""
+    return TEXT_WALKER.extract(block)
 
 # Function to process `detailInfo` and extract structured content
 def extract_text_from_content(content_blocks):
@@ -64,11 +57,14 @@ def process_json(json_file_path, csv_file):
         writer = csv.writer(csvfile)
         writer.writerow(fields)  # Write header
 
-        # Read JSON using streaming mode
-        with open(json_file_path, "r", encoding="utf-8") as file:
-            blogs = ijson.items(file, "items.item")
+        # Read JSON using streaming mode, from the raw bytes with the fastest ijson backend available
+        backend = ijson_backend()
+        print(f"🔧 ijson backend: {backend.backend_name}")
+        with open(json_file_path, "rb") as file, PROFILER.stage("extract"):
+            blogs = PROFILER.iterate(backend.items(file, "items.item"), "parse")
 
             for count, blog in enumerate(blogs, 1):
+                start = time.perf_counter()
                 try:
                     sys_data = blog.get("sys", {})
                     fields_data = blog.get("fields", {})
@@ -89,14 +85,17 @@ def process_json(json_file_path, csv_file):
                     # Extract content from `detailInfo`
                     detail_info = fields_data.get("detailInfo", {}).get("en-US", {})
                     content_blocks = detail_info.get("content", []) if isinstance(detail_info, dict) else []
-                    final_content = extract_text_from_content(content_blocks)
+                    with PROFILER.step("content"):
+                        final_content = extract_text_from_content(content_blocks)
 
                     # Write extracted data to CSV
-                    writer.writerow([
-                        contentful_id, title, meta_title, meta_desc, category, time_duration,
-                        link_url, link_text, is_featured, is_primary,
-                        final_content
-                    ])
+                    with PROFILER.step("write"):
+                        writer.writerow([
+                            contentful_id, title, meta_title, meta_desc, category, time_duration,
+                            link_url, link_text, is_featured, is_primary,
+                            final_content
+                        ])
+                    PROFILER.record_document(link_url, len(final_content), time.perf_counter() - start)
 
                     # Show progress
                     if count % 50 == 0:
@@ -108,10 +107,19 @@ def process_json(json_file_path, csv_file):
 
     print(f"🎉 Successfully processed {count} blogs. Output saved to {csv_file}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract Contentful blog entries with their content into a CSV")
+    parser.add_argument("--input", default="Prod/data/content.json", help="Contentful export JSON")
+    parser.add_argument("--output", default="Prod/csv/updateextracted_contentful_data.csv", help="Output CSV")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
 # Run the script
 if __name__ == "__main__":
-    json_path = "Prod/data/content.json"
-    output_csv = "Prod/csv/updateextracted_contentful_data.csv"
-    process_json(json_path, output_csv)
+    args = parse_args()
+    PROFILER.configure(args)
+    output_csv = args.output
+    process_json(args.input, output_csv)
 
-print(f"✅ Extraction complete! Check the output: {output_csv}")
+    print(f"✅ Extraction complete! Check the output: {output_csv}")
+    PROFILER.report()
@@ -1,8 +1,20 @@
-import requests
+import argparse
 import json
-import csv
+import os
+import sys
 import time
-from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.strapi_client import (
+    fetch_sequential, fetch_concurrent, fetch_collection, fetch_by_values, index_entries
+)
+from common.fetch_policy import FetchPolicy, RetryPolicy
+from common.http_cache import ResponseCache
+from common.journal import Journal, journal_path, run_signature
+from common.state_store import StateStore, default_state_path, row_hash
+from common.columnar import is_arrow, iter_lists, open_row_writer
+from common.html_text import html_to_text
+from common.profiling import PROFILER, add_profile_arguments
 
 # Strapi API Base URL
 STRAPI_API_BASE_URL = "https://cms.jswonemsme.com/api/jsw-blogs-articless"
@@ -18,28 +30,31 @@ STRAPI_HEADERS = {
 # Load Contentful Blog Links
 contentful_file_path = "/Users/ankitsharma/Desktop/DataValidation/Prod/data/content.json"
 
-with open(contentful_file_path, "r", encoding="utf-8") as file:
-    contentful_data = json.load(file)
+# Output CSV File
+output_csv = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/new_Strapi_prod.csv"
 
-# Extract `linkUrl` values dynamically
-blog_links = []
-for blog in contentful_data.get("items", []):
-    link_data = blog.get("fields", {}).get("linkUrl", {})
+# Async mode defaults
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10  # Requests per second (token bucket); replaces the fixed 1s sleep
 
-    # Fix: Extract `en-US` key safely
-    if isinstance(link_data, dict) and "en-US" in link_data:
-        blog_links.append(link_data["en-US"].strip())  # Extract the actual string
-    else:
-        print(f"⚠️ Skipping invalid linkUrl format: {link_data}")  # Debugging
+# Bulk / batch mode defaults (Strapi caps pageSize at 100 by default)
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_BATCH_SIZE = 50
 
-# Function to clean HTML content
-def clean_html(raw_html):
-    """Removes HTML tags and extracts clean text."""
-    soup = BeautifulSoup(raw_html, "html.parser")
-    return soup.get_text(separator=" ").strip()
+# Response cache defaults
+DEFAULT_CACHE_MAX_MB = 500
 
-# Output CSV File
-output_csv = "/Users/ankitsharma/Desktop/DataValidation/Prod/csv/new_Strapi_prod.csv"
+# Retries per request for connection errors, timeouts, 408/429/5xx (see common.fetch_policy)
+DEFAULT_MAX_RETRIES = 4
+
+# An interrupted run's journal older than this is not resumed (Strapi may have changed since)
+DEFAULT_JOURNAL_MAX_AGE_HOURS = 24
+
+POPULATE_PARAMS = [
+    ("populate[detailInfo][populate]", "*"),
+    ("populate[media][populate]", "*"),
+    ("populate[thumbnail][populate]", "*"),
+]
 
 # Define CSV Headers (Including new fields)
 fields = [
@@ -49,69 +64,294 @@ fields = [
     "contentfulId", "strapi_content"
 ]
 
-# Write CSV Data
-with open(output_csv, "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(fields)  # Write header row
-
-    for link in blog_links:
-        # Construct the API URL dynamically with `linkUrl`
-        strapi_url = (
-            f"{STRAPI_API_BASE_URL}?filters%5BlinkUrl%5D%5B%24eq%5D={link}"
-            f"&populate%5BdetailInfo%5D%5Bpopulate%5D=%2A"
-            f"&populate%5Bmedia%5D%5Bpopulate%5D=%2A"
-            f"&populate%5Bthumbnail%5D%5Bpopulate%5D=%2A"
+# Extract `linkUrl` values dynamically
+def load_blog_links(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        contentful_data = json.load(file)
+
+    blog_links = []
+    for blog in contentful_data.get("items", []):
+        link_data = blog.get("fields", {}).get("linkUrl", {})
+
+        # Fix: Extract `en-US` key safely
+        if isinstance(link_data, dict) and "en-US" in link_data:
+            blog_links.append(link_data["en-US"].strip())  # Extract the actual string
+        else:
+            print(f"⚠️ Skipping invalid linkUrl format: {link_data}")  # Debugging
+    return blog_links
+
+# Function to clean HTML content
+def clean_html(raw_html):
+    """Removes HTML tags and extracts clean text."""
+    return html_to_text(raw_html, separator=" ").strip()
+
+# Construct the API URL dynamically with `linkUrl`
+def build_strapi_url(base_url, link):
+    return (
+        f"{base_url}?filters%5BlinkUrl%5D%5B%24eq%5D={link}"
+        f"&populate%5BdetailInfo%5D%5Bpopulate%5D=%2A"
+        f"&populate%5Bmedia%5D%5Bpopulate%5D=%2A"
+        f"&populate%5Bthumbnail%5D%5Bpopulate%5D=%2A"
+    )
+
+# Turn one Strapi entry into a CSV row
+def build_row(link, blog_entry):
+    attributes = blog_entry.get("attributes", {})
+
+    # Extract and clean the content
+    content_blocks = attributes.get("detailInfo", [])
+    with PROFILER.step("clean_html"):
+        strapi_text = " ".join(clean_html(block.get("content", "")) for block in content_blocks)
+
+    return [
+        link,
+        attributes.get("title", "N/A"),
+        attributes.get("metaTitle", "N/A"),
+        attributes.get("metaDescription", "N/A"),
+        attributes.get("categoryName", "N/A"),
+        attributes.get("timeDuration", "N/A"),
+        attributes.get("createdAt", "N/A"),
+        attributes.get("updatedAt", "N/A"),
+        attributes.get("publishedAt", "N/A"),
+        attributes.get("linkText", "N/A"),
+        attributes.get("isThisAFeaturedArticle", "N/A"),
+        attributes.get("isThisAPrimaryArticle", "N/A"),
+        attributes.get("isMsmeArticle", "N/A"),
+        attributes.get("isSellerArticle", "N/A"),
+        attributes.get("contentfulId", "N/A"),
+        strapi_text
+    ]
+
+# Convert a FetchResult into the rows for its link (empty list = not in Strapi, None = the fetch failed)
+def rows_from_result(result):
+    if result.error is not None:
+        print(f"⚠️ Error fetching {result.key}: {result.error}")
+        return None
+    if result.status != 200:
+        print(f"❌ Failed to fetch {result.key} - HTTP {result.status}")
+        return None
+
+    return rows_for_link(result.key, result.payload.get("data", []))
+
+def rows_for_link(link, blog_entries):
+    if not blog_entries:
+        print(f"⚠️ No data found for: {link}")
+        return []
+
+    # Document size for --profile: characters of HTML cleaned for this link
+    size = sum(len(block.get("content", "")) for entry in blog_entries
+               for block in entry.get("attributes", {}).get("detailInfo", [])) if PROFILER.enabled else 0
+    with PROFILER.document(link, size):
+        rows = [build_row(link, blog_entry) for blog_entry in blog_entries]
+    print(f"✅ Extracted content for: {link}")
+    return rows
+
+# Bulk / batch modes: fetch many entries per request, then join to the links locally
+def fetch_rows_in_bulk(args, blog_links, cache=None, policy=None):
+    if args.mode == "bulk":
+        entries, request_count = fetch_collection(
+            args.base_url, STRAPI_HEADERS, POPULATE_PARAMS, page_size=args.page_size,
+            concurrency=args.concurrency, rate=args.rate or None, cache=cache, policy=policy
         )
+    else:
+        entries, request_count = fetch_by_values(
+            args.base_url, STRAPI_HEADERS, "linkUrl", blog_links, POPULATE_PARAMS,
+            batch_size=args.batch_size, concurrency=args.concurrency, rate=args.rate or None, cache=cache,
+            policy=policy
+        )
+
+    index = index_entries(entries, "linkUrl")
+    print(f"📦 {len(entries)} Strapi entries in {request_count} requests ({args.mode} mode)")
+    return [rows_for_link(link, index.get(link, [])) for link in blog_links], request_count
+
+# Cheap listing of every entry's current updatedAt (no populate), one page per 100 entries
+def fetch_updated_at(args, policy=None):
+    params = [("fields[0]", "linkUrl"), ("fields[1]", "updatedAt")]
+    entries, request_count = fetch_collection(args.base_url, STRAPI_HEADERS, params, page_size=DEFAULT_PAGE_SIZE,
+                                              concurrency=args.concurrency, rate=args.rate or None, policy=policy)
+    updated_at = {}
+    for entry in entries:
+        attributes = entry.get("attributes", {})
+        updated_at[attributes.get("linkUrl")] = attributes.get("updatedAt")
+    return updated_at, request_count
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch Strapi blog articles for every Contentful linkUrl")
+    parser.add_argument("--input", default=contentful_file_path, help="Contentful export JSON")
+    parser.add_argument("--output", default=output_csv,
+                        help="Output path; a .arrow/.feather extension writes Arrow IPC instead of CSV")
+    parser.add_argument("--base-url", default=STRAPI_API_BASE_URL, help="Strapi collection endpoint")
+    parser.add_argument("--mode", choices=["sequential", "async", "bulk", "batch"], default="sequential",
+                        help="sequential = one request per second, async = concurrent requests, "
+                             "bulk = walk every page of the collection, batch = $in filters per batch of links")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Max requests in flight (async/bulk/batch modes)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="Max requests per second, 0 = unlimited (async/bulk/batch modes)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Page size for bulk mode")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Links per $in filter for batch mode")
+    parser.add_argument("--cache-dir", help="Persistent response cache directory (disabled when omitted)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_CACHE_MAX_MB, help="Cache size cap (LRU eviction)")
+    parser.add_argument("--revalidate", choices=["conditional", "updated-at"], default="conditional",
+                        help="conditional = ETag/Last-Modified requests, updated-at = list every entry's "
+                             "updatedAt first and only refetch entries that changed")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch links whose Strapi updatedAt changed since the last run, "
+                             "reuse the previous rows for the rest")
+    parser.add_argument("--state", help="State store path (default: validation_state.sqlite next to the output)")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help="Retries per request on connection errors, timeouts and 408/429/5xx (0 = none)")
+    parser.add_argument("--fixed-concurrency", action="store_true",
+                        help="Keep --concurrency requests in flight instead of backing off when Strapi struggles")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Start over instead of resuming from the journal of an interrupted run")
+    parser.add_argument("--journal-max-age", type=float, default=DEFAULT_JOURNAL_MAX_AGE_HOURS,
+                        help="Hours after which an interrupted run's journal is fetched again instead of resumed")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+# Fetch the rows of `links` with the selected fetch mode and record each link's rows in the journal
+# as soon as they are known (failed links are left out, so a rerun fetches them again)
+def fetch_into_journal(args, links, cache, stats, policy, journal):
+    if args.mode in ("bulk", "batch"):
+        results, request_count = fetch_rows_in_bulk(args, links, cache, policy)
+        stats["requests"] += request_count
+        # Links found in the pages/batches that came back are done; a link that was not found is only known
+        # to be absent from Strapi when no request failed, otherwise it is left for the next run
+        complete = not policy.stats.failed
+        for link, rows in zip(links, results):
+            if rows or complete:
+                journal.record(link, rows)
+        return
+
+    def record(result):
+        rows = rows_from_result(result)
+        if rows is not None:
+            journal.record(result.key, rows)
+
+    url_items = [(link, build_strapi_url(args.base_url, link)) for link in links]
+    hits_before = cache.stats["hits"] if cache is not None else 0
+    if args.mode == "async":
+        # Rows are journaled as responses arrive rather than held in memory
+        fetch_concurrent(url_items, STRAPI_HEADERS, concurrency=args.concurrency, rate=args.rate or None,
+                         on_result=record, cache=cache, policy=policy)
+    else:
+        # Sleep between calls to prevent excessive API calls
+        for result in fetch_sequential(url_items, STRAPI_HEADERS, delay=1, cache=cache, policy=policy):
+            record(result)
+    hits = (cache.stats["hits"] - hits_before) if cache is not None else 0
+    stats["requests"] += len(url_items) - hits
+
+# Rows of the previous output grouped by linkUrl (reused for unchanged links in incremental mode)
+def load_previous_rows(csv_path):
+    previous = {}
+    if os.path.exists(csv_path):
+        reader = iter_lists(csv_path)
+        if next(reader, None) == fields:
+            for row in reader:
+                previous.setdefault(row[0], []).append(row)
+    return previous
+
+def main():
+    args = parse_args()
+    PROFILER.configure(args)
+    with PROFILER.stage("load links"):
+        blog_links = load_blog_links(args.input)
+
+    cache = None
+    if args.cache_dir:
+        cache = ResponseCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    state = StateStore(args.state or default_state_path(args.output))
+
+    stats = {"requests": 0}
+    policy = FetchPolicy(retry=RetryPolicy(max_retries=args.max_retries), adaptive=not args.fixed_concurrency)
+    start = time.time()
+
+    # Current Strapi updatedAt per link, from a cheap listing (needed by --incremental and --revalidate updated-at)
+    current_updated_at = {}
+    use_updated_at_cache = cache is not None and args.revalidate == "updated-at" and args.mode in ("sequential", "async")
+    if args.incremental or use_updated_at_cache:
+        with PROFILER.stage("list updatedAt"):
+            current_updated_at, stats["requests"] = fetch_updated_at(args, policy)
+
+    if use_updated_at_cache:
+        for link in blog_links:
+            cache.mark_fresh(build_strapi_url(args.base_url, link), current_updated_at.get(link))
+        print(f"🔎 {len(cache.fresh)} of {len(blog_links)} links unchanged in the response cache")
+
+    # Incremental: only links whose Strapi updatedAt moved since the last run are fetched again
+    unchanged = set()
+    previous_state = {}
+    previous_rows = {}
+    if args.incremental:
+        previous_state = state.snapshot("fetch")
+        previous_rows = load_previous_rows(args.output)
+        for link in blog_links:
+            previous = previous_state.get(link)
+            if (previous and current_updated_at.get(link) and previous[0] == current_updated_at[link]
+                    and link in previous_rows):
+                unchanged.add(link)
+        print(f"♻️ Incremental: {len(unchanged)} unchanged links reused, "
+              f"{len(blog_links) - len(unchanged)} to fetch")
+
+    new_state = {}
+
+    # Fetched rows go to a journal first, so an interrupted run only fetches what it had not got to
+    run = run_signature(os.path.abspath(__file__), [args.input], base_url=args.base_url)
+    with Journal(journal_path(args.output), run, fresh=args.fresh, max_age=args.journal_max_age * 3600) as journal:
+        if journal.resumed:
+            print(f"♻️ Resuming: {len(journal)} links already fetched by the interrupted run")
+        to_fetch = [link for link in dict.fromkeys(blog_links) if link not in unchanged and link not in journal]
+        with PROFILER.stage("fetch"):
+            fetch_into_journal(args, to_fetch, cache, stats, policy, journal)
+        # Links whose request kept failing: not in Strapi's answer, but not known to be missing from Strapi either
+        unfetched = [link for link in to_fetch if link not in journal]
+
+        # Assemble the output in link order, into a temporary file so the previous output stays readable
+        # until it is complete
+        tmp_output = f"{args.output}.tmp"
+        with PROFILER.stage("write"), \
+                open_row_writer(tmp_output, fields, arrow=is_arrow(args.output)) as writer:  # Writes the header row
+            for link in blog_links:
+                if link in unchanged or link in journal:
+                    rows = previous_rows[link] if link in unchanged else journal.rows(link)
+                    updated_at = rows[0][fields.index("updatedAt")] if rows else None
+                    new_state[link] = (updated_at, row_hash(value for row in rows for value in row))
+                else:
+                    # Unfetched: keep the previous run's rows and state (--incremental) rather than report it missing
+                    rows = previous_rows.get(link, [])
+                    if link in previous_state:
+                        new_state[link] = previous_state[link]
+                writer.writerows(rows)
+
+    os.replace(tmp_output, args.output)
+    if not unfetched:
+        journal.remove()  # Otherwise kept, so a rerun only fetches the links still missing
+    state.replace_stage("fetch", new_state)
+    state.close()
+
+    elapsed = time.time() - start
+    print(f"⏱️ Fetched {len(blog_links)} links with {stats['requests']} requests in {elapsed:.1f}s ({args.mode} mode)")
+    policy.print_summary()
+    if cache is not None:
+        cache.save()
+        print(f"🗄️ Cache: {cache.summary()}")
+    print(f"✅ Strapi data extraction complete! Results saved in {args.output}")
+    PROFILER.report()
+
+    # Links behind a request that kept failing are absent from the output but not missing in Strapi
+    if policy.stats.failed:
+        failed = [str(key) for key in policy.stats.failed]
+        print(f"❌ {len(failed)} requests still failed after retries: {', '.join(failed[:10])}"
+              f"{' ...' if len(failed) > 10 else ''}")
+        if unfetched:
+            kept = sum(1 for link in unfetched if link in previous_rows)
+            print(f"   {len(unfetched)} links could not be fetched: "
+                  f"{len(unfetched) - kept} are missing from {args.output}"
+                  f"{f', {kept} keep their rows from the previous output' if kept else ''}")
+            print(f"   Run again to fetch only those (the {len(journal)} links fetched so far are kept in "
+                  f"{journal.path})")
+        sys.exit(1)
 
-        try:
-            response = requests.get(strapi_url, headers=STRAPI_HEADERS, timeout=10)
-            if response.status_code == 200:
-                strapi_data = response.json()
-                blog_entries = strapi_data.get("data", [])
-
-                if not blog_entries:
-                    print(f"⚠️ No data found for: {link}")
-                    continue  # Skip this link if no data is found
-
-                for blog_entry in blog_entries:
-                    attributes = blog_entry.get("attributes", {})
-
-                    # Extract required fields
-                    title = attributes.get("title", "N/A")
-                    meta_title = attributes.get("metaTitle", "N/A")
-                    meta_desc = attributes.get("metaDescription", "N/A")
-                    category = attributes.get("categoryName", "N/A")
-                    time_duration = attributes.get("timeDuration", "N/A")
-                    created_at = attributes.get("createdAt", "N/A")
-                    updated_at = attributes.get("updatedAt", "N/A")
-                    published_at = attributes.get("publishedAt", "N/A")
-                    link_text = attributes.get("linkText", "N/A")
-                    is_featured = attributes.get("isThisAFeaturedArticle", "N/A")
-                    is_primary = attributes.get("isThisAPrimaryArticle", "N/A")
-                    is_msme = attributes.get("isMsmeArticle", "N/A")
-                    is_seller = attributes.get("isSellerArticle", "N/A")
-                    contentful_id = attributes.get("contentfulId", "N/A")
-
-                    # Extract and clean the content
-                    content_blocks = attributes.get("detailInfo", [])
-                    strapi_text = " ".join(clean_html(block.get("content", "")) for block in content_blocks)
-
-                    # Write data row
-                    writer.writerow([
-                        link, title, meta_title, meta_desc, category, 
-                        time_duration, created_at, updated_at, published_at, 
-                        link_text, is_featured, is_primary, is_msme, is_seller, 
-                        contentful_id, strapi_text
-                    ])
-
-                print(f"✅ Extracted content for: {link}")
-
-            else:
-                print(f"❌ Failed to fetch {link} - HTTP {response.status_code}")
-
-        except requests.RequestException as e:
-            print(f"⚠️ Error fetching {link}: {e}")
-
-        time.sleep(1)  # Prevents excessive API calls
-
-print(f"✅ Strapi data extraction complete! Results saved in {output_csv}")
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,32 @@
+import argparse
 import csv
 import difflib
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.parallel_compare import compare_items
+from common.fingerprint import add_fingerprints, fingerprints_match
+from common.normalize import normalize_metadata
+from common.sentence_diff import sentence_ndiff
 
 def clean_text(text):
     if not text:
         return ""
-    text = re.sub(r'\s+', ' ', str(text)).strip()
-    return text.lower()
+    return normalize_metadata(text)
 
 def similarity_score(text1, text2):
     return difflib.SequenceMatcher(None, clean_text(text1), clean_text(text2)).ratio()
 
-def find_detailed_differences(text1, text2):
+# Sentence diff engines: "hashed" aligns sentence hashes (patience diff) and compares characters only
+# inside a changed sentence pair; "ndiff" is difflib.ndiff, quadratic on long articles
+DIFF_ENGINES = {'hashed': sentence_ndiff, 'ndiff': difflib.ndiff}
+
+def find_detailed_differences(text1, text2, engine='hashed'):
     text1_sentences = clean_text(text1).split(". ")
     text2_sentences = clean_text(text2).split(". ")
     
-    diff = difflib.ndiff(text1_sentences, text2_sentences)
+    diff = DIFF_ENGINES[engine](text1_sentences, text2_sentences)
     differences = []
     
     line_num = 1
@@ -30,6 +41,14 @@ def find_detailed_differences(text1, text2):
             
     return '\n'.join(differences) if differences else "No significant differences"
 
+COMPARED_FIELDS = ['title', 'metaTitle', 'metaDescription', 'categoryName', 'timeDuration', 'content']
+
+# Similarity of one field, skipping the scorer when the cleaned values are identical
+def field_similarity(contentful_entry, strapi_entry, field):
+    if fingerprints_match(contentful_entry, strapi_entry, field, field):
+        return 1.0
+    return similarity_score(contentful_entry[field], strapi_entry[field])
+
 def load_contentful_data(file_path):
     contentful_data = {}
     with open(file_path, 'r', encoding='utf-8') as file:
@@ -45,6 +64,7 @@ def load_contentful_data(file_path):
                     'timeDuration': row['timeDuration'].strip() if 'timeDuration' in row else '',
                     'content': row['content'].strip() if 'content' in row else ''
                 }
+                add_fingerprints(contentful_data[link], COMPARED_FIELDS, normalize=clean_text)
     return contentful_data
 
 def load_strapi_data(file_path):
@@ -62,13 +82,112 @@ def load_strapi_data(file_path):
                     'timeDuration': row['timeDuration'].strip() if 'timeDuration' in row else '',
                     'content': row['strapi_content'].strip() if 'strapi_content' in row else ''
                 }
+                add_fingerprints(strapi_data[link], COMPARED_FIELDS, normalize=clean_text)
     return strapi_data
 
+HEADERS = [
+    'Link URL',
+    'Overall Status',
+    'Similarity Score',
+    'Title Match',
+    'Meta Title Match',
+    'Meta Description Match',
+    'Category Match',
+    'Time Duration Match',
+    'Content Match',
+    'Detailed Differences'
+]
+
+# Validate one link; entries are None when the link is missing on that side
+def validate_link(link, contentful_entry, strapi_entry, diff_engine='hashed'):
+    if strapi_entry is None:
+        return [
+            link,
+            '❌ Missing in Strapi',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'Entry not found in Strapi'
+        ]
+
+    if contentful_entry is None:
+        return [
+            link,
+            '❌ Missing in Contentful',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'N/A',
+            'Entry not found in Contentful'
+        ]
+
+    # Compare fields
+    field_scores = {
+        field: field_similarity(contentful_entry, strapi_entry, field)
+        for field in COMPARED_FIELDS
+    }
+
+    # Determine match status for each field
+    field_status = {
+        field: '✅ Match' if score == 1.0 else '⚠️ Partial' if score > 0.85 else '❌ Mismatch'
+        for field, score in field_scores.items()
+    }
+
+    # Calculate overall similarity score
+    overall_score = sum(field_scores.values()) / len(field_scores)
+
+    # Determine overall status
+    if all(status == '✅ Match' for status in field_status.values()):
+        overall_status = '✅ Perfect Match'
+    elif any(status == '❌ Mismatch' for status in field_status.values()):
+        overall_status = '❌ Mismatch'
+    else:
+        overall_status = '⚠️ Partial Match'
+
+    # Get detailed content differences
+    if fingerprints_match(contentful_entry, strapi_entry, 'content', 'content'):
+        differences = "No significant differences"
+    else:
+        differences = find_detailed_differences(contentful_entry['content'], strapi_entry['content'], diff_engine)
+
+    return [
+        link,
+        overall_status,
+        f"{overall_score:.2f}",
+        field_status['title'],
+        field_status['metaTitle'],
+        field_status['metaDescription'],
+        field_status['categoryName'],
+        field_status['timeDuration'],
+        field_status['content'],
+        differences
+    ]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate Contentful blogs against Strapi")
+    parser.add_argument('--contentful', default='QA/blogs_data.csv')
+    parser.add_argument('--strapi', default='QA/strapi_extracted_data.csv')
+    parser.add_argument('--output', default='validation_report.csv')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to compare links (1 = serial); output is identical either way")
+    parser.add_argument('--diff-engine', choices=sorted(DIFF_ENGINES), default='hashed',
+                        help="Sentence diff behind Detailed Differences (ndiff = the original difflib.ndiff)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+
     # File paths
-    contentful_csv = 'QA/blogs_data.csv'
-    strapi_csv = 'QA/strapi_extracted_data.csv'
-    output_csv = 'validation_report.csv'
+    contentful_csv = args.contentful
+    strapi_csv = args.strapi
+    output_csv = args.output
     
     # Load data
     print("Loading Contentful data...")
@@ -76,103 +195,18 @@ def main():
     print("Loading Strapi data...")
     strapi_data = load_strapi_data(strapi_csv)
     
-    # Generate report
+    # Generate report (links sorted so the report order is deterministic)
     print("Generating validation report...")
+    all_links = sorted(set(contentful_data.keys()) | set(strapi_data.keys()))
+    items = [(link, contentful_data.get(link), strapi_data.get(link), args.diff_engine) for link in all_links]
+    rows = compare_items(validate_link, items, workers=args.workers)
+
     with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow([
-            'Link URL',
-            'Overall Status',
-            'Similarity Score',
-            'Title Match',
-            'Meta Title Match',
-            'Meta Description Match',
-            'Category Match',
-            'Time Duration Match',
-            'Content Match',
-            'Detailed Differences'
-        ])
-        
-        # Process each entry
-        all_links = set(contentful_data.keys()) | set(strapi_data.keys())
-        for link in all_links:
-            if link not in strapi_data:
-                writer.writerow([
-                    link,
-                    '❌ Missing in Strapi',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'Entry not found in Strapi'
-                ])
-                continue
-                
-            if link not in contentful_data:
-                writer.writerow([
-                    link,
-                    '❌ Missing in Contentful',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'N/A',
-                    'Entry not found in Contentful'
-                ])
-                continue
-            
-            # Compare fields
-            contentful_entry = contentful_data[link]
-            strapi_entry = strapi_data[link]
-            
-            field_scores = {
-                'title': similarity_score(contentful_entry['title'], strapi_entry['title']),
-                'metaTitle': similarity_score(contentful_entry['metaTitle'], strapi_entry['metaTitle']),
-                'metaDescription': similarity_score(contentful_entry['metaDescription'], strapi_entry['metaDescription']),
-                'categoryName': similarity_score(contentful_entry['categoryName'], strapi_entry['categoryName']),
-                'timeDuration': similarity_score(contentful_entry['timeDuration'], strapi_entry['timeDuration']),
-                'content': similarity_score(contentful_entry['content'], strapi_entry['content'])
-            }
-            
-            # Determine match status for each field
-            field_status = {
-                field: '✅ Match' if score == 1.0 else '⚠️ Partial' if score > 0.85 else '❌ Mismatch'
-                for field, score in field_scores.items()
-            }
-            
-            # Calculate overall similarity score
-            overall_score = sum(field_scores.values()) / len(field_scores)
-            
-            # Determine overall status
-            if all(status == '✅ Match' for status in field_status.values()):
-                overall_status = '✅ Perfect Match'
-            elif any(status == '❌ Mismatch' for status in field_status.values()):
-                overall_status = '❌ Mismatch'
-            else:
-                overall_status = '⚠️ Partial Match'
-            
-            # Get detailed content differences
-            differences = find_detailed_differences(contentful_entry['content'], strapi_entry['content'])
-            
-            writer.writerow([
-                link,
-                overall_status,
-                f"{overall_score:.2f}",
-                field_status['title'],
-                field_status['metaTitle'],
-                field_status['metaDescription'],
-                field_status['categoryName'],
-                field_status['timeDuration'],
-                field_status['content'],
-                differences
-            ])
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
     
     print(f"✅ Validation complete! Report saved as {output_csv}")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,38 +1,26 @@
 import csv
-import difflib
-import re
+import os
+import sys
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fingerprint import fingerprint
+from common.normalize import normalize_content as normalize_text
+from common.diff_store import DiffWriter, diff_artifact_path
+
 # Configuration
 CONTENTFUL_CSV = "QA/blogs_data.csv"
 STRAPI_CSV = "QA/strapi_extracted_data.csv"
 OUTPUT_CSV = "./improved_validation_results.csv"
+DIFF_ARTIFACT = diff_artifact_path(OUTPUT_CSV)  # content_diff cells reference diffs stored here
 SIMILARITY_THRESHOLD = 0.95  # Stricter threshold for content matching
 EXACT_MATCH_FIELDS = {'categoryName', 'timeDuration'}  # Fields requiring exact matches
 
-def normalize_text(text):
-    """Enhanced text normalization"""
-    text = re.sub(r'\W+', ' ', text)  # Remove non-word characters
-    text = re.sub(r'\s+', ' ', text).strip().lower()
-    return text
-
 def content_hash(text):
-    """Create a quick content hash for fast comparison"""
-    return hash(normalize_text(text))
-
-def advanced_diff(text1, text2):
-    """Improved diff generator with context"""
-    differ = difflib.HtmlDiff(wrapcolumn=60)
-    return differ.make_table(
-        text1.splitlines(), 
-        text2.splitlines(),
-        context=True,
-        numlines=3,
-        fromdesc='Contentful',
-        todesc='Strapi'
-    )
+    """Create a stable content fingerprint for fast comparison"""
+    return fingerprint(normalize_text(text))
 
 def load_data(file_path, fields):
     """Load data with error handling and field validation"""
@@ -63,7 +51,7 @@ strapi_data = load_data(STRAPI_CSV, STRAPI_FIELDS)
 # Find all unique URLs from both systems
 all_urls = set(contentful_data.keys()).union(set(strapi_data.keys()))
 
-with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
+with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile, DiffWriter(DIFF_ARTIFACT) as diffs:
     writer = csv.writer(csvfile)
     headers = [
         'linkUrl', 'status', 'content_match', 'metadata_match',
@@ -115,9 +103,10 @@ with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
             
             # Generate detailed diff if similarity below threshold
             if similarity < SIMILARITY_THRESHOLD:
-                row_data['content_diff'] = advanced_diff(
+                row_data['content_diff'] = diffs.add(
                     contentful_data[url].get('content', ''),
-                    strapi_data[url].get('strapi_content', '')
+                    strapi_data[url].get('strapi_content', ''),
+                    'content'
                 )
 
         # Check metadata fields
@@ -135,4 +124,5 @@ with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
 
         writer.writerow(row_data.values())
 
-print(f"Validation complete! Results saved to {OUTPUT_CSV}")
\ No newline at end of file
+print(f"Validation complete! Results saved to {OUTPUT_CSV}")
+print(f"🔍 {len(diffs.keys)} content diffs ({diffs.truncated} truncated) saved to {DIFF_ARTIFACT}")
\ No newline at end of file
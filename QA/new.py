@@ -1,5 +1,10 @@
 import json
 import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.rich_text import RichTextWalker
 
 # Load JSON data
 json_file_path = "/Users/ankitsharma/Desktop/DataValidation/QA/resut.json"
@@ -19,26 +24,11 @@ fields = [
     "conceptsList", "linkUrl", "createdAt", "updatedAt", "timeDuration", "content"
 ]
 
-# Function to extract all text from deeply nested content blocks
-def extract_text_from_block(block, depth=0):
-    content_text = []
-    
-    # If the block contains direct text, extract it
-    if "value" in block:
-        text_value = block["value"].strip()
-
-        # Remove "Contentful - " prefix if present
-        if text_value.startswith("Contentful - "):
-            text_value = text_value.replace("Contentful - ", "", 1)
-
-        content_text.append(text_value)
-
-    # If the block contains more nested content, traverse deeper
-    if "content" in block:
-        for sub_block in block["content"]:
-            content_text.extend(extract_text_from_block(sub_block, depth + 1))
+# Function to extract all text from deeply nested content blocks (iterative, see common.rich_text)
+TEXT_WALKER = RichTextWalker(keep_empty=True, strip_prefix=True, containers=())
 
-    return content_text
+def extract_text_from_block(block):
+    return TEXT_WALKER.extract(block)
 
 # Function to extract all text content from `detailInfo`
 def extract_text_from_content(content_blocks):
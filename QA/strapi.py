@@ -1,8 +1,13 @@
-import requests
+import argparse
 import json
 import csv
-import time
-from bs4 import BeautifulSoup
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fetch_policy import FetchPolicy, RetryPolicy
+from common.strapi_client import fetch_sequential, fetch_concurrent
+from common.html_text import html_to_text
 
 # Strapi API Base URL
 STRAPI_API_BASE_URL = "https://qa-cms.msme.jswone.in/api/jsw-blogs-articless"
@@ -17,74 +22,113 @@ STRAPI_HEADERS = {
 
 # Load Contentful Blog Links
 contentful_file_path = "QA/resut.json"
-with open(contentful_file_path, "r", encoding="utf-8") as file:
-    contentful_data = json.load(file)
-
-# Extract linkUrls
-blog_links = [
-    blog["fields"].get("linkUrl", "").strip() 
-    for blog in contentful_data.get("items", []) 
-    if blog["fields"].get("linkUrl")
-]
-
-# Function to Clean HTML Content
-def clean_html(raw_html):
-    soup = BeautifulSoup(raw_html, "html.parser")
-    return soup.get_text(separator=" ").strip()
 
 # Output CSV File
 output_csv = "strapi_extracted_data.csv"
 
+# Async mode defaults
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10  # Requests per second
+
+# Retries per request for connection errors, timeouts, 408/429/5xx (see common.fetch_policy)
+DEFAULT_MAX_RETRIES = 4
+
 # Define CSV Headers
 fields = [
     "linkUrl", "title", "metaTitle", "metaDescription", "categoryName", 
     "timeDuration", "createdAt", "updatedAt", "publishedAt", "strapi_content"
 ]
 
-# Write CSV Data
-with open(output_csv, "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(fields)  # Write header row
-
-    for link in blog_links:
-        strapi_url = f"{STRAPI_API_BASE_URL}?filters[linkUrl][$eq]={link}&populate[detailInfo][populate]=*"
-
-        try:
-            response = requests.get(strapi_url, headers=STRAPI_HEADERS, timeout=10)
-            if response.status_code == 200:
-                strapi_data = response.json()
-
-                # Extract the first matching data entry
-                blog_entry = strapi_data.get("data", [{}])[0].get("attributes", {})
-
-                # Extract required fields
-                title = blog_entry.get("title", "N/A")
-                meta_title = blog_entry.get("metaTitle", "N/A")
-                meta_desc = blog_entry.get("metaDescription", "N/A")
-                category = blog_entry.get("categoryName", "N/A")
-                time_duration = blog_entry.get("timeDuration", "N/A")
-                created_at = blog_entry.get("createdAt", "N/A")
-                updated_at = blog_entry.get("updatedAt", "N/A")
-                published_at = blog_entry.get("publishedAt", "N/A")
-
-                # Extract and clean the content
-                content_blocks = blog_entry.get("detailInfo", [])
-                strapi_text = " ".join(clean_html(block.get("content", "")) for block in content_blocks)
-
-                # Write data row
-                writer.writerow([
-                    link, title, meta_title, meta_desc, category, 
-                    time_duration, created_at, updated_at, published_at, strapi_text
-                ])
-                
-                print(f"✅ Extracted content for: {link}")
-
-            else:
-                print(f"❌ Failed to fetch {link} - HTTP {response.status_code}")
-
-        except requests.RequestException as e:
-            print(f"⚠️ Error fetching {link}: {e}")
-
-        time.sleep(1)  # Prevents excessive API calls
-
-print(f"✅ Strapi data extraction complete! Results saved in {output_csv}")
+# Extract linkUrls
+def load_blog_links(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        contentful_data = json.load(file)
+
+    return [
+        blog["fields"].get("linkUrl", "").strip() 
+        for blog in contentful_data.get("items", []) 
+        if blog["fields"].get("linkUrl")
+    ]
+
+# Function to Clean HTML Content
+def clean_html(raw_html):
+    return html_to_text(raw_html, separator=" ").strip()
+
+def build_strapi_url(base_url, link):
+    return f"{base_url}?filters[linkUrl][$eq]={link}&populate[detailInfo][populate]=*"
+
+# Convert a FetchResult into the rows for its link
+def rows_from_result(result):
+    if result.error is not None:
+        print(f"⚠️ Error fetching {result.key}: {result.error}")
+        return []
+    if result.status != 200:
+        print(f"❌ Failed to fetch {result.key} - HTTP {result.status}")
+        return []
+
+    # Extract the first matching data entry
+    blog_entry = (result.payload.get("data") or [{}])[0].get("attributes", {})
+
+    # Extract and clean the content
+    content_blocks = blog_entry.get("detailInfo", [])
+    strapi_text = " ".join(clean_html(block.get("content", "")) for block in content_blocks)
+
+    print(f"✅ Extracted content for: {result.key}")
+    return [[
+        result.key,
+        blog_entry.get("title", "N/A"),
+        blog_entry.get("metaTitle", "N/A"),
+        blog_entry.get("metaDescription", "N/A"),
+        blog_entry.get("categoryName", "N/A"),
+        blog_entry.get("timeDuration", "N/A"),
+        blog_entry.get("createdAt", "N/A"),
+        blog_entry.get("updatedAt", "N/A"),
+        blog_entry.get("publishedAt", "N/A"),
+        strapi_text
+    ]]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch QA Strapi blog articles for every Contentful linkUrl")
+    parser.add_argument("--input", default=contentful_file_path, help="Contentful export JSON")
+    parser.add_argument("--output", default=output_csv, help="Output CSV path")
+    parser.add_argument("--base-url", default=STRAPI_API_BASE_URL, help="Strapi collection endpoint")
+    parser.add_argument("--mode", choices=["sequential", "async"], default="sequential")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="0 = unlimited")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help="Retries per request on connection errors, timeouts and 408/429/5xx (0 = none)")
+    parser.add_argument("--fixed-concurrency", action="store_true",
+                        help="Keep --concurrency requests in flight instead of backing off when Strapi struggles")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    blog_links = load_blog_links(args.input)
+    url_items = [(link, build_strapi_url(args.base_url, link)) for link in blog_links]
+    policy = FetchPolicy(retry=RetryPolicy(max_retries=args.max_retries), adaptive=not args.fixed_concurrency)
+
+    # Write CSV Data
+    with open(args.output, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fields)  # Write header row
+
+        if args.mode == "async":
+            results = fetch_concurrent(url_items, STRAPI_HEADERS, concurrency=args.concurrency,
+                                       rate=args.rate or None, on_result=rows_from_result, policy=policy)
+            for rows in results:
+                writer.writerows(rows)
+        else:
+            for result in fetch_sequential(url_items, STRAPI_HEADERS, delay=1, policy=policy):
+                writer.writerows(rows_from_result(result))
+
+    policy.print_summary()
+    print(f"✅ Strapi data extraction complete! Results saved in {args.output}")
+
+    # These links are absent from the output because Strapi kept failing, not because they are missing
+    if policy.stats.failed:
+        print(f"❌ {len(policy.stats.failed)} links still failed after retries: {', '.join(policy.stats.failed[:10])}"
+              f"{' ...' if len(policy.stats.failed) > 10 else ''}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Load time of the comparator inputs as CSV vs Arrow IPC (common.columnar).
+
+Generates a synthetic Contentful export (same generator as
+bench_stream_compare), converts it to .arrow and times reading it back:
+csv.DictReader over every column, read_rows over every column, read_rows
+projected to the metadata fields only (the article bodies are never decoded),
+and pd.read_csv vs read_frame for the pandas comparators.
+
+    python benchmarks/bench_columnar_load.py                     # 100k articles
+    python benchmarks/bench_columnar_load.py --articles 20000 --repeat 5
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_stream_compare import generate  # noqa: E402
+from common.columnar import iter_lists, open_row_writer, read_frame, read_rows  # noqa: E402
+
+METADATA_FIELDS = ['linkUrl', 'title', 'metaTitle', 'metaDescription', 'linkText', 'categoryName', 'timeDuration']
+
+
+def convert(csv_path, arrow_path):
+    rows = iter_lists(csv_path)
+    header = next(rows)
+    with open_row_writer(arrow_path, header) as writer:
+        writer.writerows(rows)
+
+
+def dict_reader(path):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+def best_of(repeat, fn, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--content-words", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="columnar-bench-") as workdir:
+        print(f"Generating {args.articles} synthetic articles ...")
+        csv_path, _ = generate(workdir, args.articles, args.content_words, args.seed)
+        arrow_path = os.path.join(workdir, "contentful.arrow")
+        start = time.perf_counter()
+        convert(csv_path, arrow_path)
+        convert_time = time.perf_counter() - start
+
+        cases = [
+            ("csv.DictReader, all columns", lambda: dict_reader(csv_path)),
+            ("read_rows .csv, all columns", lambda: sum(1 for _ in read_rows(csv_path))),
+            ("read_rows .arrow, all columns", lambda: sum(1 for _ in read_rows(arrow_path))),
+            ("read_rows .arrow, metadata only", lambda: sum(1 for _ in read_rows(arrow_path, METADATA_FIELDS))),
+            ("pd.read_csv, all columns", lambda: len(read_frame(csv_path))),
+            ("read_frame .arrow, all columns", lambda: len(read_frame(arrow_path))),
+            ("read_frame .arrow, metadata only", lambda: len(read_frame(arrow_path, METADATA_FIELDS))),
+        ]
+
+        print("=" * 60)
+        print(f"CSV   {os.path.getsize(csv_path) / 1e6:8.1f} MB")
+        print(f"Arrow {os.path.getsize(arrow_path) / 1e6:8.1f} MB  (converted in {convert_time:.1f}s)")
+        print("-" * 60)
+        baseline = None
+        for label, fn in cases:
+            elapsed = best_of(args.repeat, fn)
+            baseline = baseline or elapsed
+            print(f"{label:<36} {elapsed:8.3f}s  {baseline / elapsed:6.1f}x")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Full Contentful download vs Sync API deltas, against the local mock.
+
+Runs an initial sync of N entries into a snapshot, then for a few rounds
+changes a fraction of the space on the mock (updates, deletions, new
+entries) and brings the snapshot up to date twice: with a delta sync from the
+saved token and with a full re-download. Reports requests and time for each;
+after every sync the snapshot must hold exactly the mock's published entries.
+
+    python benchmarks/bench_contentful_sync.py
+    python benchmarks/bench_contentful_sync.py --entries 20000 --change 0.005 --latency 0.05
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.contentful_sync import SyncClient, sync_snapshot
+from benchmarks.mock_contentful import ACCESS_TOKEN, SPACE_ID, start_server
+
+
+def run(base_url, snapshot, full):
+    client = SyncClient(SPACE_ID, ACCESS_TOKEN, base_url=base_url)
+    start = time.perf_counter()
+    stats = sync_snapshot(client, snapshot, full=full)
+    return time.perf_counter() - start, stats
+
+
+def matches(snapshot, mock):
+    with open(snapshot, "r", encoding="utf-8") as f:
+        items = json.load(f)["items"]
+    return {item["sys"]["id"]: item for item in items} == mock.current() and len(items) == len(mock.current())
+
+
+def report(label, elapsed, stats, ok):
+    print(f"{label:<16} {stats['requests']:>6} req {elapsed:8.2f}s  +{stats['added']:<6} ~{stats['updated']:<6}"
+          f" -{stats['deleted']:<6} {stats['entries']:>7} entries  {'ok' if ok else '❌ MISMATCH'}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--change", type=float, default=0.01, help="Fraction of entries changed per round")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency per request")
+    args = parser.parse_args()
+
+    server, mock, base_url = start_server(entries=args.entries, latency=args.latency)
+    workdir = tempfile.mkdtemp(prefix="sync-bench-")
+    delta_path = os.path.join(workdir, "delta.json")
+    full_path = os.path.join(workdir, "full.json")
+    try:
+        print("=" * 72)
+        elapsed, stats = run(base_url, delta_path, full=False)
+        report("initial", elapsed, stats, matches(delta_path, mock))
+
+        for round_number in range(1, args.rounds + 1):
+            changes = max(1, int(args.entries * args.change))
+            ids = list(mock.current())
+            mock.update(ids[:changes])
+            mock.delete(ids[-(changes // 4 or 1):])
+            mock.publish(changes // 4 or 1)
+
+            elapsed, stats = run(base_url, delta_path, full=False)
+            report(f"round {round_number} delta", elapsed, stats, matches(delta_path, mock))
+            elapsed, stats = run(base_url, full_path, full=True)
+            report(f"round {round_number} full", elapsed, stats, matches(full_path, mock))
+        print("=" * 72)
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+HtmlDiff tables in the report CSV vs capped diffs in a gzip artifact.
+
+Takes the article texts of the Contentful extract, builds a "Strapi" copy of
+each with a few sentences edited, dropped or added, and for every pair times
+the old per-mismatch difflib.HtmlDiff.make_table against common.diff_store
+(unified diff, capped, written once per distinct pair). Reports the time and
+the bytes each approach adds to the run's output.
+
+    python benchmarks/bench_diff_artifact.py
+    python benchmarks/bench_diff_artifact.py --copies 10 --edits 20
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.columnar import read_rows
+from common.diff_store import DiffWriter, SENTENCE_END
+
+DEFAULT_INPUT = os.path.join(ROOT, "Prod/csv/updateextracted_contentful_data.csv")
+
+
+def edited(text, edits, rng):
+    sentences = SENTENCE_END.split(text)
+    for _ in range(edits):
+        idx = rng.randrange(len(sentences))
+        action = rng.choice(("edit", "drop", "add"))
+        if action == "edit":
+            sentences[idx] = sentences[idx].replace(" the ", " a ", 1) + " (edited)"
+        elif action == "drop" and len(sentences) > 1:
+            sentences.pop(idx)
+        else:
+            sentences.insert(idx, "A sentence that only exists in Strapi.")
+    return " ".join(sentences)
+
+
+def html_table(text1, text2):
+    return difflib.HtmlDiff(wrapcolumn=60).make_table(text1.splitlines(), text2.splitlines(), context=True,
+                                                      numlines=3, fromdesc='Contentful', todesc='Strapi')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=DEFAULT_INPUT)
+    parser.add_argument("--copies", type=int, default=3, help="Times each article is paired (different edits)")
+    parser.add_argument("--edits", type=int, default=5, help="Sentence edits per Strapi copy")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [row["content"] for row in read_rows(args.input, ["content"]) if row["content"]]
+    pairs = [(text, edited(text, args.edits, rng)) for text in texts for _ in range(args.copies)]
+
+    start = time.perf_counter()
+    html_bytes = sum(len(html_table(a, b).encode("utf-8")) for a, b in pairs)
+    html_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory(prefix="diff-bench-") as workdir:
+        path = os.path.join(workdir, "report.diffs.jsonl.gz")
+        start = time.perf_counter()
+        with DiffWriter(path) as diffs:
+            cell_bytes = sum(len(diffs.add(a, b, "content").encode("utf-8")) for a, b in pairs)
+        artifact_time = time.perf_counter() - start
+        artifact_bytes = os.path.getsize(path)
+
+    print("=" * 60)
+    print(f"{len(pairs)} mismatching content pairs, {args.edits} sentence edits each")
+    print(f"{'':<18} {'time':>9} {'CSV bytes':>12} {'artifact':>10}")
+    print(f"{'HtmlDiff in CSV':<18} {html_time:8.2f}s {html_bytes:>12,} {'-':>10}")
+    print(f"{'capped artifact':<18} {artifact_time:8.2f}s {cell_bytes:>12,} {artifact_bytes:>10,}")
+    print(f"{'':<18} {html_time / artifact_time:8.1f}x {html_bytes / (cell_bytes + artifact_bytes):11.1f}x smaller")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
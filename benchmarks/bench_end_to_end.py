@@ -0,0 +1,199 @@
+"""
+End-to-end timings of the Prod validation stages on synthetic corpora.
+
+For every size, generates a corpus with benchmarks/synthetic_corpus.py (or
+reuses one from --data-dir) and runs each stage script on it as its own
+process, the way it is run by hand:
+
+    extract           Prod/prod_new_content.py   contentful.json -> contentful.csv
+    extract_metadata  Prod/prod_new.py           contentful.json -> prod_new.csv
+    fetch             Prod/prod_strapi_new.py    batch mode against benchmarks/mock_strapi.py
+                                                 serving the corpus (sizes up to --fetch-max)
+    compare           Prod/compareV5.py          contentful.csv + strapi.csv
+    compare_stream    Prod/compareV5.py --stream
+    compare_claudev2  Prod/claudev2.py
+
+and records wall time, CPU time (user + system) and peak RSS of the stage's
+process (from os.wait4), plus the size of what it wrote. Results go to a
+JSON file with the machine, Python version and git commit, so runs can be
+compared over time; --baseline prints the ratios against an earlier file.
+
+    python benchmarks/bench_end_to_end.py
+    python benchmarks/bench_end_to_end.py --sizes 1000 10000 100000 --stages extract compare_stream
+    python benchmarks/bench_end_to_end.py --sizes 1000000 --data-dir /data/corpora --timeout 14400
+    python benchmarks/bench_end_to_end.py --baseline benchmarks/results/e2e-20250301-101500.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from benchmarks.mock_strapi import start_server
+from benchmarks.synthetic_corpus import write_corpus
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+MB = 1024 * 1024
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB on Linux
+
+# name -> (script, options(corpus_dir, base_url), output file)
+STAGES = {
+    "extract": ("Prod/prod_new_content.py",
+                lambda d, url: ["--input", f"{d}/contentful.json", "--output", f"{d}/contentful.csv"],
+                "contentful.csv"),
+    "extract_metadata": ("Prod/prod_new.py",
+                         lambda d, url: ["--input", f"{d}/contentful.json", "--output", f"{d}/prod_new.csv"],
+                         "prod_new.csv"),
+    "fetch": ("Prod/prod_strapi_new.py",
+              lambda d, url: ["--input", f"{d}/contentful.json", "--output", f"{d}/strapi_fetched.csv",
+                              "--base-url", url, "--mode", "batch", "--rate", "0"],
+              "strapi_fetched.csv"),
+    "compare": ("Prod/compareV5.py",
+                lambda d, url: ["--contentful", f"{d}/contentful.csv", "--strapi", f"{d}/strapi.csv",
+                                "--output", f"{d}/compareV5.csv"],
+                "compareV5.csv"),
+    "compare_stream": ("Prod/compareV5.py",
+                       lambda d, url: ["--contentful", f"{d}/contentful.csv", "--strapi", f"{d}/strapi.csv",
+                                       "--output", f"{d}/compareV5_stream.csv", "--stream"],
+                       "compareV5_stream.csv"),
+    "compare_claudev2": ("Prod/claudev2.py",
+                         lambda d, url: ["--contentful", f"{d}/contentful.csv", "--strapi", f"{d}/strapi.csv",
+                                         "--output", f"{d}/claudev2.csv"],
+                         "claudev2.csv"),
+}
+
+
+def run_stage(command, log_path, timeout):
+    """Run a stage process; returns (status, wall seconds, cpu seconds, peak RSS in MB)."""
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=ROOT, stdout=log, stderr=subprocess.STDOUT)
+        deadline = start + timeout if timeout else None
+        while True:
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            if deadline and time.perf_counter() > deadline:
+                process.kill()
+                pid, status, usage = os.wait4(process.pid, 0)
+                break
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+    process.returncode = code = os.waitstatus_to_exitcode(status)  # Reaped by wait4, not by Popen
+    if deadline and elapsed > timeout:
+        outcome = "timeout"
+    else:
+        outcome = "ok" if code == 0 else f"exit {code}"
+    return outcome, elapsed, usage.ru_utime + usage.ru_stime, usage.ru_maxrss * RSS_UNIT / MB
+
+
+def corpus_for(size, args, workdir):
+    """Directory of the corpus for `size`, generated unless --data-dir already holds it."""
+    directory = os.path.join(args.data_dir or workdir, f"corpus-{size}")
+    manifest_path = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if (manifest["seed"], manifest["mismatch_rate"], manifest["missing_rate"]) == \
+                (args.seed, args.mismatch_rate, args.missing_rate):
+            return directory, manifest
+    print(f"🧪 Generating {size} entries in {directory}...")
+    manifest = write_corpus(directory, size, args.seed, args.mismatch_rate, args.missing_rate)
+    return directory, manifest
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def print_baseline(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["entries"], r["stage"]): r for r in json.load(f)["stages"]}
+    print(f"Compared with {baseline_path} (ratio = now / then):")
+    print(f"{'entries':>9} {'stage':<18} {'time':>8} {'peak RSS':>9}")
+    for record in results:
+        before = baseline.get((record["entries"], record["stage"]))
+        if not before or before["status"] != "ok" or record["status"] != "ok":
+            continue
+        print(f"{record['entries']:>9} {record['stage']:<18} {record['seconds'] / before['seconds']:7.2f}x "
+              f"{record['peak_rss_mb'] / before['peak_rss_mb']:8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Corpus sizes (entries); 100000 and 1000000 take hours for the compare stages")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--data-dir", help="Keep corpora here and reuse them across runs (default: a temp dir)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mismatch-rate", type=float, default=0.05)
+    parser.add_argument("--missing-rate", type=float, default=0.01)
+    parser.add_argument("--fetch-max", type=int, default=10000,
+                        help="Largest corpus the fetch stage runs on (the mock holds it in memory)")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds before a stage is killed (0 = none)")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/e2e-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    started_at = time.strftime("%Y%m%d-%H%M%S")
+    output = args.output or os.path.join(RESULTS_DIR, f"e2e-{started_at}.json")
+    run = {"started_at": started_at, "git_commit": git_commit(), "python": platform.python_version(),
+           "platform": platform.platform(), "cpu_count": os.cpu_count(), "args": vars(args)}
+    corpora, results = [], []
+
+    workdir = tempfile.mkdtemp(prefix="e2e-bench-")
+    try:
+        print("=" * 60)
+        print(f"{'entries':>9} {'stage':<18} {'time':>9} {'cpu':>9} {'peak RSS':>9} {'output':>10}  status")
+        for size in args.sizes:
+            corpus_dir, manifest = corpus_for(size, args, workdir)
+            corpora.append({key: value for key, value in manifest.items() if key != "truth"})
+            for stage in args.stages:
+                script, options, output_name = STAGES[stage]
+                server, base_url = None, None
+                if stage == "fetch":
+                    if size > args.fetch_max:
+                        results.append({"entries": size, "stage": stage, "status": "skipped"})
+                        continue
+                    with open(os.path.join(corpus_dir, "strapi.json"), encoding="utf-8") as f:
+                        server, _, base_url = start_server(entries=json.load(f)["data"])
+
+                command = [sys.executable, os.path.join(ROOT, script)] + options(corpus_dir, base_url)
+                try:
+                    status, seconds, cpu, rss = run_stage(command, os.path.join(corpus_dir, f"{stage}.log"),
+                                                          args.timeout)
+                finally:
+                    if server is not None:
+                        server.shutdown()
+                        server.server_close()
+
+                output_path = os.path.join(corpus_dir, output_name)
+                output_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+                results.append({"entries": size, "stage": stage, "script": script, "status": status,
+                                "seconds": round(seconds, 3), "cpu_seconds": round(cpu, 3),
+                                "peak_rss_mb": round(rss, 1), "output_bytes": output_bytes})
+                print(f"{size:>9} {stage:<18} {seconds:8.2f}s {cpu:8.2f}s {rss:7.0f}MB {output_bytes / MB:8.1f}MB  "
+                      f"{status}")
+        print("=" * 60)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"run": run, "corpora": corpora, "stages": results}, f, indent=2)
+    print(f"📁 Results saved to {output}")
+    if args.baseline:
+        print_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
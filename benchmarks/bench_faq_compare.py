@@ -0,0 +1,89 @@
+"""
+Per-slug df.loc loop vs the join in common.faq_compare for the FAQ compare scripts.
+
+Builds a Contentful and a Strapi FAQ export of N entries (a share of slugs
+only on one side, a share of fields edited, blanked or padded with spaces),
+then times the loop FAQ/code/comparev4.py used to run (`df.loc[slug]` per
+common slug, one cell read per compared column) against compare_on_slug, and
+checks that both mark the same cells as mismatching.
+
+    python benchmarks/bench_faq_compare.py
+    python benchmarks/bench_faq_compare.py --entries 1000 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.faq_compare import FAQ_COLUMNS, compare_on_slug
+
+
+def faq_exports(entries, rng):
+    slugs = np.array([f"faq-question-{i}" for i in range(entries)], dtype=object)
+    contentful = pd.DataFrame({'Slug': slugs})
+    for col in FAQ_COLUMNS:
+        contentful[col] = [f"{col} text for question {i}, with a few more words" for i in range(entries)]
+    strapi = contentful.copy()
+    for col in FAQ_COLUMNS:
+        roll = rng.random(entries)
+        strapi.loc[roll < 0.01, col] = strapi.loc[roll < 0.01, col] + " (edited)"
+        strapi.loc[(roll >= 0.01) & (roll < 0.015), col] = np.nan
+        strapi.loc[(roll >= 0.015) & (roll < 0.02), col] = " " + strapi.loc[(roll >= 0.015) & (roll < 0.02), col]
+    keep = rng.random(entries)
+    contentful = contentful[keep > 0.01].reset_index(drop=True)  # Only in Strapi
+    strapi = strapi[(keep < 0.01) | (keep > 0.02)].sample(frac=1, random_state=0).reset_index(drop=True)
+    return contentful, strapi
+
+
+def loop_compare(df_contentful, df_strapi, columns):
+    """The old per-slug loop; returns the (slug, column) cells that differ."""
+    df_contentful = df_contentful.set_index('Slug')
+    df_strapi = df_strapi.set_index('Slug')
+    mismatched = set()
+    for slug in df_contentful.index.intersection(df_strapi.index):
+        row_contentful = df_contentful.loc[slug]
+        row_strapi = df_strapi.loc[slug]
+        for col in columns:
+            val_contentful = str(row_contentful[col]).strip() if pd.notna(row_contentful[col]) else ""
+            val_strapi = str(row_strapi[col]).strip() if pd.notna(row_strapi[col]) else ""
+            if val_contentful != val_strapi:
+                mismatched.add((slug, col))
+    return mismatched
+
+
+def join_compare(df_contentful, df_strapi, columns):
+    equal = compare_on_slug(df_contentful, df_strapi, columns).equal
+    stacked = (~equal).stack()
+    return set(stacked[stacked].index)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print("=" * 60)
+    print(f"{'entries':>9} {'loc loop':>10} {'join':>10} {'speedup':>8}  mismatched cells")
+    for entries in args.entries:
+        contentful, strapi = faq_exports(entries, rng)
+        loop_time, old = timed(loop_compare, contentful, strapi, FAQ_COLUMNS)
+        join_time, new = timed(join_compare, contentful, strapi, FAQ_COLUMNS)
+        verdict = "same" if old == new else "differ"
+        print(f"{entries:>9} {loop_time:9.3f}s {join_time:9.3f}s {loop_time / join_time:7.1f}x  {len(new)} {verdict}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
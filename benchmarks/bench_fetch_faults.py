@@ -0,0 +1,86 @@
+"""
+How the Strapi fetch copes with a misbehaving server, per fetch policy.
+
+Runs the async fetch of every article against benchmarks/mock_strapi.py with
+one kind of fault injected at a time, under three policies:
+
+    no retry     one attempt per link, fixed concurrency (the old behaviour)
+    retry        backoff + Retry-After + circuit breaker, fixed concurrency
+    retry+aimd   the same with adaptive concurrency (the default)
+
+and reports how many links came back, how long it took, the attempts and
+retries, latency percentiles and the lowest concurrency the limiter used.
+
+    python benchmarks/bench_fetch_faults.py
+    python benchmarks/bench_fetch_faults.py --articles 1000 --latency 0.05 --concurrency 32 --scenarios errors outage
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fetch_policy import CircuitBreaker, FetchPolicy, RetryPolicy, percentile
+from common.strapi_client import fetch_concurrent
+from benchmarks.mock_strapi import Faults, start_server
+
+HEADERS = {"accept": "application/json"}
+
+SCENARIOS = {
+    "clean": {},
+    "errors": {"error_rate": 0.05},
+    "throttled": {"throttle_rate": 0.05},
+    "overloaded": {"max_concurrent": 4},
+    "drops": {"drop_rate": 0.03},
+    "slow": {"slow_rate": 0.02, "slow_latency": 1.0},
+    "outage": {"outage": (0.3, 3.0)},
+}
+
+
+def policies(cooldown):
+    return {
+        "no retry": FetchPolicy(retry=RetryPolicy(max_retries=0), breaker=CircuitBreaker(cooldown=cooldown),
+                                adaptive=False),
+        "retry": FetchPolicy(breaker=CircuitBreaker(cooldown=cooldown), adaptive=False),
+        "retry+aimd": FetchPolicy(breaker=CircuitBreaker(cooldown=cooldown)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency per request")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cooldown", type=float, default=2.0, help="Circuit breaker cooldown (seconds)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Mock Strapi: {args.articles} articles, {args.latency * 1000:.0f} ms latency, "
+          f"concurrency {args.concurrency}")
+    print("=" * 92)
+    print(f"{'scenario':<11} {'policy':<11} {'ok':>5} {'failed':>6} {'time':>8} {'attempts':>8} {'retries':>7} "
+          f"{'p50':>7} {'p99':>7} {'min conc':>8}")
+    for scenario in args.scenarios:
+        for name, policy in policies(args.cooldown).items():
+            faults = Faults(seed=args.seed, **SCENARIOS[scenario])
+            server, mock, base_url = start_server(articles=args.articles, latency=args.latency, faults=faults)
+            url_items = [(f"article-{i}", f"{base_url}?filters[linkUrl][$eq]=article-{i}")
+                         for i in range(args.articles)]
+            start = time.perf_counter()
+            results = fetch_concurrent(url_items, HEADERS, concurrency=args.concurrency, policy=policy)
+            elapsed = time.perf_counter() - start
+            server.shutdown()
+            server.server_close()
+
+            ok = sum(1 for result in results if result.status == 200 and result.payload.get("data"))
+            latencies = sorted(policy.stats.latencies)
+            print(f"{scenario:<11} {name:<11} {ok:>5} {args.articles - ok:>6} {elapsed:7.2f}s "
+                  f"{policy.stats.attempts:>8} {policy.stats.retries:>7} "
+                  f"{percentile(latencies, 0.5) * 1000:5.0f}ms {percentile(latencies, 0.99) * 1000:5.0f}ms "
+                  f"{policy.limiter.low:>8}")
+    print("=" * 92)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+BeautifulSoup get_text vs the streaming common.html_text extractor.
+
+The corpus is the HTML the Strapi scripts clean: every Contentful rich-text
+document in Prod/resut.json rendered the way the migration stored it in
+Strapi (one detailInfo block per top-level node: headings, paragraphs with
+bold/italic/links, lists, tables, entities), plus the HTML fields of
+Legal/data/strapi.json. Each block is extracted both ways; texts must match.
+
+    python benchmarks/bench_html_text.py
+    python benchmarks/bench_html_text.py --copies 20 --repeat 5
+"""
+import argparse
+import html
+import json
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.html_text import html_to_text
+
+PROD_INPUT = os.path.join(ROOT, "Prod/resut.json")
+LEGAL_INPUT = os.path.join(ROOT, "Legal/data/strapi.json")
+
+BLOCK_TAGS = {
+    "paragraph": "p", "heading-1": "h1", "heading-2": "h2", "heading-3": "h3", "heading-4": "h4",
+    "heading-5": "h5", "heading-6": "h6", "unordered-list": "ul", "ordered-list": "ol", "list-item": "li",
+    "blockquote": "blockquote", "table": "table", "table-row": "tr", "table-cell": "td", "table-header-cell": "th",
+}
+MARK_TAGS = {"bold": "strong", "italic": "em", "underline": "u", "code": "code"}
+
+
+def render(node):
+    """Contentful rich-text node -> HTML, in the shape Strapi's editor stores it."""
+    node_type = node.get("nodeType")
+    if node_type == "text":
+        text = html.escape(node.get("value", ""), quote=False).replace("  ", " &nbsp;")
+        for mark in node.get("marks", []):
+            tag = MARK_TAGS.get(mark.get("type"))
+            if tag:
+                text = f"<{tag}>{text}</{tag}>"
+        return text
+    inner = "".join(render(child) for child in node.get("content", []))
+    if node_type == "hyperlink":
+        uri = html.escape(node.get("data", {}).get("uri", ""))
+        return f'<a href="{uri}" target="_blank" rel="noopener noreferrer">{inner}</a>'
+    if node_type == "hr":
+        return "<hr>"
+    tag = BLOCK_TAGS.get(node_type)
+    if tag == "table":
+        return f'<figure class="table"><table><tbody>{inner}</tbody></table></figure>'
+    return f"<{tag}>{inner}</{tag}>\n" if tag else inner
+
+
+def prod_blocks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    blocks = []
+    for item in data.get("items", []):
+        detail = item.get("fields", {}).get("detailInfo")
+        if isinstance(detail, dict):
+            document = detail.get("en-US", detail)
+            blocks.extend(render(node) for node in document.get("content", []))
+    return blocks
+
+
+def legal_blocks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    blocks = []
+    for item in data.get("data", []):
+        for value in item.get("attributes", {}).values():
+            if isinstance(value, str) and "<" in value:
+                blocks.append(value)
+    return blocks
+
+
+def bs4_text(raw_html):
+    return BeautifulSoup(raw_html, "html.parser").get_text(separator=" ")
+
+
+def run(fn, blocks, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [fn(block) for block in blocks]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prod", default=PROD_INPUT)
+    parser.add_argument("--legal", default=LEGAL_INPUT)
+    parser.add_argument("--copies", type=int, default=5, help="Repeat the corpus to get stable timings")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpora = [("prod", prod_blocks(args.prod)), ("legal", legal_blocks(args.legal))]
+
+    print("=" * 60)
+    print(f"{'corpus':<8} {'blocks':>7} {'MB':>6} {'bs4':>9} {'streaming':>10} {'speedup':>8}")
+    for label, blocks in corpora:
+        blocks = blocks * args.copies
+        size_mb = sum(len(block.encode("utf-8")) for block in blocks) / 1e6
+        old_time, old_texts = run(bs4_text, blocks, args.repeat)
+        new_time, new_texts = run(html_to_text, blocks, args.repeat)
+        same = sum(old == new for old, new in zip(old_texts, new_texts))
+        print(f"{label:<8} {len(blocks):>7} {size_mb:6.2f} {size_mb / old_time:6.1f}MB/s {size_mb / new_time:7.1f}MB/s "
+              f"{old_time / new_time:7.1f}x")
+        if same != len(blocks):
+            print(f"   ❌ {len(blocks) - same} blocks differ")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
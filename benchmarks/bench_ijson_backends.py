@@ -0,0 +1,76 @@
+"""
+ijson backends on the repo's Contentful exports, text vs binary mode.
+
+Streams every element of `items` from each export with each ijson backend
+that loads here, once from a file opened in text mode (what the extractors
+used to do) and once in binary mode (what they do now, with the backend
+picked by common.json_stream.ijson_backend). Every run must yield the same
+items as the first one. Backends that are not installed are listed as such.
+
+    python benchmarks/bench_ijson_backends.py
+    python benchmarks/bench_ijson_backends.py --repeat 5 Prod/new.json
+"""
+import argparse
+import os
+import sys
+import time
+
+import ijson
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.json_stream import ijson_backend
+
+DEFAULT_INPUTS = [os.path.join(ROOT, path) for path in ("Prod/new.json", "Prod/resut.json", "QA/resut.json")]
+
+
+def load_backends():
+    backends = {}
+    for name in ijson.ALL_BACKENDS:
+        try:
+            backends[name] = ijson.get_backend(name)
+        except ImportError:
+            backends[name] = None
+    return backends
+
+
+def run(backend, path, mode, repeat):
+    best, items = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(path, mode, **({"encoding": "utf-8"} if mode == "r" else {})) as file:
+            items = list(backend.items(file, "items.item"))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, items
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("inputs", nargs="*", default=DEFAULT_INPUTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = load_backends()
+    print("=" * 60)
+    print(f"Extractors pick: {ijson_backend().backend_name}")
+    print(f"{'export':<16} {'backend':<11} {'text':>10} {'binary':>10} {'MB/s':>7}")
+    for path in args.inputs:
+        size_mb = os.path.getsize(path) / 1e6
+        label = os.path.relpath(path, ROOT)
+        reference = None
+        for name, backend in backends.items():
+            if backend is None:
+                print(f"{label:<16} {name:<11} {'not available':>21}")
+                continue
+            text_time, text_items = run(backend, path, "r", args.repeat)
+            binary_time, binary_items = run(backend, path, "rb", args.repeat)
+            reference = text_items if reference is None else reference
+            same = text_items == reference and binary_items == reference
+            print(f"{label:<16} {name:<11} {text_time:9.3f}s {binary_time:9.3f}s {size_mb / binary_time:7.1f}"
+                  f"{'' if same else '  ❌ DIFFERS'}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Old per-script normalize functions vs the common.normalize profiles.
+
+Every cell of the Prod/csv exports is normalized with the two-pass functions the
+compare scripts used to carry and with the matching single-pass profile; outputs
+must be identical. The profiles are timed with a cold memo cache (first run over
+the corpus) and a warm one (second run, as when a script normalizes both exports
+or re-normalizes values at compare time).
+
+    python benchmarks/bench_normalize.py --repeat 5
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.normalize import BOOLEAN_MAPPING, get_normalizer
+
+DEFAULT_FILES = [
+    os.path.join(ROOT, "Prod/csv/updateextracted_contentful_data.csv"),
+    os.path.join(ROOT, "Prod/csv/new_Strapi_prod.csv"),
+]
+
+
+# The functions as they were copied across the compare scripts
+def old_content(text):
+    text = re.sub(r'\W+', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip().lower()
+    return text
+
+
+def old_ascii(text):
+    if not isinstance(text, str):
+        text = str(text)
+    text = re.sub(r'[^a-zA-Z0-9 ]+', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip().lower()
+    return text
+
+
+def old_boolean(text):
+    text = old_ascii(text)
+    return BOOLEAN_MAPPING.get(text, text)
+
+
+def old_metadata(text):
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+OLD = {"content": old_content, "ascii": old_ascii, "metadata": old_metadata, "boolean": old_boolean}
+
+
+def load_values(paths):
+    values = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                values.extend(row)
+    return values
+
+
+def timed(fn, values):
+    start = time.perf_counter()
+    result = [fn(value) for value in values]
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    values = load_values(args.files)
+    size_mb = sum(len(value) for value in values) / 1e6
+    distinct = len(set(values))
+
+    print("=" * 72)
+    print(f"{len(values)} values ({distinct} distinct, {size_mb:.1f}M chars)")
+    print(f"{'profile':<10}{'old':>10}{'cold':>10}{'warm':>10}{'speedup cold/warm':>20}  output")
+    for profile, old_fn in OLD.items():
+        new_fn = get_normalizer(profile)
+        old_time = min(timed(old_fn, values)[0] for _ in range(args.repeat))
+        cold_times, warm_times = [], []
+        for _ in range(args.repeat):
+            new_fn.cache_clear()
+            cold_time, result = timed(new_fn, values)
+            warm_time, _ = timed(new_fn, values)
+            cold_times.append(cold_time)
+            warm_times.append(warm_time)
+        cold_time, warm_time = min(cold_times), min(warm_times)
+        same = "identical" if result == timed(old_fn, values)[1] else "❌ DIFFERS"
+        print(f"{profile:<10}{old_time:>9.3f}s{cold_time:>9.3f}s{warm_time:>9.3f}s"
+              f"{old_time / cold_time:>11.1f}x /{old_time / warm_time:>5.1f}x  {same}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
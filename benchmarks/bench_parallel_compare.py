@@ -0,0 +1,55 @@
+"""
+Serial vs process-pool compare (compareV5.compare_url) for 1..N workers.
+
+The Prod/csv exports are replicated `--copies` times (with suffixed URLs) so there
+is enough work to spread over the pool. Every worker count must produce exactly
+the same rows as the serial run.
+
+    python benchmarks/bench_parallel_compare.py
+    python benchmarks/bench_parallel_compare.py --copies 10 --max-workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Prod"))
+from common.parallel_compare import compare_items, default_workers
+from compareV5 import load_data, compare_url, CONTENTFUL_FIELDS, STRAPI_FIELDS
+
+
+def replicate(data, copies):
+    return {f"{url}#{copy}": entry for copy in range(copies) for url, entry in data.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contentful", default=os.path.join(ROOT, "Prod/csv/updateextracted_contentful_data.csv"))
+    parser.add_argument("--strapi", default=os.path.join(ROOT, "Prod/csv/new_Strapi_prod.csv"))
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    contentful_data = replicate(load_data(args.contentful, CONTENTFUL_FIELDS), args.copies)
+    strapi_data = replicate(load_data(args.strapi, STRAPI_FIELDS), args.copies)
+    urls = sorted(set(contentful_data) | set(strapi_data))
+    items = [(url, contentful_data.get(url, {}), strapi_data.get(url, {})) for url in urls]
+
+    print("=" * 60)
+    print(f"URLs compared: {len(items)}   CPUs available: {default_workers()}")
+    baseline_time = baseline = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        rows = compare_items(compare_url, items, workers=workers)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline_time, baseline = elapsed, rows
+        identical = "identical" if rows == baseline else "❌ DIFFERS from serial"
+        print(f"workers={workers:<3} {elapsed:8.3f}s   {baseline_time / elapsed:5.2f}x   {identical}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
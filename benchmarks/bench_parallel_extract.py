@@ -0,0 +1,83 @@
+"""
+Throughput of Prod/prod_new.py with --workers 1 (serial) vs a process pool.
+
+Builds a large Contentful export by repeating the items of Prod/resut.json
+under fresh ids/linkUrls (streamed to disk, so multi-GB files are fine), runs
+prod_new once per worker count and reports entries/s. Every output must be
+byte-identical to the serial one. Serial mode parses with ijson in one
+process; with workers the reader only splits the file into raw entries and
+the parsing moves to the pool, so expect the gain to track the core count.
+
+    python benchmarks/bench_parallel_extract.py                        # ~40 MB export
+    python benchmarks/bench_parallel_extract.py --copies 2000 --workers 1 2 4 8
+"""
+import argparse
+import filecmp
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTRACT_SCRIPT = os.path.join(ROOT, "Prod", "prod_new.py")
+SOURCE = os.path.join(ROOT, "Prod", "resut.json")
+
+
+def build_export(path, copies):
+    with open(SOURCE, "r", encoding="utf-8") as f:
+        items = json.load(f)["items"]
+    # resut.json is a locale-keyed management export; prod_new reads the delivery shape
+    for item in items:
+        fields = item.get("fields", {})
+        for name, value in fields.items():
+            if isinstance(value, dict) and "en-US" in value:
+                fields[name] = value["en-US"]
+    count = 0
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('{"sys": {"type": "Array"}, "items": [')
+        for copy in range(copies):
+            for item in items:
+                item["sys"]["id"] = f"bench{count:09d}"
+                item["fields"]["linkUrl"] = f"bench-article-{count:09d}"
+                out.write("," if count else "")
+                json.dump(item, out, ensure_ascii=False)
+                count += 1
+        out.write("]}")
+    return count
+
+
+def run(workers, export_path, output_path, chunk_size):
+    command = [sys.executable, EXTRACT_SCRIPT, "--input", export_path, "--output", output_path,
+               "--state", output_path + ".sqlite", "--workers", str(workers), "--chunk-size", str(chunk_size)]
+    start = time.perf_counter()
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=20, help="Times the 50 sample articles are repeated")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="extract-bench-") as workdir:
+        export_path = os.path.join(workdir, "export.json")
+        entries = build_export(export_path, args.copies)
+        print("=" * 60)
+        print(f"Export: {entries} entries, {os.path.getsize(export_path) / 1e6:.0f} MB, {os.cpu_count()} CPUs")
+
+        outputs = {}
+        for workers in args.workers:
+            outputs[workers] = os.path.join(workdir, f"out_{workers}.csv")
+            elapsed = run(workers, export_path, outputs[workers], args.chunk_size)
+            same = filecmp.cmp(outputs[args.workers[0]], outputs[workers], shallow=False)
+            print(f"workers={workers:<3} {elapsed:8.1f}s  {entries / elapsed:8.0f} entries/s"
+                  f"  {'identical' if same else '❌ DIFFERS'}")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Recursive extract_text_from_block vs the iterative common.rich_text walker.
+
+Walks every detailInfo document of Prod/resut.json, then synthetic documents of
+nested lists (list-item -> unordered-list -> list-item ...) at growing depth,
+with the recursive functions prod_new and prod_content used to carry and with
+the RichTextWalker configured the way those scripts now use it. Outputs must be
+identical wherever the recursive version finishes; past the recursion limit it
+raises (or, in prod_new, swallows the error and loses the text below it).
+
+    python benchmarks/bench_rich_text.py
+    python benchmarks/bench_rich_text.py --depths 100 1000 10000 --repeat 5
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.rich_text import RichTextWalker
+
+DEFAULT_INPUT = os.path.join(ROOT, "Prod/resut.json")
+
+
+# The functions as they were in Prod/prod_new.py and Prod/prod_content.py
+def old_prod_new(block):
+    content_text = []
+    try:
+        if isinstance(block, dict):
+            for key in ['value', 'text', 'content']:
+                if key in block and isinstance(block[key], str):
+                    text = block[key].strip()
+                    if text:
+                        if key == 'value' and text.startswith("Contentful - "):
+                            text = text.replace("Contentful - ", "", 1)
+                        content_text.append(text)
+                        break
+            if 'content' in block:
+                for sub_block in block.get('content', []):
+                    content_text.extend(old_prod_new(sub_block))
+        elif isinstance(block, Iterable) and not isinstance(block, str):
+            for item in block:
+                content_text.extend(old_prod_new(item))
+    except Exception as e:
+        print(f"Block extraction error: {str(e)}")
+    return content_text
+
+
+def old_prod_content(block):
+    content = []
+    if isinstance(block, dict):
+        for text_key in ['value', 'text', 'title', 'description']:
+            if text_key in block and isinstance(block[text_key], str):
+                text = block[text_key].strip()
+                if text:
+                    content.append(text)
+        if block.get('nodeType') == 'hyperlink':
+            link_text = ' '.join(old_prod_content(block.get('content', [])))
+            if link_text:
+                content.append(link_text)
+        for content_key in ['content', 'children']:
+            if content_key in block:
+                content.extend(old_prod_content(block[content_key]))
+    elif isinstance(block, Iterable) and not isinstance(block, str):
+        for item in block:
+            content.extend(old_prod_content(item))
+    return content
+
+
+PROD_NEW = RichTextWalker(text_keys=['value', 'text', 'content'], first_text_only=True, strip_prefix=True,
+                          on_error=lambda block, e: print(f"Block extraction error: {str(e)}"))
+PROD_CONTENT = RichTextWalker(text_keys=['value', 'text', 'title', 'description'],
+                              child_keys=['content', 'children'], child_nodes=True, repeat_hyperlinks=True)
+
+CASES = [("prod_new", old_prod_new, PROD_NEW.extract), ("prod_content", old_prod_content, PROD_CONTENT.extract)]
+
+
+def text_node(value):
+    return {"nodeType": "text", "value": value, "marks": [], "data": {}}
+
+
+def nested_list(depth, words_per_level=3):
+    """A list nested `depth` levels deep; every level has a paragraph with a hyperlink."""
+    node = {"nodeType": "paragraph", "content": [text_node("leaf")]}
+    for level in range(depth):
+        paragraph = {"nodeType": "paragraph", "content": [
+            text_node(" ".join(f"w{level}_{i}" for i in range(words_per_level))),
+            {"nodeType": "hyperlink", "data": {"uri": "https://example.com"}, "content": [text_node(f"link {level}")]},
+        ]}
+        item = {"nodeType": "list-item", "content": [paragraph, node]}
+        node = {"nodeType": "unordered-list", "content": [item]}
+    return {"nodeType": "document", "content": [node]}
+
+
+def load_documents(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    documents = []
+    for item in data.get("items", []):
+        detail = item.get("fields", {}).get("detailInfo")
+        if isinstance(detail, dict):
+            documents.append(detail.get("en-US", detail))
+    return documents
+
+
+def run(fn, documents, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            try:
+                result = [fn(document) for document in documents]
+            except RecursionError:
+                result = RecursionError
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=DEFAULT_INPUT)
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 250, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpora = [(os.path.basename(args.input), load_documents(args.input))]
+    corpora += [(f"depth {depth}", [nested_list(depth)]) for depth in args.depths]
+
+    print("=" * 60)
+    print(f"{'corpus':<14} {'script':<13} {'recursive':>11} {'iterative':>11} {'speedup':>8}")
+    for label, documents in corpora:
+        for name, old, new in CASES:
+            old_time, old_result = run(old, documents, args.repeat)
+            new_time, new_result = run(new, documents, args.repeat)
+            if old_result is RecursionError:
+                old_cell, verdict = "RecursionErr", ""
+            else:
+                old_cell = f"{old_time:10.4f}s"
+                if old_result == new_result:
+                    verdict = f"{old_time / new_time:7.1f}x"
+                elif sum(map(len, old_result)) < sum(map(len, new_result)):
+                    verdict = "text lost"  # The recursive version hit the limit and swallowed the error
+                else:
+                    verdict = "❌ DIFFER"
+            print(f"{label:<14} {name:<13} {old_cell:>11} {new_time:10.4f}s {verdict:>8}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+difflib.ndiff vs the hashed-sentence diff behind QA/caluade.py's Detailed Differences.
+
+Builds articles of growing length by joining the Contentful extract's content,
+makes a "Strapi" copy of each with a share of its sentences edited (a word
+swapped), dropped or replaced by a sentence from another article, in runs of
+consecutive sentences (a rewritten paragraph), and runs
+find_detailed_differences with both engines. Reports the time of each and
+whether the report lines are identical. Long runs are where ndiff's pairwise
+search grows quadratic and where the hashed engine only searches a window.
+
+    python benchmarks/bench_sentence_diff.py
+    python benchmarks/bench_sentence_diff.py --sentences 300 1000 3000 --changed 0.5 --run-lengths 100 300
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "QA"))
+from common.columnar import read_rows
+from caluade import clean_text, find_detailed_differences
+
+DEFAULT_INPUT = os.path.join(ROOT, "Prod/csv/updateextracted_contentful_data.csv")
+
+
+def make_pair(sentences, count, changed, run_length, rng):
+    """An article of `count` sentences and a copy with runs of `run_length` consecutive sentences changed."""
+    original = [sentences[i % len(sentences)] for i in range(count)]
+    copy = []
+    left_in_run = 0
+    for sentence in original:
+        if not left_in_run and rng.random() < changed / run_length:
+            left_in_run = run_length
+        if not left_in_run:
+            copy.append(sentence)
+            continue
+        left_in_run -= 1
+        roll = rng.random()
+        if roll < 0.6:
+            words = sentence.split()
+            words[rng.randrange(len(words))] = "changed"
+            copy.append(" ".join(words))
+        elif roll < 0.8:
+            continue
+        else:
+            copy.append(rng.choice(sentences))  # Text from some other article
+    return ". ".join(original), ". ".join(copy)
+
+
+def timed(engine, text1, text2, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = find_detailed_differences(text1, text2, engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=DEFAULT_INPUT)
+    parser.add_argument("--sentences", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--changed", type=float, default=0.05, help="Share of sentences edited/dropped/replaced")
+    parser.add_argument("--run-lengths", type=int, nargs="+", default=[1, 8, 30],
+                        help="Consecutive sentences changed together (a rewritten paragraph or section)")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sentences = [s for row in read_rows(args.input, ["content"])
+                 for s in clean_text(row["content"]).split(". ") if len(s.split()) > 3]
+
+    print("=" * 60)
+    print(f"{'sentences':>9} {'run':>4} {'ndiff':>10} {'hashed':>10} {'speedup':>8}  report")
+    for count in args.sentences:
+        for run_length in args.run_lengths:
+            text1, text2 = make_pair(sentences, count, args.changed, run_length, rng)
+            old_time, old_report = timed("ndiff", text1, text2, args.repeat)
+            new_time, new_report = timed("hashed", text1, text2, args.repeat)
+            verdict = "identical" if old_report == new_report else "differs"
+            print(f"{count:>9} {run_length:>4} {old_time:9.3f}s {new_time:9.3f}s {old_time / new_time:7.1f}x  {verdict}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
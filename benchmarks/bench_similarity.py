@@ -0,0 +1,80 @@
+"""
+Per-pair vs corpus-level (batch) TF-IDF similarity on the Prod/csv exports.
+
+    python benchmarks/bench_similarity.py
+    python benchmarks/bench_similarity.py --contentful Prod/csv/updateextracted_contentful_data.csv \
+        --strapi Prod/csv/new_Strapi_prod.csv --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Prod"))
+from common.similarity import calculate_field_similarity, precompute_similarities
+from compareV5 import (
+    load_data, CONTENTFUL_FIELDS, STRAPI_FIELDS, FIELD_MAPPINGS,
+    CONTENT_SIMILARITY_THRESHOLD, METADATA_SIMILARITY_THRESHOLD
+)
+
+
+def per_pair(contentful_data, strapi_data, urls):
+    scores = {}
+    for contentful_field, strapi_field in FIELD_MAPPINGS.items():
+        for url in urls:
+            if url not in contentful_data or url not in strapi_data:
+                continue
+            c_value = contentful_data[url].get(contentful_field, 'MISSING')
+            s_value = strapi_data[url].get(strapi_field, 'MISSING')
+            if c_value == 'MISSING' or s_value == 'MISSING':
+                continue
+            scores[(url, contentful_field)] = calculate_field_similarity(c_value, s_value)
+    return scores
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contentful", default=os.path.join(ROOT, "Prod/csv/updateextracted_contentful_data.csv"))
+    parser.add_argument("--strapi", default=os.path.join(ROOT, "Prod/csv/new_Strapi_prod.csv"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    contentful_data = load_data(args.contentful, CONTENTFUL_FIELDS)
+    strapi_data = load_data(args.strapi, STRAPI_FIELDS)
+    urls = sorted(set(contentful_data) | set(strapi_data))
+
+    pair_time, pair_scores = best_of(lambda: per_pair(contentful_data, strapi_data, urls), args.repeat)
+    batch_time, batch_scores = best_of(
+        lambda: precompute_similarities(contentful_data, strapi_data, urls, FIELD_MAPPINGS), args.repeat)
+
+    def verdict(key, score):
+        threshold = CONTENT_SIMILARITY_THRESHOLD if key[1] == 'content' else METADATA_SIMILARITY_THRESHOLD
+        return score >= threshold
+
+    flipped = [key for key in pair_scores if verdict(key, pair_scores[key]) != verdict(key, batch_scores[key])]
+    max_delta = max((abs(pair_scores[key] - batch_scores[key]) for key in pair_scores), default=0.0)
+
+    print("=" * 60)
+    print(f"Pairs scored:            {len(pair_scores)}")
+    print(f"Per-pair TF-IDF:         {pair_time:8.3f}s")
+    print(f"Batch (corpus) TF-IDF:   {batch_time:8.3f}s   ({pair_time / batch_time:.1f}x faster)")
+    print(f"Max score difference:    {max_delta:.4f}")
+    print(f"Verdicts that flip:      {len(flipped)}")
+    for url, field in flipped[:10]:
+        print(f"  - {url} [{field}] pair={pair_scores[(url, field)]:.3f} batch={batch_scores[(url, field)]:.3f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Requests-per-second of the Strapi fetch modes against the local mock server.
+
+Per-link modes report requests/second; bulk (pagination) and batch (`$in`)
+modes report how many requests and how long it took to cover the same links.
+
+    python benchmarks/bench_strapi_fetch.py --articles 500 --latency 0.05 --concurrency 1 4 16 64
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.strapi_client import (
+    fetch_sequential, fetch_concurrent, fetch_collection, fetch_by_values, index_entries
+)
+from benchmarks.mock_strapi import start_server
+
+HEADERS = {"accept": "application/json"}
+
+
+def build_url(base_url, link):
+    return f"{base_url}?filters%5BlinkUrl%5D%5B%24eq%5D={link}&populate%5BdetailInfo%5D%5Bpopulate%5D=%2A"
+
+
+def run(label, fn, count):
+    start = time.perf_counter()
+    results = fn()
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for r in results if r.status == 200)
+    print(f"{label:<28} {count:>6} req  {elapsed:>8.2f}s  {count / elapsed:>9.1f} req/s  ({ok} ok)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server latency per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--rate", type=float, default=0, help="Token-bucket rate, 0 = unlimited")
+    parser.add_argument("--sequential-sample", type=int, default=50,
+                        help="Links to time in sequential mode (no sleep)")
+    args = parser.parse_args()
+
+    server, mock, base_url = start_server(articles=args.articles, latency=args.latency)
+    url_items = [(f"article-{i}", build_url(base_url, f"article-{i}")) for i in range(args.articles)]
+
+    print(f"Mock Strapi: {args.articles} articles, {args.latency * 1000:.0f} ms latency")
+    print("=" * 72)
+
+    sample = url_items[:args.sequential_sample]
+    run("sequential (delay=0)", lambda: list(fetch_sequential(sample, HEADERS, delay=0)), len(sample))
+
+    for concurrency in args.concurrency:
+        run(f"async concurrency={concurrency}",
+            lambda: fetch_concurrent(url_items, HEADERS, concurrency=concurrency, rate=args.rate or None),
+            len(url_items))
+
+    links = [key for key, _ in url_items]
+    for label, fn in [
+        ("bulk pageSize=100", lambda c: fetch_collection(base_url, HEADERS, page_size=100, concurrency=c)),
+        ("batch $in size=50", lambda c: fetch_by_values(base_url, HEADERS, "linkUrl", links, batch_size=50,
+                                                       concurrency=c)),
+    ]:
+        for concurrency in (1, max(args.concurrency)):
+            start = time.perf_counter()
+            entries, request_count = fn(concurrency)
+            index = index_entries(entries)
+            elapsed = time.perf_counter() - start
+            found = sum(1 for link in links if link in index)
+            print(f"{label + f' c={concurrency}':<28} {request_count:>6} req  {elapsed:>8.2f}s  "
+                  f"{len(links) / elapsed:>9.1f} links/s  ({found} found)")
+
+    print("=" * 72)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
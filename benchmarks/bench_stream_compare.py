@@ -0,0 +1,121 @@
+"""
+Peak memory of compareV5 in-memory mode vs --stream (external sort + merge join).
+
+Generates a synthetic Contentful/Strapi export pair (shuffled row order, a few
+entries missing on each side, a few edited, some duplicated rows), runs
+Prod/compareV5.py once per mode in a child process and reports wall time and
+the child's peak RSS. Both reports must be byte-identical.
+
+    python benchmarks/bench_stream_compare.py                       # 1M articles
+    python benchmarks/bench_stream_compare.py --articles 100000 --modes stream
+"""
+import argparse
+import csv
+import filecmp
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPARE_SCRIPT = os.path.join(ROOT, "Prod", "compareV5.py")
+
+CONTENTFUL_HEADER = ['contentfulId', 'title', 'metaTitle', 'metaDescription', 'linkText',
+                     'categoryName', 'timeDuration', 'linkUrl', 'content']
+STRAPI_HEADER = ['contentfulId', 'title', 'metaTitle', 'metaDescription', 'linkText',
+                 'categoryName', 'timeDuration', 'linkUrl', 'strapi_content']
+WORDS = ("steel cement tmt bar construction roofing pipe welding concrete price grade "
+         "strength house project site builder quality load beam column sheet").split()
+CATEGORIES = ["Steel", "Cement", "Construction", "Roofing", "Pipes"]
+
+
+def article(rng, idx, content_words):
+    title = " ".join(rng.choice(WORDS) for _ in range(6)).title()
+    return {
+        'contentfulId': f"cf{idx:08d}",
+        'title': title,
+        'metaTitle': f"{title} | JSW One",
+        'metaDescription': " ".join(rng.choice(WORDS) for _ in range(20)),
+        'linkText': title,
+        'categoryName': rng.choice(CATEGORIES),
+        'timeDuration': f"{rng.randint(2, 9)} minutes",
+        'linkUrl': f"blog-{idx:08d}",
+        'content': " ".join(rng.choice(WORDS) for _ in range(content_words)),
+    }
+
+
+def generate(directory, articles, content_words, seed):
+    rng = random.Random(seed)
+    order = list(range(articles))
+    rng.shuffle(order)
+    contentful_path = os.path.join(directory, "contentful.csv")
+    strapi_path = os.path.join(directory, "strapi.csv")
+    with open(contentful_path, "w", newline="", encoding="utf-8") as cf, \
+            open(strapi_path, "w", newline="", encoding="utf-8") as sf:
+        contentful, strapi = csv.writer(cf), csv.writer(sf)
+        contentful.writerow(CONTENTFUL_HEADER)
+        strapi.writerow(STRAPI_HEADER)
+        for idx in order:
+            entry = article(rng, idx, content_words)
+            roll = rng.random()
+            if roll >= 0.001:  # ~0.1% missing in Contentful
+                contentful.writerow([entry[field] for field in CONTENTFUL_HEADER[:-1]] + [entry['content']])
+            if roll < 0.001 or roll >= 0.002:  # ~0.1% missing in Strapi
+                if 0.002 <= roll < 0.012:  # ~1% edited during migration
+                    entry['metaTitle'] += " updated"
+                    entry['content'] = entry['content'][: len(entry['content']) // 2]
+                row = [entry[field] for field in STRAPI_HEADER[:-1]] + [entry['content']]
+                strapi.writerow(row)
+                if roll > 0.999:  # A few rows exported twice
+                    strapi.writerow(row)
+    return contentful_path, strapi_path
+
+
+def run_mode(mode, contentful_path, strapi_path, output_path):
+    command = [sys.executable, COMPARE_SCRIPT, "--contentful", contentful_path, "--strapi", strapi_path,
+               "--output", output_path, "--state", output_path + ".sqlite"]
+    if mode == "stream":
+        command.append("--stream")
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise SystemExit(f"❌ {mode} run failed with status {status}")
+    peak_mb = usage.ru_maxrss / 1024 if sys.platform != "darwin" else usage.ru_maxrss / (1024 * 1024)
+    return elapsed, peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--content-words", type=int, default=40)
+    parser.add_argument("--modes", nargs="+", choices=["memory", "stream"], default=["memory", "stream"])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workdir", help="Keep the generated files here instead of a temp dir")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="stream-bench-") as temp_dir:
+        workdir = args.workdir or temp_dir
+        os.makedirs(workdir, exist_ok=True)
+        print(f"Generating {args.articles} synthetic articles in {workdir} ...")
+        contentful_path, strapi_path = generate(workdir, args.articles, args.content_words, args.seed)
+        size_mb = (os.path.getsize(contentful_path) + os.path.getsize(strapi_path)) / 1e6
+
+        print("=" * 60)
+        print(f"Input: {size_mb:.0f} MB of CSV")
+        outputs = {}
+        for mode in args.modes:
+            outputs[mode] = os.path.join(workdir, f"report_{mode}.csv")
+            elapsed, peak_mb = run_mode(mode, contentful_path, strapi_path, outputs[mode])
+            print(f"{mode:<8} {elapsed:8.1f}s   peak RSS {peak_mb:8.0f} MB")
+        if len(outputs) == 2:
+            same = filecmp.cmp(outputs["memory"], outputs["stream"], shallow=False)
+            print(f"Reports: {'identical' if same else '❌ DIFFER'}")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Row-wise DataFrame.apply vs common.summary for compareV5's report summary.
+
+Builds compareV5-shaped report frames (a _contentful/_strapi/_similarity/_status
+column group per field) with growing article sizes, then times the old
+`df.apply(lambda row: 'MISMATCH' in row.values, axis=1)` counts (one pass for
+mismatches, one for missing) against summarize_frame, which also produces the
+per-field counts and similarity histograms. Checks that the headline counts
+agree. The apply time grows with the content held in each row; the
+summary's does not.
+
+    python benchmarks/bench_summary.py
+    python benchmarks/bench_summary.py --rows 20000 --content-words 100 1000 3000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from common.summary import summarize_frame
+
+FIELDS = ["categoryName", "content", "metaDescription", "metaTitle", "title"]
+WORDS = "migration content strapi contentful article report field value blog page".split()
+
+
+def report_frame(rows, content_words, rng):
+    """Report rows; most fields match, a few mismatch or are missing."""
+    shared = {size: " ".join(rng.choice(WORDS) for _ in range(size)) for size in (8, content_words)}
+    records = []
+    for i in range(rows):
+        row = {"linkUrl": f"/blog/article-{i}"}
+        for field in FIELDS:
+            text = shared[content_words if field == "content" else 8]
+            roll = rng.random()
+            if roll < 0.02:
+                row.update({f"{field}_contentful": text, f"{field}_strapi": "MISSING",
+                            f"{field}_similarity": "MISSING", f"{field}_status": "MISSING"})
+                continue
+            score = 1.0 if roll > 0.05 else round(rng.random(), 3)
+            row.update({f"{field}_contentful": text, f"{field}_strapi": text, f"{field}_similarity": score,
+                        f"{field}_status": "MATCH" if score >= 0.9 else "MISMATCH"})
+        records.append(row)
+    columns = ["linkUrl"] + [f"{field}_{part}" for field in FIELDS
+                             for part in ("contentful", "strapi", "similarity", "status")]
+    return pd.DataFrame(records, columns=columns)
+
+
+def apply_counts(df):
+    mismatches = len(df[df.apply(lambda row: 'MISMATCH' in row.values, axis=1)])
+    missing = len(df[df.apply(lambda row: 'MISSING' in row.values, axis=1)])
+    return mismatches, missing
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--content-words", type=int, nargs="+", default=[50, 1000, 5000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print("=" * 60)
+    print(f"{args.rows} report rows, {len(FIELDS)} fields")
+    print(f"{'content words':>13} {'apply':>10} {'summary':>10} {'speedup':>8}  counts")
+    for words in args.content_words:
+        df = report_frame(args.rows, words, rng)
+
+        start = time.perf_counter()
+        old = apply_counts(df)
+        apply_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summary = summarize_frame(df, FIELDS)
+        summary_time = time.perf_counter() - start
+
+        verdict = "same" if old == (summary["mismatches"], summary["missing"]) else "differ"
+        print(f"{words:>13} {apply_time:9.3f}s {summary_time:9.3f}s {apply_time / summary_time:7.1f}x  {verdict}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Exact scoring vs threshold-aware scoring (common.similarity.threshold_similarity).
+
+Two scenarios on the Prod/csv exports:
+  * prod     - the real Contentful/Strapi pairs (mostly healthy, few clear rejections)
+  * shifted  - every Contentful entry paired with the next URL's Strapi entry, i.e. a
+               migration where most pairs are clearly wrong and bounds settle them
+
+Both must produce the same verdicts; the benchmark reports how many were settled by a bound.
+
+    python benchmarks/bench_threshold_similarity.py --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Prod"))
+from common.similarity import calculate_field_similarity, threshold_similarity
+from compareV5 import (
+    load_data, CONTENTFUL_FIELDS, STRAPI_FIELDS, FIELD_MAPPINGS,
+    CONTENT_SIMILARITY_THRESHOLD, METADATA_SIMILARITY_THRESHOLD
+)
+
+
+def build_pairs(contentful_data, strapi_data, shift):
+    urls = sorted(set(contentful_data) & set(strapi_data))
+    pairs = []
+    for idx, url in enumerate(urls):
+        strapi_entry = strapi_data[urls[(idx + shift) % len(urls)]]
+        for contentful_field, strapi_field in FIELD_MAPPINGS.items():
+            threshold = CONTENT_SIMILARITY_THRESHOLD if contentful_field == 'content' else METADATA_SIMILARITY_THRESHOLD
+            pairs.append((contentful_data[url][contentful_field], strapi_entry[strapi_field], threshold))
+    return pairs
+
+
+def exact(pairs):
+    return [round(calculate_field_similarity(c_value, s_value), 3) >= threshold for c_value, s_value, threshold in pairs]
+
+
+def bounded(pairs):
+    return [threshold_similarity(c_value, s_value, threshold, digits=3) for c_value, s_value, threshold in pairs]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contentful", default=os.path.join(ROOT, "Prod/csv/updateextracted_contentful_data.csv"))
+    parser.add_argument("--strapi", default=os.path.join(ROOT, "Prod/csv/new_Strapi_prod.csv"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    contentful_data = load_data(args.contentful, CONTENTFUL_FIELDS)
+    strapi_data = load_data(args.strapi, STRAPI_FIELDS)
+
+    print("=" * 72)
+    print(f"{'scenario':<10}{'pairs':>7}{'exact':>11}{'bounded':>11}{'speedup':>9}{'by bound':>10}  verdicts")
+    for name, shift in (("prod", 0), ("shifted", 1)):
+        pairs = build_pairs(contentful_data, strapi_data, shift)
+        exact_time, exact_verdicts = best_of(lambda: exact(pairs), args.repeat)
+        bounded_time, verdicts = best_of(lambda: bounded(pairs), args.repeat)
+        settled = sum(1 for verdict in verdicts if not verdict.exact)
+        same = "identical" if exact_verdicts == [verdict.passed for verdict in verdicts] else "❌ DIFFER"
+        print(f"{name:<10}{len(pairs):>7}{exact_time:>10.3f}s{bounded_time:>10.3f}s"
+              f"{exact_time / bounded_time:>8.1f}x{settled:>10}  {same}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Local mock of the Contentful Sync API for benchmarks.
+
+Serves `/spaces/<space>/environments/<env>/sync` with synthetic entries cloned
+from the articles of Prod/resut.json (fresh ids and linkUrls, fields keyed by
+locale as the Sync API returns them). An initial sync (`initial=true`, with an
+optional `content_type`) pages through every published entry with
+`nextPageUrl`, the last page returns a `nextSyncUrl`, and a `sync_token` from
+it returns only what `update`, `publish` and `delete` changed in between, as
+entries and `DeletedEntry` items. Requests must carry the access token
+(`Authorization: Bearer ...` or `access_token=`), otherwise the answer is 401.
+
+    python benchmarks/mock_contentful.py --port 8766 --entries 5000 --latency 0.05
+"""
+import argparse
+import base64
+import copy
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES = os.path.join(ROOT, "Prod", "resut.json")
+SPACE_ID = "mockspace"
+ENVIRONMENT = "master"
+ACCESS_TOKEN = "mock-delivery-token"
+PAGE_SIZE = 100
+
+
+def encode_token(data):
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_token(token):
+    return json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+
+
+def timestamp(seq):
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(1735689600 + seq))
+
+
+class MockContentful:
+    def __init__(self, entries=1000, latency=0.0, page_size=PAGE_SIZE):
+        with open(TEMPLATES, "r", encoding="utf-8") as f:
+            self.templates = json.load(f)["items"]
+        self.latency = latency
+        self.page_size = page_size
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.log = []  # (seq, entry id) per change, in seq order
+        self.published = {}  # id -> (seq, entry)
+        self.deleted = {}  # id -> (seq, DeletedEntry)
+        self.created = 0
+        self.publish(entries)
+
+    def _record(self, entry_id):
+        self.seq += 1
+        self.log.append((self.seq, entry_id))
+        return self.seq
+
+    def publish(self, count):
+        """Publish `count` new entries; returns their ids."""
+        with self.lock:
+            ids = []
+            for _ in range(count):
+                idx = self.created
+                self.created += 1
+                entry = copy.deepcopy(self.templates[idx % len(self.templates)])
+                entry_id = f"mock{idx:09d}"
+                seq = self._record(entry_id)
+                entry["sys"] = {
+                    "id": entry_id, "type": "Entry", "createdAt": timestamp(seq), "updatedAt": timestamp(seq),
+                    "revision": 1, "contentType": entry["sys"]["contentType"],
+                }
+                entry["fields"]["linkUrl"] = {"en-US": f"mock-article-{idx:09d}"}
+                self.published[entry_id] = (seq, entry)
+                self.deleted.pop(entry_id, None)
+                ids.append(entry_id)
+            return ids
+
+    def update(self, ids):
+        """Republish existing entries with a changed title."""
+        with self.lock:
+            for entry_id in ids:
+                entry = copy.deepcopy(self.published[entry_id][1])
+                seq = self._record(entry_id)
+                entry["sys"]["revision"] += 1
+                entry["sys"]["updatedAt"] = timestamp(seq)
+                entry["fields"]["title"] = {"en-US": f"Revised title {entry_id} r{entry['sys']['revision']}"}
+                self.published[entry_id] = (seq, entry)
+
+    def delete(self, ids):
+        with self.lock:
+            for entry_id in ids:
+                _, entry = self.published.pop(entry_id)
+                seq = self._record(entry_id)
+                self.deleted[entry_id] = (seq, {"sys": {
+                    "id": entry_id, "type": "DeletedEntry", "createdAt": entry["sys"]["createdAt"],
+                    "updatedAt": timestamp(seq), "deletedAt": timestamp(seq), "revision": entry["sys"]["revision"],
+                }})
+
+    def current(self):
+        """The published entries as a client should now hold them: id -> entry."""
+        with self.lock:
+            return {entry_id: entry for entry_id, (_, entry) in self.published.items()}
+
+    def _page(self, cursor, base_url):
+        """Items of the changes (since, upto] from log index cursor["at"] on, plus the next page/sync URL."""
+        since, upto, content_type = cursor["since"], cursor["upto"], cursor.get("content_type")
+        index = max(cursor["at"], since)  # self.log[i] holds seq i + 1
+        items = []
+        while index < upto and len(items) < self.page_size:
+            seq, entry_id = self.log[index]
+            index += 1
+            # Only the latest change of an entry counts; an initial sync leaves deletions out
+            current = self.published.get(entry_id) or (self.deleted.get(entry_id) if since else None)
+            if not current or current[0] != seq:
+                continue
+            entry = current[1]
+            if content_type and entry["sys"].get("contentType", {}).get("sys", {}).get("id") != content_type:
+                continue
+            items.append(entry)
+        if index < upto:
+            key, token = "nextPageUrl", encode_token({**cursor, "at": index})
+        else:
+            key, token = "nextSyncUrl", encode_token({"since": upto, "content_type": content_type})
+        return {"sys": {"type": "Array"}, "items": items, key: f"{base_url}?{urlencode({'sync_token': token})}"}
+
+    def handle(self, path, query, authorization, host):
+        """Return (status, body_dict) for a GET request."""
+        if path != f"/spaces/{SPACE_ID}/environments/{ENVIRONMENT}/sync":
+            return 404, {"sys": {"type": "Error", "id": "NotFound"}}
+        params = {name: values[0] for name, values in parse_qs(query).items()}
+        if authorization != f"Bearer {ACCESS_TOKEN}" and params.get("access_token") != ACCESS_TOKEN:
+            return 401, {"sys": {"type": "Error", "id": "AccessTokenInvalid"}}
+
+        with self.lock:
+            if "sync_token" in params:
+                try:
+                    cursor = decode_token(params["sync_token"])
+                except ValueError:
+                    return 400, {"sys": {"type": "Error", "id": "BadRequest"}, "message": "Invalid sync token"}
+                cursor.setdefault("at", 0)
+                cursor.setdefault("upto", self.seq)
+            elif params.get("initial") == "true":
+                cursor = {"since": 0, "upto": self.seq, "at": 0, "content_type": params.get("content_type")}
+            else:
+                return 400, {"sys": {"type": "Error", "id": "BadRequest"}, "message": "initial or sync_token required"}
+            return 200, self._page(cursor, f"http://{host}{path}")
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so pooled clients can reuse connections
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            with mock.lock:
+                mock.request_count += 1
+            if mock.latency:
+                time.sleep(mock.latency)
+
+            parts = urlsplit(self.path)
+            status, body = mock.handle(parts.path, parts.query, self.headers.get("Authorization"),
+                                       self.headers.get("Host"))
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/vnd.contentful.delivery.v1+json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark output readable
+
+    return Handler
+
+
+def start_server(port=0, entries=1000, latency=0.0, page_size=PAGE_SIZE):
+    """Start the mock in a background thread and return (server, mock, base_url)."""
+    mock = MockContentful(entries=entries, latency=latency, page_size=page_size)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(mock))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, mock, base_url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock Contentful Sync API")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    server, mock, base_url = start_server(args.port, args.entries, args.latency)
+    print(f"🚀 Mock Contentful serving {args.entries} entries at {base_url}"
+          f" (space {SPACE_ID}, token {ACCESS_TOKEN})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
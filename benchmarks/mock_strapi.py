@@ -0,0 +1,245 @@
+"""
+Local mock of the Strapi `jsw-blogs-articless` endpoint for benchmarks.
+
+Serves synthetic articles `article-0` ... `article-{N-1}` and answers the same
+`filters[linkUrl][$eq]=...` / `filters[linkUrl][$in][i]=...` queries the fetch
+scripts send, paginated with `pagination[page]` / `pagination[pageSize]` like
+Strapi (default page size 25, max 100). A fixed per-request latency can be
+added to imitate a real network round trip. Responses carry an ETag and
+honour If-None-Match with a 304, and `fields[i]=name` trims the attributes.
+
+Faults can be injected to exercise the retry / circuit breaker / adaptive
+concurrency logic of common.fetch_policy (each request draws from a seeded
+random generator):
+
+    --error-rate        share of requests answered with HTTP 500
+    --throttle-rate     share answered with 429 and a Retry-After header
+    --drop-rate         share whose connection is closed without a response
+    --slow-rate         share delayed by --slow-latency seconds
+    --max-concurrent    above this many requests in flight, answer 503 + Retry-After
+    --outage START LEN  every request answered 503 between START and START+LEN
+                        seconds after the server started
+
+    python benchmarks/mock_strapi.py --port 8765 --articles 2000 --latency 0.05
+    python benchmarks/mock_strapi.py --error-rate 0.05 --throttle-rate 0.02 --drop-rate 0.01 --outage 10 5
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+API_PATH = "/api/jsw-blogs-articless"
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def make_article(idx):
+    link = f"article-{idx}"
+    return {
+        "id": idx + 1,
+        "attributes": {
+            "title": f"Synthetic article {idx}",
+            "metaTitle": f"Synthetic article {idx} | JSW One MSME",
+            "metaDescription": f"Meta description for synthetic article {idx}.",
+            "categoryName": "Manufacturing",
+            "timeDuration": "5 min read",
+            "createdAt": "2025-01-01T00:00:00.000Z",
+            "updatedAt": "2025-02-01T00:00:00.000Z",
+            "publishedAt": "2025-01-01T00:00:00.000Z",
+            "linkUrl": link,
+            "linkText": "Read more",
+            "isThisAFeaturedArticle": False,
+            "isThisAPrimaryArticle": False,
+            "isMsmeArticle": True,
+            "isSellerArticle": False,
+            "contentfulId": f"cf{idx:08d}",
+            "detailInfo": [
+                {"id": 1, "content": f"<h2>Heading {idx}</h2><p>Paragraph one of article {idx}.</p>"},
+                {"id": 2, "content": "<ul><li>First point</li><li>Second point</li></ul>"},
+            ],
+        },
+    }
+
+
+class Faults:
+    """What the mock gets wrong on purpose (all off by default)."""
+
+    def __init__(self, error_rate=0.0, throttle_rate=0.0, drop_rate=0.0, slow_rate=0.0, slow_latency=2.0,
+                 max_concurrent=0, outage=None, retry_after=1, seed=0):
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.drop_rate = drop_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.max_concurrent = max_concurrent
+        self.outage = outage  # (start, length) in seconds since the server started
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+
+class MockStrapi:
+    def __init__(self, articles=2000, latency=0.0, entries=None, faults=None):
+        if entries is not None:  # Serve given entries (e.g. a synthetic corpus's strapi.json) instead
+            self.articles = {entry["attributes"]["linkUrl"]: entry for entry in entries}
+        else:
+            self.articles = {f"article-{i}": make_article(i) for i in range(articles)}
+        self.latency = latency
+        self.faults = faults or Faults()
+        self.started = time.monotonic()
+        self.request_count = 0
+        self.in_flight = 0
+        self.fault_counts = Counter()
+        self.lock = threading.Lock()
+
+    def draw_fault(self):
+        """None, "drop", "slow" or an error status for the next request (called with the lock held)."""
+        faults = self.faults
+        if faults.outage and faults.outage[0] <= time.monotonic() - self.started < faults.outage[0] + faults.outage[1]:
+            return 503
+        if faults.max_concurrent and self.in_flight > faults.max_concurrent:
+            return 503
+        roll = faults.rng.random()
+        for fault, rate in ((500, faults.error_rate), (429, faults.throttle_rate), ("drop", faults.drop_rate),
+                            ("slow", faults.slow_rate)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def handle(self, path, query):
+        """Return (status, body_dict) for a GET request."""
+        if path != API_PATH:
+            return 404, {"error": "not found"}
+
+        params = parse_qs(query)
+        if "filters[linkUrl][$eq]" in params:
+            links = params["filters[linkUrl][$eq]"][:1]
+        else:
+            links = [values[0] for name, values in params.items() if name.startswith("filters[linkUrl][$in]")]
+
+        if links:
+            matches = [self.articles[link] for link in links if link in self.articles]
+        else:
+            matches = list(self.articles.values())
+
+        page = int(params.get("pagination[page]", ["1"])[0])
+        page_size = min(int(params.get("pagination[pageSize]", [DEFAULT_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        data = matches[(page - 1) * page_size:page * page_size]
+        field_names = [values[0] for name, values in params.items() if name.startswith("fields[")]
+        if field_names:
+            data = [{"id": entry["id"], "attributes": {name: entry["attributes"].get(name) for name in field_names}}
+                    for entry in data]
+        pagination = {
+            "page": page,
+            "pageSize": page_size,
+            "pageCount": math.ceil(len(matches) / page_size),
+            "total": len(matches),
+        }
+        return 200, {"data": data, "meta": {"pagination": pagination}}
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so pooled clients can reuse connections
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            with mock.lock:
+                mock.request_count += 1
+                mock.in_flight += 1
+                fault = mock.draw_fault()
+                if fault is not None:
+                    mock.fault_counts[fault] += 1
+            try:
+                self.respond(fault)
+            finally:
+                with mock.lock:
+                    mock.in_flight -= 1
+
+        def respond(self, fault):
+            if mock.latency:
+                time.sleep(mock.latency)
+            if fault == "slow":
+                time.sleep(mock.faults.slow_latency)
+            elif fault == "drop":
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            elif fault is not None:
+                payload = json.dumps({"error": {"status": fault}}).encode("utf-8")
+                self.send_response(fault)
+                if fault in (429, 503):
+                    self.send_header("Retry-After", str(mock.faults.retry_after))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+
+            parts = urlsplit(self.path)
+            status, body = mock.handle(parts.path, parts.query)
+            payload = json.dumps(body).encode("utf-8")
+            etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark output readable
+
+    return Handler
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # socketserver's default backlog of 5 stalls concurrent clients on SYN retries
+
+
+def start_server(port=0, articles=2000, latency=0.0, entries=None, faults=None):
+    """Start the mock in a background thread and return (server, mock, base_url)."""
+    mock = MockStrapi(articles=articles, latency=latency, entries=entries, faults=faults)
+    server = MockServer(("127.0.0.1", port), make_handler(mock))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}{API_PATH}"
+    return server, mock, base_url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock Strapi server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    parser.add_argument("--max-concurrent", type=int, default=0, help="0 = no limit")
+    parser.add_argument("--outage", type=float, nargs=2, metavar=("START", "LENGTH"))
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429/503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = Faults(args.error_rate, args.throttle_rate, args.drop_rate, args.slow_rate, args.slow_latency,
+                    args.max_concurrent, args.outage, args.retry_after, args.seed)
+    server, mock, base_url = start_server(args.port, args.articles, args.latency, faults=faults)
+    print(f"🚀 Mock Strapi serving {args.articles} articles at {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,238 @@
+"""
+Synthetic Contentful / Strapi exports of any size, for scaling benchmarks.
+
+Writes into an output directory:
+
+    contentful.json   Contentful export ({"items": [...]}, locale-keyed fields) whose
+                      detailInfo rich text has headings, paragraphs with bold text and
+                      hyperlinks, bulleted and numbered lists, and tables
+    strapi.json       The matching Strapi collection ({"data": [...]}); detailInfo is a
+                      list of HTML blocks rendering the same document
+    strapi.csv        strapi.json as Prod/prod_strapi_new.py would have fetched it
+    manifest.json     Parameters and the ground truth: which linkUrls are missing in
+                      Strapi and which field was changed on the mismatching ones
+
+Every entry is generated from its own seed, so a corpus is reproducible and
+entry N is the same whatever the total size. A share `--missing-rate` of the
+entries is left out of Strapi and a share `--mismatch-rate` gets one field
+changed in Strapi (title, metaTitle or metaDescription edited, or a content
+paragraph reworded or dropped). Files are written entry by entry, so memory
+stays flat up to 1M entries (about 13 KB of Contentful JSON per entry, with
+5 KB of article text like the real export).
+
+    python benchmarks/synthetic_corpus.py --entries 10000 --output-dir /tmp/corpus-10k
+    python benchmarks/synthetic_corpus.py --entries 1000000 --output-dir /tmp/corpus-1m --mismatch-rate 0.02
+"""
+import argparse
+import csv
+import html
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Prod"))
+from prod_strapi_new import build_row, fields as STRAPI_CSV_FIELDS
+
+WORDS = ("steel", "cement", "msme", "supply", "chain", "procurement", "quality", "tmt", "bars", "galvanised",
+         "sheets", "credit", "finance", "order", "delivery", "construction", "project", "budget", "market",
+         "price", "industrial", "materials", "welding", "structure", "durable", "strength", "grade", "online",
+         "business", "growth", "export", "policy", "inventory", "logistics", "manufacturing", "plant", "safety",
+         "standards", "certificate", "warehouse", "cost", "buyers", "sellers", "platform", "digital", "invoice")
+CATEGORIES = ("Business", "Manufacturing", "Construction", "Finance", "Steel", "Cement")
+HEADINGS = ("heading-2", "heading-3")
+MISMATCH_FIELDS = ("title", "metaTitle", "metaDescription", "content")
+
+
+def sentence(rng, low=6, high=18):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+
+def text_node(value, bold=False):
+    return {"nodeType": "text", "value": value, "marks": [{"type": "bold"}] if bold else [], "data": {}}
+
+
+def node(node_type, content, data=None):
+    return {"nodeType": node_type, "data": data or {}, "content": content}
+
+
+def paragraph_node(rng, link_rate=0.3):
+    parts = [text_node(" ".join(sentence(rng) for _ in range(rng.randint(1, 4))) + " ")]
+    if rng.random() < link_rate:
+        anchor = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+        parts.append(node("hyperlink", [text_node(anchor)],
+                          {"uri": f"https://www.jswonemsme.com/blogs/{anchor.replace(' ', '-')}"}))
+        parts.append(text_node(" " + sentence(rng)))
+    return node("paragraph", parts)
+
+
+def make_document(rng):
+    """Contentful rich-text document: 4-12 sections of heading + paragraphs, lists or a table."""
+    blocks = []
+    for _ in range(rng.randint(4, 12)):
+        blocks.append(node(rng.choice(HEADINGS), [text_node(sentence(rng, 3, 7).rstrip("."))]))
+        kind = rng.random()
+        if kind < 0.6:
+            blocks.extend(paragraph_node(rng) for _ in range(rng.randint(1, 3)))
+        elif kind < 0.85:
+            items = [node("list-item", [paragraph_node(rng, link_rate=0.1)]) for _ in range(rng.randint(2, 6))]
+            blocks.append(node(rng.choice(("unordered-list", "ordered-list")), items))
+        else:
+            rows = []
+            for row_idx in range(rng.randint(2, 5)):
+                cell_type = "table-header-cell" if row_idx == 0 else "table-cell"
+                cells = [node(cell_type, [node("paragraph", [text_node(sentence(rng, 1, 4))])]) for _ in range(3)]
+                rows.append(node("table-row", cells))
+            blocks.append(node("table", rows))
+    return node("document", blocks)
+
+
+def to_html(item):
+    """HTML of one rich-text node, the way the Strapi migration rendered it."""
+    node_type = item["nodeType"]
+    if node_type == "text":
+        value = html.escape(item["value"])
+        return f"<strong>{value}</strong>" if item["marks"] else value
+    inner = "".join(to_html(child) for child in item["content"])
+    if node_type == "hyperlink":
+        return f'<a href="{html.escape(item["data"]["uri"])}">{inner}</a>'
+    tags = {"paragraph": "p", "heading-2": "h2", "heading-3": "h3", "unordered-list": "ul", "ordered-list": "ol",
+            "list-item": "li", "table-row": "tr", "table-cell": "td", "table-header-cell": "th"}
+    if node_type == "table":
+        return f"<table><tbody>{inner}</tbody></table>"
+    tag = tags.get(node_type)
+    return f"<{tag}>{inner}</{tag}>" if tag else inner
+
+
+def html_blocks(document, rng):
+    """Strapi detailInfo: the document's top-level nodes grouped into a few HTML components."""
+    blocks, current = [], []
+    for item in document["content"]:
+        if current and item["nodeType"] in HEADINGS and rng.random() < 0.5:
+            blocks.append(current)
+            current = []
+        current.append(to_html(item))
+    blocks.append(current)
+    return [{"id": idx, "__component": "blog.rich-text", "content": "".join(parts)}
+            for idx, parts in enumerate(blocks, 1)]
+
+
+def make_pair(idx, seed, mismatch_rate, missing_rate):
+    """(Contentful item, Strapi entry or None, changed field or None) for entry idx."""
+    rng = random.Random(f"{seed}:{idx}")
+    link = f"synthetic-{idx}-{rng.choice(WORDS)}-{rng.choice(WORDS)}"
+    title = sentence(rng, 4, 9).rstrip(".")
+    values = {
+        "title": title,
+        "metaTitle": f"{title} | JSW One MSME",
+        "metaDescription": sentence(rng, 15, 25),
+        "categoryName": rng.choice(CATEGORIES),
+        "timeDuration": f"{rng.randint(2, 12)} minutes",
+        "linkUrl": link,
+        "linkText": title.lower(),
+    }
+    document = make_document(rng)
+    entry_id = f"{idx:022x}"
+    updated_at = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00.000Z"
+    contentful_item = {
+        "sys": {"id": entry_id, "type": "Entry", "createdAt": "2025-01-01T00:00:00.000Z", "updatedAt": updated_at,
+                "contentType": {"sys": {"type": "Link", "linkType": "ContentType", "id": "jswBlogsArticles"}}},
+        "fields": dict({name: {"en-US": value} for name, value in values.items()},
+                       isThisAFeaturedArticle={"en-US": rng.random() < 0.1},
+                       isThisAPrimaryArticle={"en-US": rng.random() < 0.05},
+                       detailInfo={"en-US": document}),
+    }
+
+    roll = rng.random()
+    if roll < missing_rate:
+        return contentful_item, None, None
+    changed = None
+    if roll < missing_rate + mismatch_rate:
+        changed = rng.choice(MISMATCH_FIELDS)
+        if changed == "content":
+            document = json.loads(json.dumps(document))
+            paragraphs = [item for item in document["content"] if item["nodeType"] == "paragraph"]
+            target = rng.choice(paragraphs or document["content"])
+            if rng.random() < 0.5 and len(document["content"]) > 1:
+                document["content"].remove(target)
+            else:
+                target["content"] = [text_node(sentence(rng, 10, 20))]
+        else:
+            values = dict(values, **{changed: sentence(rng, 5, 10).rstrip(".")})
+
+    strapi_entry = {
+        "id": idx + 1,
+        "attributes": dict(values, createdAt="2025-01-01T00:00:00.000Z", updatedAt=updated_at,
+                           publishedAt="2025-01-01T00:00:00.000Z",
+                           isThisAFeaturedArticle=contentful_item["fields"]["isThisAFeaturedArticle"]["en-US"],
+                           isThisAPrimaryArticle=contentful_item["fields"]["isThisAPrimaryArticle"]["en-US"],
+                           isMsmeArticle=True, isSellerArticle=False, contentfulId=entry_id,
+                           detailInfo=html_blocks(document, rng)),
+    }
+    return contentful_item, strapi_entry, changed
+
+
+def write_corpus(output_dir, entries, seed=0, mismatch_rate=0.05, missing_rate=0.01, progress_every=100000):
+    """Write the corpus files into output_dir and return the manifest."""
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.time()
+    truth = {"missing": [], "mismatch": {}}
+    strapi_count = 0
+    with open(os.path.join(output_dir, "contentful.json"), "w", encoding="utf-8") as contentful_file, \
+            open(os.path.join(output_dir, "strapi.json"), "w", encoding="utf-8") as strapi_file, \
+            open(os.path.join(output_dir, "strapi.csv"), "w", newline="", encoding="utf-8") as csv_file:
+        contentful_file.write(json.dumps({"sys": {"type": "Array"}, "total": entries, "skip": 0,
+                                          "limit": entries})[:-1] + ', "items": [')
+        strapi_file.write('{"data": [')
+        writer = csv.writer(csv_file)
+        writer.writerow(STRAPI_CSV_FIELDS)
+
+        for idx in range(entries):
+            contentful_item, strapi_entry, changed = make_pair(idx, seed, mismatch_rate, missing_rate)
+            contentful_file.write(("," if idx else "") + json.dumps(contentful_item, ensure_ascii=False))
+            link = contentful_item["fields"]["linkUrl"]["en-US"]
+            if strapi_entry is None:
+                truth["missing"].append(link)
+            else:
+                strapi_file.write(("," if strapi_count else "") + json.dumps(strapi_entry, ensure_ascii=False))
+                writer.writerow(build_row(link, strapi_entry))
+                strapi_count += 1
+                if changed:
+                    truth["mismatch"][link] = changed
+            if progress_every and (idx + 1) % progress_every == 0:
+                print(f"Generated {idx + 1} entries...")
+
+        contentful_file.write("]}")
+        pagination = {"page": 1, "pageSize": strapi_count, "pageCount": 1, "total": strapi_count}
+        strapi_file.write('], "meta": ' + json.dumps({"pagination": pagination}) + "}")
+
+    manifest = {"entries": entries, "seed": seed, "mismatch_rate": mismatch_rate, "missing_rate": missing_rate,
+                "strapi_entries": strapi_count, "generate_seconds": round(time.time() - start, 3),
+                "bytes": {name: os.path.getsize(os.path.join(output_dir, name))
+                          for name in ("contentful.json", "strapi.json", "strapi.csv")},
+                "truth": truth}
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Contentful and Strapi exports")
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mismatch-rate", type=float, default=0.05, help="Share of entries with one field changed")
+    parser.add_argument("--missing-rate", type=float, default=0.01, help="Share of entries left out of Strapi")
+    args = parser.parse_args()
+
+    manifest = write_corpus(args.output_dir, args.entries, args.seed, args.mismatch_rate, args.missing_rate)
+    print(f"✅ {args.entries} entries ({len(manifest['truth']['mismatch'])} mismatching, "
+          f"{len(manifest['truth']['missing'])} missing in Strapi) written to {args.output_dir} "
+          f"in {manifest['generate_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
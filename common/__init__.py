@@ -0,0 +1 @@
+"""Shared helpers used by the Prod, QA, Legal and FAQ validation scripts."""
@@ -0,0 +1,182 @@
+"""
+Arrow IPC (Feather v2) intermediate files between extraction and comparison.
+
+Extractors write through `open_row_writer`; the output path's extension picks
+the format (`.arrow` / `.feather` for Arrow, anything else for CSV), so CSV stays
+available as an export. Arrow files are written uncompressed, every column as a
+string, in record batches, so they can be read back memory-mapped without a
+copy.
+
+Comparators read through `read_rows` (csv.DictReader-style dicts),
+`iter_lists` (csv.reader-style lists, header first) or `read_frame` (pandas).
+For Arrow files only the requested columns are touched, so a metadata-only
+comparison never decodes the article bodies.
+
+pyarrow is only needed for Arrow paths; CSV keeps working without it.
+"""
+import csv
+import os
+import sys
+
+ARROW_EXTENSIONS = (".arrow", ".feather")
+BATCH_ROWS = 1024
+# Article bodies run past csv's 128 KB default field limit; sys.maxsize overflows the C long on Windows
+CSV_FIELD_SIZE_LIMIT = min(sys.maxsize, 2**31 - 1)
+
+csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+
+
+def is_arrow(path):
+    return os.path.splitext(path)[1].lower() in ARROW_EXTENSIONS
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather  # noqa: F401
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise SystemExit("❌ Arrow files need pyarrow (pip install pyarrow); use a .csv path instead")
+    return pyarrow
+
+
+def _cell(value):
+    return "" if value is None else str(value)  # Same text csv.writer would produce
+
+
+class CsvRowWriter:
+    def __init__(self, path, fields):
+        self.fields = list(fields)
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.fields)
+
+    def writerow(self, row):
+        if isinstance(row, dict):
+            row = [row.get(field, "") for field in self.fields]
+        self.writer.writerow(row)
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArrowRowWriter(CsvRowWriter):
+    def __init__(self, path, fields, batch_rows=BATCH_ROWS):
+        pa = _pyarrow()
+        self.pa = pa
+        self.fields = list(fields)
+        self.schema = pa.schema([(field, pa.string()) for field in self.fields])
+        self.batch_rows = batch_rows
+        self.columns = [[] for _ in self.fields]
+        self.file = pa.OSFile(path, "wb")
+        self.writer = pa.ipc.new_file(self.file, self.schema)
+
+    def writerow(self, row):
+        if isinstance(row, dict):
+            row = [row.get(field, "") for field in self.fields]
+        for column, value in zip(self.columns, row):
+            column.append(_cell(value))
+        if len(self.columns[0]) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if self.columns[0]:
+            arrays = [self.pa.array(column, type=self.pa.string()) for column in self.columns]
+            self.writer.write_batch(self.pa.record_batch(arrays, schema=self.schema))
+            self.columns = [[] for _ in self.fields]
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+        self.file.close()
+
+
+def open_row_writer(path, fields, arrow=None):
+    """
+    Row writer with csv.writer's writerow/writerows (lists or dicts keyed by field).
+
+    The header is written up front. `arrow` defaults to the extension of `path`;
+    pass it explicitly when writing to a temporary name such as "out.arrow.tmp".
+    """
+    if arrow is None:
+        arrow = is_arrow(path)
+    return ArrowRowWriter(path, fields) if arrow else CsvRowWriter(path, fields)
+
+
+def read_table(path, columns=None):
+    """Memory-mapped pyarrow Table of an Arrow file, limited to `columns` that exist in it."""
+    pa = _pyarrow()
+    if columns is not None:
+        with pa.memory_map(path, "r") as source:
+            available = set(pa.ipc.open_file(source).schema.names)
+        columns = [column for column in dict.fromkeys(columns) if column in available]
+    return pa.feather.read_table(path, columns=columns, memory_map=True)
+
+
+def read_rows(path, columns=None):
+    """
+    Yield each row as a dict, like csv.DictReader.
+
+    For Arrow files only `columns` are read (all columns when None); CSV rows
+    always carry every column, so callers should look fields up with .get().
+    """
+    if is_arrow(path):
+        table = read_table(path, columns)
+        for batch in table.to_batches():
+            yield from batch.to_pylist()
+        return
+
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_lists(path):
+    """Yield the header and then every row as a list, like csv.reader."""
+    if is_arrow(path):
+        table = read_table(path)
+        yield list(table.column_names)
+        for batch in table.to_batches():
+            for values in zip(*(column.to_pylist() for column in batch.columns)):
+                yield list(values)
+        return
+
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        yield from csv.reader(f)
+
+
+def read_frame(path, columns=None):
+    """pandas DataFrame of a CSV or Arrow file, optionally limited to `columns`."""
+    import pandas as pd
+
+    if is_arrow(path):
+        # Empty cells become NaN, as pd.read_csv would parse them
+        return read_table(path, columns).to_pandas().replace("", float("nan"))
+    if columns is None:
+        return pd.read_csv(path)
+    wanted = set(columns)
+    return pd.read_csv(path, usecols=lambda column: column in wanted)
+
+
+def export_csv(arrow_path, csv_path):
+    """Write an Arrow file out as CSV, batch by batch."""
+    rows = iter_lists(arrow_path)
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        raise SystemExit("usage: python -m common.columnar <input.arrow> <output.csv>")
+    export_csv(sys.argv[1], sys.argv[2])
+    print(f"✅ Exported {sys.argv[1]} to {sys.argv[2]}")
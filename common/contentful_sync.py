@@ -0,0 +1,213 @@
+"""
+Contentful Sync API ingestion: keep a local export up to date with deltas.
+
+The first run does an initial sync (`initial=true`) and pages through every
+published entry by following `nextPageUrl`. The last page carries a
+`nextSyncUrl` instead; its `sync_token` is saved next to the snapshot. Later
+runs send that token and get back only the entries published since, plus a
+`DeletedEntry` for every entry unpublished or deleted since, and apply them to
+the snapshot.
+
+The snapshot has the shape of the manual exports the extractors read,
+`{"sys": {"type": "Array"}, "items": [...]}`, with fields keyed by locale as
+the Sync API returns them (pass `locale` to keep that locale's values only,
+the Delivery API shape). Applying a delta streams the previous snapshot with
+common.json_stream.iter_parsed_items and copies every untouched entry through
+as its raw text, so only the changed entries are held in memory or re-encoded.
+"""
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit, parse_qs
+
+import requests
+
+from common.json_stream import iter_parsed_items
+
+CDN_URL = "https://cdn.contentful.com"
+
+
+def sync_state_path(snapshot_path):
+    """Sync token and settings kept next to the snapshot they belong to."""
+    return f"{snapshot_path}.sync.json"
+
+
+def token_from_url(url):
+    """The `sync_token` query parameter of a nextPageUrl / nextSyncUrl."""
+    return parse_qs(urlsplit(url).query).get("sync_token", [None])[0]
+
+
+class SyncClient:
+    """Pages through one Sync API request; `next_sync_token` is set once the last page is read."""
+
+    def __init__(self, space_id, access_token, environment="master", base_url=CDN_URL, timeout=30):
+        self.url = f"{base_url.rstrip('/')}/spaces/{space_id}/environments/{environment}/sync"
+        self.headers = {"Authorization": f"Bearer {access_token}", "accept": "application/json"}
+        self.timeout = timeout
+        self.next_sync_token = None
+        self.request_count = 0
+
+    def first_url(self, sync_token=None, content_type=None):
+        if sync_token:
+            params = [("sync_token", sync_token)]  # The token remembers the type/content_type filters
+        else:
+            params = [("initial", "true"), ("type", "Entry")]
+            if content_type:
+                params.append(("content_type", content_type))
+        return f"{self.url}?{urlencode(params)}"
+
+    def iter_items(self, sync_token=None, content_type=None):
+        """Yield every item of an initial (no token) or delta sync, page by page."""
+        self.next_sync_token = None
+        url = self.first_url(sync_token, content_type)
+        with requests.Session() as session:
+            while url:
+                response = session.get(url, headers=self.headers, timeout=self.timeout)
+                self.request_count += 1
+                response.raise_for_status()
+                page = response.json()
+                yield from page.get("items", [])
+                url = page.get("nextPageUrl")
+                if not url:
+                    self.next_sync_token = token_from_url(page.get("nextSyncUrl", ""))
+
+
+def localize(entry, locale):
+    """An entry with each field reduced to its `locale` value, like the Delivery API returns it."""
+    if not locale:
+        return entry
+    fields = {name: values[locale] for name, values in entry.get("fields", {}).items()
+              if isinstance(values, dict) and locale in values}
+    return {**entry, "sys": {**entry.get("sys", {}), "locale": locale}, "fields": fields}
+
+
+def split_delta(items, locale=None):
+    """Reduce sync items to (changed {id: entry}, deleted {id}); a later item for the same id wins."""
+    changed, deleted = {}, set()
+    for item in items:
+        sys_data = item.get("sys", {})
+        entry_id = sys_data.get("id")
+        if sys_data.get("type") == "Entry":
+            changed[entry_id] = localize(item, locale)
+            deleted.discard(entry_id)
+        elif sys_data.get("type") == "DeletedEntry":
+            changed.pop(entry_id, None)
+            deleted.add(entry_id)
+    return changed, deleted
+
+
+class _SnapshotWriter:
+    """Writes `{"sys": ..., "items": [...]}` one entry at a time to a temporary file, then swaps it in."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.count = 0
+
+    def __enter__(self):
+        self.file = open(self.tmp_path, "w", encoding="utf-8")
+        self.file.write('{"sys": {"type": "Array"}, "items": [\n')
+        return self
+
+    def write_raw(self, raw):
+        self.file.write(",\n" if self.count else "")
+        self.file.write(raw)
+        self.count += 1
+
+    def write(self, entry):
+        self.write_raw(json.dumps(entry, ensure_ascii=False))
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.file.write("\n]}\n")
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+
+
+def write_snapshot(path, items, locale=None):
+    """Write the entries of an initial sync as a new snapshot; returns the entry count."""
+    with _SnapshotWriter(path) as writer:
+        for item in items:
+            if item.get("sys", {}).get("type") == "Entry":
+                writer.write(localize(item, locale))
+    return writer.count
+
+
+def apply_delta(path, items, locale=None):
+    """
+    Apply the items of a delta sync to the snapshot at `path`.
+
+    Changed entries replace the old ones in place, new entries are appended
+    and deleted entries dropped. Returns a Counter of added/updated/deleted.
+    """
+    changed, deleted = split_delta(items, locale)
+    stats = Counter()
+    with _SnapshotWriter(path) as writer:
+        with open(path, "r", encoding="utf-8") as old:
+            for entry, raw in iter_parsed_items(old, "items"):
+                entry_id = entry.get("sys", {}).get("id")
+                if entry_id in deleted:
+                    stats["deleted"] += 1
+                elif entry_id in changed:
+                    writer.write(changed.pop(entry_id))
+                    stats["updated"] += 1
+                else:
+                    writer.write_raw(raw)  # Untouched: copied through without re-encoding
+        for entry in changed.values():
+            writer.write(entry)
+            stats["added"] += 1
+    stats["entries"] = writer.count
+    return stats
+
+
+def load_sync_state(snapshot_path):
+    path = sync_state_path(snapshot_path)
+    if not os.path.exists(path) or not os.path.exists(snapshot_path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable sync state {path}: {e}")
+        return {}
+
+
+def save_sync_state(snapshot_path, state):
+    path = sync_state_path(snapshot_path)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def sync_snapshot(client, snapshot_path, content_type=None, locale=None, full=False):
+    """
+    Bring the snapshot up to date: a delta sync from the saved token, or an
+    initial sync when there is none (or `full`, or the saved settings differ).
+
+    Returns a Counter with the mode ("initial"/"delta" = 1), requests and
+    added/updated/deleted/entries counts. The token is saved only after the
+    snapshot has been written, so a failed run simply repeats the same delta.
+    """
+    settings = {"url": client.url, "contentType": content_type, "locale": locale}
+    state = {} if full else load_sync_state(snapshot_path)
+    token = state.get("nextSyncToken") if all(state.get(k) == v for k, v in settings.items()) else None
+
+    if token:
+        stats = apply_delta(snapshot_path, client.iter_items(sync_token=token), locale)
+        stats["delta"] = 1
+    else:
+        stats = Counter(initial=1)
+        stats["entries"] = stats["added"] = write_snapshot(
+            snapshot_path, client.iter_items(content_type=content_type), locale)
+    stats["requests"] = client.request_count
+
+    if not client.next_sync_token:
+        raise ValueError("Sync API response ended without a nextSyncUrl")
+    synced_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    save_sync_state(snapshot_path, {**settings, "nextSyncToken": client.next_sync_token, "syncedAt": synced_at})
+    return stats
+
@@ -0,0 +1,265 @@
+"""
+Capped field diffs kept in a compressed artifact next to a compare report.
+
+The compare scripts used to render a difflib.HtmlDiff table for every
+mismatching field and put the whole table in the report CSV. Now the CSV cell
+only holds a reference, `<artifact name>#<key>`, and the diff itself goes to
+`<report>.diffs.jsonl.gz`, one JSON line per distinct pair of texts:
+
+    {"key": ..., "label": "content", "diff": "--- Contentful\\n+++ Strapi\\n@@ ...", "truncated": ""}
+
+The key is built from the fingerprints of the two texts (common.fingerprint),
+so a script that already fingerprinted its fields can reference a diff
+without touching the texts, and identical pairs share one entry. Diffs are
+unified diffs over lines, with long lines split at sentence ends so a
+one-line article still diffs sentence by sentence. Each is capped at
+`max_lines` lines per side fed to the matcher, `max_seconds` of line
+alignment and `max_bytes` of output. Regions still unaligned at the time cap
+are shown as whole removed/added blocks. A capped diff ends with a note and
+records why in "truncated".
+
+Diffs are generated eagerly, while the compare script runs, rather than on
+demand from the report. The inputs a report was built from are not kept:
+the extract and fetch scripts overwrite their CSVs in place, so a diff
+rendered later from the report's fingerprints could show a different pair
+of texts than the one the verdict was given for, or none at all. Generating
+them during the run keeps the artifact in step with its report; the cost
+stays bounded, since every diff is capped as above and each distinct pair of
+texts is diffed once.
+
+Print a diff from a report cell:
+
+    python -m common.diff_store Prod/csv/newValidation_ProdV2.diffs.jsonl.gz#<key>
+    python -m common.diff_store Prod/csv/newValidation_ProdV2.diffs.jsonl.gz      # list the keys
+"""
+import difflib
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+from common.fingerprint import fingerprint
+
+DIFF_SUFFIX = ".diffs.jsonl.gz"
+MAX_DIFF_BYTES = 64 * 1024
+MAX_DIFF_SECONDS = 2.0
+MAX_DIFF_LINES = 4000  # Per side; bounds the cost of a single alignment step
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def diff_artifact_path(output_path):
+    """Artifact kept next to a report: report.csv -> report.diffs.jsonl.gz"""
+    return os.path.splitext(output_path)[0] + DIFF_SUFFIX
+
+
+def diff_key(print1, print2):
+    """Key of the diff between two texts, from their fingerprints."""
+    return f"{print1[:16]}{print2[:16]}"
+
+
+def diff_reference(artifact_path, key):
+    """What goes in the report cell."""
+    return f"{os.path.basename(artifact_path)}#{key}"
+
+
+def format_references(references):
+    """One "label: reference" line per diffed field, for a report cell holding several diffs."""
+    return "\n".join(f"{label}: {reference}" for label, reference in references.items())
+
+
+def parse_references(cell):
+    """(label, key) pairs of a cell written by format_references."""
+    for line in cell.splitlines():
+        label, _, reference = line.partition(": ")
+        if "#" in reference:
+            yield label, reference.rsplit("#", 1)[1]
+
+
+def diff_lines(text):
+    lines = []
+    for line in text.splitlines():
+        lines.extend(SENTENCE_END.split(line) if len(line) > 200 else (line,))
+    return lines
+
+
+class _DeadlineMatcher(difflib.SequenceMatcher):
+    """SequenceMatcher whose line alignment stops at `deadline`, leaving the remaining regions unaligned."""
+
+    def __init__(self, a, b, deadline):
+        self.deadline = deadline
+        self.timed_out = False
+        super().__init__(None, a, b)
+
+    def get_matching_blocks(self):
+        # difflib's own loop, with a deadline check between alignment steps
+        if self.matching_blocks is not None:
+            return self.matching_blocks
+        la, lb = len(self.a), len(self.b)
+        queue = [(0, la, 0, lb)]
+        matching_blocks = []
+        while queue:
+            if time.perf_counter() > self.deadline:
+                self.timed_out = True
+                break
+            alo, ahi, blo, bhi = queue.pop()
+            i, j, k = match = self.find_longest_match(alo, ahi, blo, bhi)
+            if k:
+                matching_blocks.append(match)
+                if alo < i and blo < j:
+                    queue.append((alo, i, blo, j))
+                if i + k < ahi and j + k < bhi:
+                    queue.append((i + k, ahi, j + k, bhi))
+        matching_blocks.sort()
+
+        # Collapse adjacent blocks, as difflib does
+        i1 = j1 = k1 = 0
+        non_adjacent = []
+        for i2, j2, k2 in matching_blocks:
+            if i1 + k1 == i2 and j1 + k1 == j2:
+                k1 += k2
+            else:
+                if k1:
+                    non_adjacent.append((i1, j1, k1))
+                i1, j1, k1 = i2, j2, k2
+        if k1:
+            non_adjacent.append((i1, j1, k1))
+        non_adjacent.append((la, lb, 0))
+        self.matching_blocks = [difflib.Match._make(block) for block in non_adjacent]
+        return self.matching_blocks
+
+
+def _format_range(start, stop):
+    """Hunk range in unified diff format, as difflib.unified_diff writes it."""
+    length = stop - start
+    if length == 1:
+        return f"{start + 1}"
+    return f"{start + 1 if length else start},{length}"
+
+
+def _unified_lines(matcher, from_desc, to_desc, context):
+    a, b = matcher.a, matcher.b
+    started = False
+    for group in matcher.get_grouped_opcodes(context):
+        if not started:
+            started = True
+            yield f"--- {from_desc}"
+            yield f"+++ {to_desc}"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
+def capped_diff(text1, text2, from_desc="Contentful", to_desc="Strapi", context=3,
+                max_bytes=MAX_DIFF_BYTES, max_seconds=MAX_DIFF_SECONDS, max_lines=MAX_DIFF_LINES):
+    """Unified diff of two texts within max_lines / max_seconds / max_bytes; returns (diff, truncated reason or "")."""
+    deadline = time.perf_counter() + max_seconds
+    lines1, lines2 = diff_lines(text1), diff_lines(text2)
+    reasons = []
+    if len(lines1) > max_lines or len(lines2) > max_lines:
+        lines1, lines2 = lines1[:max_lines], lines2[:max_lines]
+        reasons.append(f"line cap of {max_lines} lines")
+
+    matcher = _DeadlineMatcher(lines1, lines2, deadline)
+    matcher.get_matching_blocks()
+    if matcher.timed_out:
+        reasons.insert(0, f"time cap of {max_seconds:g}s")
+
+    parts = []
+    size = 0
+    for line in _unified_lines(matcher, from_desc, to_desc, context):
+        size += len(line) + 1
+        if size > max_bytes:
+            reasons.insert(0, f"size cap of {max_bytes} bytes")
+            break
+        parts.append(line)
+    for reason in reasons:
+        if reason.startswith("time cap"):
+            parts.append(f"... lines left unaligned at the {reason} are shown as whole blocks")
+        else:
+            parts.append(f"... diff truncated at the {reason}")
+    return "\n".join(parts), ", ".join(reasons)
+
+
+class DiffWriter:
+    """
+    Collects the diffs of one compare run into the gzip artifact at `path`.
+
+    `add` writes a diff the first time its key is seen and returns the
+    reference for the report cell; the artifact is written to a temporary
+    file and moved into place when the `with` block ends.
+    """
+
+    def __init__(self, path, context=3, max_bytes=MAX_DIFF_BYTES, max_seconds=MAX_DIFF_SECONDS,
+                 max_lines=MAX_DIFF_LINES):
+        self.path = path
+        self.context = context
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.max_lines = max_lines
+        self.keys = set()
+        self.truncated = 0
+
+    def __enter__(self):
+        self.file = gzip.open(f"{self.path}.tmp", "wt", encoding="utf-8")
+        return self
+
+    def add(self, text1, text2, label, from_desc="Contentful", to_desc="Strapi", key=None):
+        key = key or diff_key(fingerprint(text1), fingerprint(text2))
+        if key not in self.keys:
+            self.keys.add(key)
+            diff, truncated = capped_diff(text1, text2, from_desc, to_desc, self.context, self.max_bytes,
+                                          self.max_seconds, self.max_lines)
+            self.truncated += bool(truncated)
+            record = {"key": key, "label": label, "diff": diff, "truncated": truncated}
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return diff_reference(self.path, key)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is None:
+            os.replace(f"{self.path}.tmp", self.path)
+        else:
+            os.remove(f"{self.path}.tmp")
+
+
+def iter_diffs(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def load_diff(path, key):
+    """The record for `key` in an artifact, or None."""
+    return next((record for record in iter_diffs(path) if record["key"] == key), None)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python -m common.diff_store <artifact>[#key]")
+        return
+    path, _, key = sys.argv[1].partition("#")
+    if not key:
+        for record in iter_diffs(path):
+            print(f"{record['key']}  {record['label']}{'  (truncated)' if record['truncated'] else ''}")
+        return
+    record = load_diff(path, key)
+    if record is None:
+        print(f"❌ No diff {key} in {path}")
+        return
+    print(record["diff"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+External sort and merge join of exports, for comparisons that must not hold a
+whole export in memory.
+
+`sorted_records` takes the rows of an export (e.g. from common.columnar.read_rows),
+turns each row into a `(key, record)` pair, sorts the pairs in runs of at most
+`max_bytes` of text, spills each run to a temporary JSON-lines file and merges
+the runs back in key order. As with the dict-based
+loaders, when a key appears more than once the last row in the file wins.
+
+`merge_join` walks two such key-ordered streams side by side and yields every
+key once with the record from each side (None where that side has no entry),
+so "missing in Strapi" / "missing in Contentful" fall out of the join.
+"""
+import heapq
+import json
+import os
+import tempfile
+from itertools import groupby
+
+DEFAULT_RUN_BYTES = 64 * 1024 * 1024
+
+
+def _record_size(key, record):
+    return len(key) + sum(len(value) for value in record.values() if isinstance(value, str))
+
+
+def _write_run(run, temp_dir, run_number):
+    path = os.path.join(temp_dir, f"run-{run_number:05d}.jsonl")
+    run.sort(key=lambda item: item[0])  # Stable: equal keys keep file order
+    with open(path, "w", encoding="utf-8") as f:
+        for item in run:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write("\n")
+    return path
+
+
+def _read_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def sorted_records(rows, prepare, max_bytes=DEFAULT_RUN_BYTES, temp_dir=None):
+    """
+    Yield `(key, record)` pairs from an iterable of row dicts in key order, one per key.
+
+    `prepare(row)` maps a row to `(key, record)` (a dict of JSON-serializable
+    values), or None to skip the row.
+    """
+    with tempfile.TemporaryDirectory(prefix="external-sort-", dir=temp_dir) as run_dir:
+        run_paths = []
+        run, run_bytes, seq = [], 0, 0
+        for row in rows:
+            prepared = prepare(row)
+            if prepared is None:
+                continue
+            key, record = prepared
+            run.append((key, seq, record))
+            seq += 1
+            run_bytes += _record_size(key, record)
+            if run_bytes >= max_bytes:
+                run_paths.append(_write_run(run, run_dir, len(run_paths)))
+                run, run_bytes = [], 0
+
+        if run_paths:
+            if run:
+                run_paths.append(_write_run(run, run_dir, len(run_paths)))
+                run = []
+            # Key then original row number, so the last row of a duplicated key comes last
+            stream = heapq.merge(*(_read_run(path) for path in run_paths), key=lambda item: (item[0], item[1]))
+        else:
+            run.sort(key=lambda item: item[0])  # Everything fit in one run: no need to touch disk
+            stream = iter(run)
+
+        for key, items in groupby(stream, key=lambda item: item[0]):
+            last = None
+            for last in items:
+                pass
+            yield key, last[2]
+
+
+def merge_join(left, right):
+    """Full outer join of two key-ordered `(key, record)` streams: yields (key, left_record, right_record)."""
+    left, right = iter(left), iter(right)
+    left_item, right_item = next(left, None), next(right, None)
+    while left_item is not None or right_item is not None:
+        if right_item is None or (left_item is not None and left_item[0] < right_item[0]):
+            yield left_item[0], left_item[1], None
+            left_item = next(left, None)
+        elif left_item is None or right_item[0] < left_item[0]:
+            yield right_item[0], None, right_item[1]
+            right_item = next(right, None)
+        else:
+            yield left_item[0], left_item[1], right_item[1]
+            left_item, right_item = next(left, None), next(right, None)
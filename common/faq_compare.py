@@ -0,0 +1,76 @@
+"""
+FAQ comparison on one join on Slug instead of a df.loc lookup per slug and column.
+
+The FAQ compare scripts used to walk the common slugs and read every compared
+cell with `df.loc[slug][col]`, which is Python work per slug and column and
+breaks as soon as a slug appears twice (`loc` then returns a DataFrame and
+`pd.notna` raises). `compare_on_slug` instead:
+
+    1. reports the slugs that appear more than once on either side and keeps
+       their first row, so the join stays one-to-one
+    2. merges the two exports on Slug once
+    3. normalizes each compared column as a whole (`str(value).strip()`,
+       empty for a missing value) and compares the two sides column by column
+
+The result holds a boolean frame, one row per common slug (in Contentful
+order) and one column per compared field, from which the scripts build their
+report marks and counts.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+FAQ_COLUMNS = ['Title', 'Description', 'Meta Title', 'Meta Description']
+
+FaqComparison = namedtuple("FaqComparison", ["equal", "missing_in_strapi", "missing_in_contentful", "duplicates"])
+
+
+def duplicate_slugs(df, key='Slug'):
+    """Slugs on more than one row of df, with their row counts (in order of first appearance)."""
+    counts = df[key].value_counts(sort=False)
+    return counts[counts > 1]
+
+
+def normalized(values):
+    """Series of cell texts as the scripts compare them: str(value).strip(), "" for missing values."""
+    return values.astype(object).where(values.notna(), "").astype(str).str.strip()
+
+
+def compare_on_slug(df_contentful, df_strapi, columns=FAQ_COLUMNS, key='Slug'):
+    """Compare two FAQ exports (key as a column, not the index) on `columns`."""
+    duplicates = {'Contentful': duplicate_slugs(df_contentful, key), 'Strapi': duplicate_slugs(df_strapi, key)}
+    contentful = df_contentful.drop_duplicates(key)[[key] + columns]
+    strapi = df_strapi.drop_duplicates(key)[[key] + columns]
+
+    contentful_slugs, strapi_slugs = pd.Index(contentful[key]), pd.Index(strapi[key])
+    missing_in_strapi = contentful_slugs.difference(strapi_slugs).tolist()
+    missing_in_contentful = strapi_slugs.difference(contentful_slugs).tolist()
+
+    merged = contentful.merge(strapi, on=key, how='inner', suffixes=('_contentful', '_strapi'),
+                              validate='one_to_one')
+    equal = pd.DataFrame(
+        {col: (normalized(merged[f'{col}_contentful']) == normalized(merged[f'{col}_strapi'])).to_numpy()
+         for col in columns},
+        index=pd.Index(merged[key], name=key))
+    return FaqComparison(equal, missing_in_strapi, missing_in_contentful, duplicates)
+
+
+def marks(equal, match, mismatch):
+    """The report frame: `match` / `mismatch` in place of True / False."""
+    return pd.DataFrame(np.where(equal.to_numpy(), match, mismatch), index=equal.index, columns=equal.columns)
+
+
+def print_duplicates(duplicates):
+    for side, counts in duplicates.items():
+        if len(counts):
+            print(f"\nDuplicate Slugs in {side}: {len(counts)} (first row of each compared)")
+            for slug, count in counts.items():
+                print(f"  - {slug}: {count} rows")
+
+
+def duplicates_frame(duplicates):
+    """One row per duplicated slug and side, for the duplicates report."""
+    return pd.DataFrame([{'Slug': slug, 'Duplicated In': side, 'Rows': count}
+                         for side, counts in duplicates.items() for slug, count in counts.items()],
+                        columns=['Slug', 'Duplicated In', 'Rows'])
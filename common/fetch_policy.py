@@ -0,0 +1,262 @@
+"""
+Retries, circuit breaking and adaptive concurrency for the Strapi fetches.
+
+A `FetchPolicy` is handed to the functions of common.strapi_client and kept
+by the caller for its `stats`:
+
+    RetryPolicy      retries connection errors, timeouts, unreadable bodies and
+                     HTTP 408/429/5xx with exponential backoff and full jitter
+                     (a random wait between 0 and base * 2^attempt, capped);
+                     a Retry-After header on 429/503 is waited out instead
+    CircuitBreaker   after `failure_threshold` failed attempts in a row every
+                     request waits `cooldown` seconds, then one probe request
+                     decides whether to close it again; after `max_trips`
+                     openings without a success in between, Strapi is taken to
+                     be down and the remaining requests fail at once
+    AdaptiveLimiter  concurrency of the async fetches, additive increase /
+                     multiplicative decrease (AIMD): +1 per window of
+                     successful responses, halved on a throttle, an error, or
+                     latency past `latency_factor` x the best latency seen
+    FetchStats       attempts, retries and their reasons, breaker trips,
+                     concurrency range and latency percentiles for the run
+                     summary
+
+The limits that apply to a whole run (breaker, limiter, stats) live on the
+policy, so pass the same policy to every call of one run.
+"""
+import asyncio
+import email.utils
+import math
+import random
+import time
+from collections import Counter
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class CircuitOpenError(Exception):
+    """Raised for requests refused because Strapi kept failing (see CircuitBreaker.max_trips)."""
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RetryPolicy:
+    def __init__(self, max_retries=4, base_delay=0.5, max_delay=30.0, max_retry_after=120.0, rng=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.rng = rng or random.Random()
+
+    def should_retry(self, status, error):
+        return error is not None or status in RETRY_STATUSES
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe -> closed (or open again)."""
+
+    def __init__(self, failure_threshold=5, cooldown=10.0, max_trips=5):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_trips = max_trips
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0  # Openings since the last success
+        self.total_trips = 0
+        self.probing = False
+
+    def wait_time(self):
+        """Seconds before a request may be sent (0 = send now); raises CircuitOpenError once given up."""
+        if self.max_trips and self.trips >= self.max_trips:
+            raise CircuitOpenError(f"circuit breaker opened {self.trips} times without a success, giving up")
+        if self.state == "closed":
+            return 0.0
+        remaining = self.opened_at + self.cooldown - time.monotonic()
+        if remaining > 0:
+            return remaining
+        if self.probing:
+            return min(1.0, self.cooldown / 10)  # Wait for the probe's verdict
+        self.state = "half-open"
+        self.probing = True
+        return 0.0
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = self.trips = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                self.total_trips += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.failures = 0
+            self.probing = False
+
+
+class AdaptiveLimiter:
+    """Async concurrency limit that follows the server's health (AIMD)."""
+
+    def __init__(self, max_limit, min_limit=1, latency_factor=3.0, latency_floor=0.05, fixed=False):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(self.max_limit)
+        self.latency_factor = latency_factor
+        self.latency_floor = latency_floor  # Latencies under this never count as congestion
+        self.fixed = fixed
+        self.in_flight = 0
+        self.best_latency = None
+        self.smoothed = None
+        self.last_decrease = 0.0
+        self.low = self.max_limit
+        self.condition = None
+
+    async def acquire(self):
+        if self.condition is None:
+            self.condition = asyncio.Condition()  # Created inside the running event loop
+        async with self.condition:
+            while self.in_flight >= int(self.limit):
+                await self.condition.wait()
+            self.in_flight += 1
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self, latency):
+        self.smoothed = latency if self.smoothed is None else 0.8 * self.smoothed + 0.2 * latency
+        self.best_latency = self.smoothed if self.best_latency is None else min(self.best_latency, self.smoothed)
+        if self.fixed:
+            return
+        if self.smoothed > max(self.latency_floor, self.latency_factor * self.best_latency):
+            self._decrease()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_failure(self):
+        if not self.fixed:
+            self._decrease()
+
+    def _decrease(self):
+        # At most once per round trip, so the failures of one window of requests count once
+        now = time.monotonic()
+        if now - self.last_decrease < (self.smoothed or 0.0):
+            return
+        self.last_decrease = now
+        self.limit = max(self.min_limit, self.limit / 2)
+        self.low = min(self.low, int(self.limit))
+
+
+class FetchStats:
+    def __init__(self):
+        self.attempts = 0
+        self.retries = 0
+        self.retry_reasons = Counter()
+        self.failed = []  # Keys whose last attempt still failed
+        self.latencies = []
+        self.waited = 0.0
+
+    def record_attempt(self, latency):
+        self.attempts += 1
+        self.latencies.append(latency)
+
+    def give_up(self, key):
+        self.failed.append(key)
+
+    def record_retry(self, reason, delay):
+        self.retries += 1
+        self.retry_reasons[reason] += 1
+        self.waited += delay
+
+    def summary(self, breaker=None, limiter=None):
+        """Lines for the run summary."""
+        latencies = sorted(self.latencies)
+        lines = [f"Requests: {self.attempts} attempts, {self.retries} retries, {len(self.failed)} given up"]
+        if self.retry_reasons:
+            reasons = ", ".join(f"{reason} x{count}" for reason, count in self.retry_reasons.most_common())
+            lines.append(f"Retry reasons: {reasons} ({self.waited:.1f}s of backoff in total)")
+        if latencies:
+            points = ", ".join(f"p{int(q * 100)} {percentile(latencies, q) * 1000:.0f} ms" for q in (0.5, 0.9, 0.99))
+            lines.append(f"Latency: {points}, max {latencies[-1] * 1000:.0f} ms")
+        if breaker is not None and breaker.total_trips:
+            lines.append(f"Circuit breaker opened {breaker.total_trips} times")
+        if limiter is not None and limiter.best_latency is not None:
+            lines.append(f"Concurrency: {limiter.max_limit} max, went down to {limiter.low}, "
+                         f"ended at {int(limiter.limit)}")
+        return lines
+
+
+def reason_of(status, error):
+    return type(error).__name__ if error is not None else f"HTTP {status}"
+
+
+class FetchPolicy:
+    """Everything that applies to one run's requests: retry rules, breaker, concurrency limiter and stats."""
+
+    def __init__(self, retry=None, breaker=None, adaptive=True, min_concurrency=1):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.adaptive = adaptive
+        self.min_concurrency = min_concurrency
+        self.limiter = None
+        self.stats = FetchStats()
+
+    def limiter_for(self, concurrency):
+        """The async limiter for a new event loop, kept across calls with the same `concurrency` ceiling."""
+        if self.limiter is None or self.limiter.max_limit != concurrency:
+            self.limiter = AdaptiveLimiter(concurrency, self.min_concurrency, fixed=not self.adaptive)
+        self.limiter.condition = None  # asyncio primitives belong to one event loop
+        return self.limiter
+
+    def after_attempt(self, key, attempt, status, error, retry_after, latency):
+        """Count one attempt; returns None when its result is final, else the seconds to wait before retrying."""
+        self.stats.record_attempt(latency)
+        if not self.retry.should_retry(status, error):
+            self.breaker.record_success()
+            return None
+        self.breaker.record_failure()
+        if attempt >= self.retry.max_retries:
+            self.stats.give_up(key)
+            return None
+        delay = self.retry.delay(attempt, parse_retry_after(retry_after) if status in THROTTLE_STATUSES else None)
+        self.stats.record_retry(reason_of(status, error), delay)
+        return delay
+
+    def summary(self):
+        return self.stats.summary(self.breaker, self.limiter)
+
+    def print_summary(self):
+        for line in self.summary():
+            print(f"🔁 {line}")
@@ -0,0 +1,38 @@
+"""
+Stable field fingerprints for the compare scripts.
+
+Every normalized field value is hashed once at load time with blake2b (unlike the
+built-in hash(), the result is the same in every process and can be persisted).
+Before scoring a pair the compare loops check `fingerprints_match`: equal
+fingerprints mean equal normalized values, so the pair is recorded as a 1.0
+match without running SequenceMatcher or TF-IDF. Only pairs whose fingerprints
+differ reach the expensive scorers.
+"""
+import hashlib
+
+FINGERPRINTS = "fingerprints"  # Key under which an entry keeps its {field: fingerprint} dict
+
+
+def fingerprint(value):
+    """128-bit blake2b hex digest of a (normalized) field value."""
+    return hashlib.blake2b(str(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def add_fingerprints(entry, fields, normalize=None):
+    """
+    Fingerprint `fields` of a loaded entry and store them on it under FINGERPRINTS.
+
+    Pass `normalize` when the entry holds raw values and the script normalizes at
+    compare time, so the fingerprints cover what actually gets compared.
+    """
+    prepare = normalize or str
+    entry[FINGERPRINTS] = {field: fingerprint(prepare(entry[field])) for field in fields if field in entry}
+    return entry
+
+
+def fingerprints_match(contentful_entry, strapi_entry, contentful_field, strapi_field):
+    """True when both entries carry a fingerprint for the field and they are equal."""
+    if not contentful_entry or not strapi_entry:
+        return False
+    c_print = contentful_entry.get(FINGERPRINTS, {}).get(contentful_field)
+    return c_print is not None and c_print == strapi_entry.get(FINGERPRINTS, {}).get(strapi_field)
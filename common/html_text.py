@@ -0,0 +1,141 @@
+"""
+Streaming HTML-to-text extraction for Strapi rich-text fields.
+
+The Strapi fetch scripts used to build a BeautifulSoup tree for every
+`detailInfo` block only to call get_text(separator=" ") on it. `HTMLTextParser`
+sits directly on the standard library tokenizer (html.parser, the same one
+BeautifulSoup's "html.parser" builder uses) and emits text strings as they are
+completed, without building a tree.
+
+The strings are the ones BeautifulSoup would create:
+
+    - one string per run of text between two tags, comments or declarations,
+      with entities and character references decoded
+    - a run of nothing but ASCII whitespace collapses to "\\n" (if it holds a
+      newline) or " ", except inside <pre> and <textarea>
+    - text inside <script>, <style>, <template>, <rt> and <rp>, comments,
+      doctypes and processing instructions is left out; CDATA sections are kept
+
+so `html_to_text(html, " ")` matches `BeautifulSoup(html, "html.parser")
+.get_text(separator=" ")`. Entities are decoded with html.unescape (HTML5
+rules); BeautifulSoup differs only on malformed input: an unknown "&name;"
+(it drops the semicolon) and an unterminated "</..." at the very end of the
+markup (it leaves entities in that tail undecoded).
+"""
+from html.parser import HTMLParser
+
+SKIPPED_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+VOID_TAGS = frozenset((
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image", "img",
+    "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+))
+ASCII_SPACES = " \n\t\x0c\r"
+
+
+class HTMLTextParser(HTMLParser):
+    """
+    Tokenizer that appends every completed text string to `self.strings`.
+
+    Only the names of the open tags are kept, to know whether text sits inside
+    a skipped or whitespace-preserving element. As in BeautifulSoup, an end tag
+    closes every element opened after its start tag, and an end tag with no
+    open start tag is ignored.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.strings = []
+        self._current = []
+        self._open = []
+        self._open_count = {}
+        self._skip_depth = 0
+        self._preserve_depth = 0
+
+    def _end_string(self, always=False):
+        if not self._current:
+            return
+        text = "".join(self._current) if len(self._current) > 1 else self._current[0]
+        self._current = []
+        if self._skip_depth and not always:
+            return
+        if not self._preserve_depth and not text.strip(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        self.strings.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._end_string()
+        if tag in VOID_TAGS:
+            return
+        self._open.append(tag)
+        self._open_count[tag] = self._open_count.get(tag, 0) + 1
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_string()  # <tag/> opens and closes at once
+
+    def handle_endtag(self, tag):
+        self._end_string()
+        if not self._open_count.get(tag):
+            return
+        while True:
+            name = self._open.pop()
+            self._open_count[name] -= 1
+            if name in SKIPPED_TAGS:
+                self._skip_depth -= 1
+            elif name in PRESERVE_WHITESPACE_TAGS:
+                self._preserve_depth -= 1
+            if name == tag:
+                break
+
+    def handle_data(self, data):
+        self._current.append(data)
+
+    def handle_comment(self, data):
+        self._end_string()
+
+    def handle_decl(self, decl):
+        self._end_string()
+
+    def handle_pi(self, data):
+        self._end_string()
+
+    def unknown_decl(self, data):
+        self._end_string()
+        if data.upper().startswith("CDATA["):
+            self._current.append(data[len("CDATA["):])
+            self._end_string(always=True)  # CDATA is kept even inside skipped elements
+
+    def close(self):
+        super().close()
+        self._end_string()
+
+
+def iter_text(chunks):
+    """
+    Yield the text strings of an HTML document in document order.
+
+    `chunks` is the markup as one string or an iterable of string pieces;
+    strings are yielded as soon as the tag that ends them has been read.
+    """
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    parser = HTMLTextParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.strings:
+            yield from parser.strings
+            parser.strings = []
+    parser.close()
+    yield from parser.strings
+
+
+def html_to_text(raw_html, separator=" "):
+    """Text of an HTML fragment, joined like BeautifulSoup's get_text(separator=separator)."""
+    parser = HTMLTextParser()
+    parser.feed(raw_html)
+    parser.close()
+    return separator.join(parser.strings)
@@ -0,0 +1,152 @@
+"""
+Persistent on-disk cache for Strapi JSON responses.
+
+Layout of a cache directory:
+
+    index.json            url -> {digest, etag, last_modified, updated_at, last_access}
+    blobs/<sha256>.json   response bodies, content-addressed (identical bodies stored once)
+
+Entries can be revalidated two ways:
+  * HTTP conditional requests (If-None-Match / If-Modified-Since) when the server
+    sent an ETag or Last-Modified header; a 304 reuses the cached body.
+  * `mark_fresh(url, updated_at)` when the caller already knows the entry's current
+    `updatedAt` (e.g. from a cheap listing request); matching entries are served
+    without touching the network at all.
+
+The cache is capped at `max_bytes` of blob data and evicts least-recently-used
+entries when it grows past the cap.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+
+
+class ResponseCache:
+    def __init__(self, cache_dir, max_bytes=500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+        self.fresh = set()
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable cache index {self.index_path}: {e}")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, f"{digest}.json")
+
+    def lookup(self, url):
+        """Return the index entry for `url` (or None) without counting a hit."""
+        return self.index.get(url)
+
+    def conditional_headers(self, url):
+        """Headers for a conditional GET of `url`; empty when we have nothing cached."""
+        entry = self.index.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def mark_fresh(self, url, updated_at):
+        """Serve `url` from cache without a request if its stored updatedAt still matches."""
+        entry = self.index.get(url)
+        if entry and updated_at and entry.get("updated_at") == updated_at:
+            self.fresh.add(url)
+
+    def is_fresh(self, url):
+        return url in self.fresh
+
+    def load(self, url, stat="hits"):
+        """Return the cached payload for `url` (None if the blob went missing)."""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        try:
+            with open(self._blob_path(entry["digest"]), "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            del self.index[url]
+            self.fresh.discard(url)
+            return None
+        entry["last_access"] = time.time()
+        self.stats[stat] += 1
+        return payload
+
+    def forget(self, url):
+        """Drop the entry for `url`, validators included (e.g. its body went missing after a 304)."""
+        self.index.pop(url, None)
+        self.fresh.discard(url)
+
+    def store(self, url, body, etag=None, last_modified=None, updated_at=None):
+        """Store a raw response body (bytes) for `url`."""
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            tmp_path = f"{blob_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, blob_path)
+
+        self.index[url] = {
+            "digest": digest,
+            "size": len(body),
+            "etag": etag,
+            "last_modified": last_modified,
+            "updated_at": updated_at,
+            "last_access": time.time(),
+        }
+        self.stats["misses"] += 1
+        self._evict()
+
+    def _evict(self):
+        # Blob sizes are counted once no matter how many URLs share them
+        blob_sizes = {entry["digest"]: entry["size"] for entry in self.index.values()}
+        total = sum(blob_sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        refcount = Counter(entry["digest"] for entry in self.index.values())
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            del self.index[url]
+            self.fresh.discard(url)
+            self.stats["evictions"] += 1
+            refcount[entry["digest"]] -= 1
+            if refcount[entry["digest"]] == 0:
+                total -= entry["size"]
+                try:
+                    os.remove(self._blob_path(entry["digest"]))
+                except OSError:
+                    pass
+
+    def save(self):
+        """Write the index atomically."""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def summary(self):
+        return (f"{self.stats['hits']} hits, {self.stats['revalidated']} revalidated (304), "
+                f"{self.stats['misses']} misses, {self.stats['evictions']} evictions")
+
+
+def updated_at_of(payload):
+    """updatedAt of the first entry in a Strapi response, used as the cache validator."""
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if isinstance(data, list) and data:
+        return data[0].get("attributes", {}).get("updatedAt")
+    return None
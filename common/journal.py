@@ -0,0 +1,162 @@
+"""
+Append-only journal of finished work, so an interrupted run can resume.
+
+A long stage (fetching every article from Strapi, extracting a large
+Contentful export) records each finished key with its output rows as one
+JSON line in `<output>.journal`:
+
+    {"journal": 1, "run": {...}, "started_at": ...}     header: what the run is over
+    [key, rows]                                         one line per finished key
+    ...
+
+Lines are flushed to the OS every `flush_every` seconds, so a killed process
+loses at most that window of work, and fsynced every `sync_every` seconds (and
+on close), which bounds what a power loss or OS crash can take. A line cut
+short by a crash is dropped when the journal is reopened.
+
+A restarted run opens the same journal, skips the keys already in it and
+appends the rest. The output file is written to a temporary file that then
+replaces the output in one rename (assembled from the journal in the output's
+own order when the run resumed); the journal is removed after that. The
+header's `run` (input file signature, options, script sources) must match
+exactly, otherwise the journal belongs to a different run and is started
+over; so must its age, when `max_age` is given.
+"""
+import json
+import os
+import time
+
+from common.stage_cache import source_closure
+
+JOURNAL_VERSION = 1
+
+
+def journal_path(output_path):
+    return f"{output_path}.journal"
+
+
+def file_signature(path):
+    """Cheap identity of a file's content: size and mtime."""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def run_signature(script, inputs, **options):
+    """`run` header for a journal: the input files and the script sources by signature, plus options."""
+    return {
+        "inputs": {os.path.abspath(path): file_signature(path) for path in inputs},
+        "sources": {path: file_signature(path) for path in source_closure(script)},
+        "options": options,
+    }
+
+
+class Journal:
+    def __init__(self, path, run, fresh=False, max_age=None, flush_every=0.1, sync_every=1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.sync_every = sync_every
+        self.offsets = {}  # key -> offset of its line
+        self.started_at = time.time()
+        self.resumed = False
+
+        if not fresh and os.path.exists(path):
+            self._load(run, max_age)
+        if not self.resumed:
+            with open(path, "w", encoding="utf-8") as f:
+                header = {"journal": JOURNAL_VERSION, "run": run, "started_at": self.started_at}
+                f.write(json.dumps(header, sort_keys=True) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self.file = open(path, "ab")
+        self.reader = None
+        self.unflushed = False
+        self.flushed = self.synced = time.monotonic()
+
+    def _load(self, run, max_age):
+        with open(self.path, "rb") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return
+            if header.get("journal") != JOURNAL_VERSION or header.get("run") != json.loads(json.dumps(run)):
+                return
+            if max_age is not None and time.time() - header.get("started_at", 0) > max_age:
+                return
+            good_end = f.tell()
+            for line in iter(f.readline, b""):
+                try:
+                    key, _ = json.loads(line)
+                except ValueError:
+                    break  # Cut short by a crash; everything after it is rewritten
+                if not line.endswith(b"\n"):
+                    break
+                self.offsets[_hashable(key)] = good_end
+                good_end = f.tell()
+        os.truncate(self.path, good_end)
+        self.started_at = header["started_at"]
+        self.resumed = True
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, key):
+        return _hashable(key) in self.offsets
+
+    def keys(self):
+        return self.offsets.keys()
+
+    def record(self, key, rows):
+        """Append a finished key and its rows."""
+        self.offsets[_hashable(key)] = self.file.tell()
+        self.file.write(json.dumps([key, rows], ensure_ascii=False).encode("utf-8") + b"\n")
+        self.unflushed = True
+        now = time.monotonic()
+        if now - self.flushed >= self.flush_every:
+            self.flush()
+            if now - self.synced >= self.sync_every:
+                self.sync()
+
+    def flush(self):
+        if self.unflushed:
+            self.file.flush()
+            self.unflushed = False
+        self.flushed = time.monotonic()
+
+    def sync(self):
+        self.flush()
+        os.fsync(self.file.fileno())
+        self.synced = time.monotonic()
+
+    def rows(self, key, default=None):
+        """Rows recorded for `key` (read back from the journal), or `default`."""
+        offset = self.offsets.get(_hashable(key))
+        if offset is None:
+            return default
+        if self.unflushed:
+            self.flush()
+        if self.reader is None:
+            self.reader = open(self.path, "rb")
+        self.reader.seek(offset)
+        return json.loads(self.reader.readline())[1]
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+        if self.reader is not None:
+            self.reader.close()
+
+    def remove(self):
+        """Close and delete the journal once the output it fed is in place."""
+        self.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _hashable(key):
+    return tuple(key) if isinstance(key, list) else key
@@ -0,0 +1,74 @@
+"""
+Text normalization profiles shared by the compare scripts.
+
+Each profile reproduces one of the normalize functions the scripts used to
+carry their own copy of, but in a single regex pass (the old versions ran a
+second `\\s+` pass that had nothing left to collapse) plus strip/lower:
+
+    content   - every run of non-word characters becomes one space (comparev2.normalize_content)
+    ascii     - every run of non [a-zA-Z0-9] characters becomes one space (compareV3/V4/V5 normalize_text)
+    metadata  - whitespace runs collapse, punctuation is kept (comparev2.normalize_metadata)
+    boolean   - ascii, then "yes"/"no" mapped to "true"/"false" (BOOLEAN_MAPPING scripts)
+
+Short values (titles, categories, durations, "n a") repeat constantly across a
+corpus, so results for values up to MEMO_MAX_LENGTH characters are memoized.
+Long values such as article bodies are normalized directly and not kept alive
+by the cache.
+"""
+import re
+from functools import lru_cache
+
+BOOLEAN_MAPPING = {"yes": "true", "no": "false"}
+MEMO_MAX_LENGTH = 256
+MEMO_SIZE = 65536
+
+_PATTERNS = {
+    "content": re.compile(r"\W+"),
+    "ascii": re.compile(r"[^a-zA-Z0-9]+"),
+    "metadata": re.compile(r"\s+"),
+    "boolean": re.compile(r"[^a-zA-Z0-9]+"),
+}
+PROFILES = tuple(_PATTERNS)
+
+
+def _make_normalizer(profile):
+    sub = _PATTERNS[profile].sub
+    mapping = BOOLEAN_MAPPING if profile == "boolean" else None
+
+    def run(text):
+        text = sub(" ", text).strip().lower()
+        return mapping.get(text, text) if mapping else text
+
+    memoized = lru_cache(maxsize=MEMO_SIZE)(run)
+
+    def normalize(text):
+        if not isinstance(text, str):
+            text = str(text)
+        return memoized(text) if len(text) <= MEMO_MAX_LENGTH else run(text)
+
+    normalize.__name__ = f"normalize_{profile}"
+    normalize.__doc__ = f"Normalize a value with the '{profile}' profile."
+    normalize.cache_info = memoized.cache_info
+    normalize.cache_clear = memoized.cache_clear
+    return normalize
+
+
+normalize_content = _make_normalizer("content")
+normalize_ascii = _make_normalizer("ascii")
+normalize_metadata = _make_normalizer("metadata")
+normalize_boolean = _make_normalizer("boolean")
+
+_NORMALIZERS = {
+    "content": normalize_content,
+    "ascii": normalize_ascii,
+    "metadata": normalize_metadata,
+    "boolean": normalize_boolean,
+}
+
+
+def get_normalizer(profile):
+    """Normalizer function for a profile name (one of PROFILES)."""
+    try:
+        return _NORMALIZERS[profile]
+    except KeyError:
+        raise ValueError(f"Unknown normalization profile {profile!r}; expected one of {', '.join(PROFILES)}")
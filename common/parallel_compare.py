@@ -0,0 +1,65 @@
+"""
+Process-pool driver for the per-URL compare loops.
+
+The compare scripts hand over a module-level function `compare_fn(*item)` and
+a list of items (usually `(url, contentful_entry, strapi_entry, ...)`) already
+sorted by URL. Items are split into chunks, each chunk is scored in a worker
+process, and results come back in the original order, so the output is
+identical to running `compare_fn` over the items serially.
+
+`compare_fn` must live at module level of an importable module (and that
+module must not do work at import time), because worker processes import it
+by name.
+
+`imap_ordered` is the streaming counterpart for inputs too large to hold as a
+list (e.g. items read with ijson from a multi-GB export): items are handed to
+the workers as they are read and results are yielded in input order.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _run_chunk(compare_fn, items):
+    return [compare_fn(*item) for item in items]
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def compare_items(compare_fn, items, workers=1, chunk_size=None):
+    """Apply `compare_fn` to every item, serially (workers <= 1) or in a process pool."""
+    items = list(items)
+    if workers <= 1 or len(items) < 2:
+        return _run_chunk(compare_fn, items)
+
+    # A few chunks per worker keeps the pool busy when some URLs are much slower than others
+    if chunk_size is None:
+        chunk_size = max(1, len(items) // (workers * 4))
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_results in pool.map(_run_chunk, [compare_fn] * len(chunks), chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def imap_ordered(fn, items, workers=1, chunk_size=16, initializer=None, initargs=()):
+    """
+    Yield `fn(item)` for every item of an iterable, in input order.
+
+    With workers > 1 the items are consumed lazily by a process pool; the pool's
+    task pipe blocks once the workers fall behind, so only a few chunks are in
+    flight at a time and the input is never read far ahead. `initializer` runs
+    once in every worker (or once in this process when serial).
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(fn, items)
+        return
+
+    with multiprocessing.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+        yield from pool.imap(fn, items, chunksize=chunk_size)
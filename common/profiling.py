@@ -0,0 +1,196 @@
+"""
+Where a validation run spends its time and memory (the --profile flag).
+
+The extract, fetch and compare scripts share one module-level profiler,
+`PROFILER`, that does nothing until `configure(args)` switches it on. The
+scripts mark their work with:
+
+    with PROFILER.stage("load"):          one phase of the run (load, extract, compare, write ...)
+    with PROFILER.step("similarity:content"):
+                                          repeated work, totalled per name: a field's scoring,
+                                          ijson parsing, HTML cleaning, normalize_text ...
+    with PROFILER.document(link, size):   one article, kept if it is among the --profile-top slowest
+                                          (record_document when the size is only known afterwards)
+    for item in PROFILER.iterate(items, "parse"):
+                                          time spent producing the items (a lazy parser)
+
+and call `PROFILER.report()` at the end, which prints wall time, CPU time and
+peak memory per stage and per step, the slowest documents with their sizes,
+and writes cProfile stats when --profile-cprofile is given.
+
+Peak memory is measured with tracemalloc: the most Python memory allocated
+above what was live when the stage or step started. Tracing every
+allocation slows the run down (often 2x or more), so wall times under
+--profile are only comparable with each other; --profile-no-memory turns
+tracing off. Stages and steps in worker processes (--workers) are not seen.
+"""
+import contextlib
+import cProfile
+import heapq
+import time
+import tracemalloc
+
+MB = 1024 * 1024
+
+
+class _Scope:
+    __slots__ = ("name", "wall", "cpu", "calls", "peak", "start_wall", "start_cpu", "base", "open_peak")
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = self.cpu = 0.0
+        self.calls = 0
+        self.peak = 0
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.top = 10
+        self.cprofile_path = None
+        self.cprofile = None
+        self.stages = {}
+        self.steps = {}
+        self.documents = []  # Min-heap of (seconds, key, size) holding the `top` slowest
+        self.open = []  # Scopes being measured, outermost first
+        self.max_peak = 0  # Traced peak of the whole run (scopes keep resetting tracemalloc's own)
+        self.started = None
+
+    def configure(self, args):
+        """Switch on from the parsed --profile options (see add_profile_arguments)."""
+        if not args.profile:
+            return self
+        self.enabled = True
+        self.memory = not args.profile_no_memory
+        self.top = args.profile_top
+        self.cprofile_path = args.profile_cprofile
+        if self.memory:
+            tracemalloc.start()
+        if self.cprofile_path:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        self.started = (time.perf_counter(), time.process_time())
+        return self
+
+    def _flush_peak(self):
+        # Fold the traced peak since the last reset into every open scope, then reset it, so a nested
+        # scope can measure its own peak without hiding the enclosing one's
+        peak = tracemalloc.get_traced_memory()[1]
+        self.max_peak = max(self.max_peak, peak)
+        for scope in self.open:
+            scope.open_peak = max(scope.open_peak, peak)
+        tracemalloc.reset_peak()
+
+    def _enter(self, scope):
+        if self.memory:
+            self._flush_peak()
+            scope.base = scope.open_peak = tracemalloc.get_traced_memory()[0]
+        self.open.append(scope)
+        scope.start_wall, scope.start_cpu = time.perf_counter(), time.process_time()
+
+    def _exit(self, scope):
+        scope.wall += time.perf_counter() - scope.start_wall
+        scope.cpu += time.process_time() - scope.start_cpu
+        scope.calls += 1
+        if self.memory:
+            self._flush_peak()
+            scope.peak = max(scope.peak, scope.open_peak - scope.base)
+        self.open.remove(scope)
+
+    @contextlib.contextmanager
+    def _measure(self, table, name):
+        scope = table.get(name) or table.setdefault(name, _Scope(name))
+        self._enter(scope)
+        try:
+            yield
+        finally:
+            self._exit(scope)
+
+    def stage(self, name):
+        return self._measure(self.stages, name) if self.enabled else contextlib.nullcontext()
+
+    def step(self, name):
+        return self._measure(self.steps, name) if self.enabled else contextlib.nullcontext()
+
+    def record_document(self, key, size, seconds):
+        """Count one document (article) that took `seconds`; `size` is its length in characters."""
+        if not self.enabled:
+            return
+        record = (seconds, str(key), size)
+        if len(self.documents) < self.top:
+            heapq.heappush(self.documents, record)
+        elif record > self.documents[0]:
+            heapq.heapreplace(self.documents, record)
+
+    @contextlib.contextmanager
+    def _timed_document(self, key, size):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_document(key, size, time.perf_counter() - start)
+
+    def document(self, key, size):
+        """Time one document whose size is known up front."""
+        return self._timed_document(key, size) if self.enabled else contextlib.nullcontext()
+
+    def iterate(self, items, name):
+        """Yield from `items`, counting the time spent producing each one as step `name`."""
+        if not self.enabled:
+            yield from items
+            return
+        iterator = iter(items)
+        while True:
+            with self.step(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def report(self):
+        if not self.enabled:
+            return
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+        if self.memory:
+            self._flush_peak()
+        total_wall = time.perf_counter() - self.started[0]
+        total_cpu = time.process_time() - self.started[1]
+
+        print("\n" + "=" * 60)
+        print("PROFILE".center(60))
+        print("=" * 60)
+        print(f"Total: {total_wall:.2f}s wall, {total_cpu:.2f}s CPU"
+              + (f", {self.max_peak / MB:.1f} MB traced peak" if self.memory else ""))
+        for title, table in (("Stage", self.stages), ("Step", self.steps)):
+            if not table:
+                continue
+            print(f"\n{title:<28} {'calls':>8} {'wall':>9} {'cpu':>9} {'%wall':>6} {'peak MB':>8}")
+            for scope in sorted(table.values(), key=lambda s: -s.wall):
+                peak = f"{scope.peak / MB:8.1f}" if self.memory else f"{'-':>8}"
+                print(f"{scope.name:<28} {scope.calls:>8} {scope.wall:8.2f}s {scope.cpu:8.2f}s "
+                      f"{scope.wall / total_wall * 100 if total_wall else 0:5.1f}% {peak}")
+        if self.documents:
+            print(f"\nSlowest {len(self.documents)} documents:")
+            for seconds, key, size in sorted(self.documents, reverse=True):
+                print(f"  {seconds * 1000:9.1f} ms  {size:>9} chars  {key}")
+        if self.cprofile_path:
+            print(f"\ncProfile stats saved to {self.cprofile_path} (python -m pstats {self.cprofile_path})")
+        print("=" * 60)
+        if self.memory:
+            tracemalloc.stop()
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="Report time and peak memory per stage, per field/step and the slowest documents")
+    parser.add_argument("--profile-top", type=int, default=10, help="Slowest documents to list")
+    parser.add_argument("--profile-cprofile", metavar="PATH", help="Also write cProfile stats to PATH")
+    parser.add_argument("--profile-no-memory", action="store_true",
+                        help="Skip tracemalloc (faster, no peak memory columns)")
+
+
+PROFILER = Profiler()
@@ -0,0 +1,149 @@
+"""
+Iterative text extraction from Contentful rich-text documents.
+
+The extract scripts used to walk `detailInfo` with a recursive
+extract_text_from_block that built a new list at every level and copied it
+into its parent with .extend(), so the text of a node nested N levels deep was
+copied N times, and a deep enough document hit the recursion limit.
+`RichTextWalker` does the same walk with an explicit stack of iterators and
+appends every text straight into one output list.
+
+The scripts don't agree on what counts as text, so the walker is configured
+per script:
+
+    text_keys         keys checked for string text on a dict node
+    first_text_only   stop at the first key with non-empty text (prod_new)
+    keep_empty        keep texts that are empty after strip() (prod_new_content, QA/new)
+    strip_prefix      drop a leading "Contentful - " from `value` texts
+    child_keys        keys whose values are walked after the node's own text
+    child_nodes       walk a child value as a node itself (a dict under `content`
+                      is then walked like any dict) instead of walking its items
+    list_children     only descend into child values that are lists
+    containers        non-dict values whose items are walked (None: any non-str iterable)
+    repeat_hyperlinks emit the joined text of a hyperlink's content before the
+                      content itself, as prod_content always has
+    on_error          called with (node, exception) when a child value can't be iterated
+"""
+from collections.abc import Iterable
+
+CONTENTFUL_PREFIX = "Contentful - "
+
+
+class _Fill:
+    """Stack marker: the hyperlink slot at `slot` takes the text emitted since it."""
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+
+class RichTextWalker:
+    def __init__(self, text_keys=("value",), first_text_only=False, keep_empty=False, strip_prefix=False,
+                 child_keys=("content",), child_nodes=False, list_children=False, containers=None,
+                 repeat_hyperlinks=False, on_error=None):
+        self.text_keys = tuple(text_keys)
+        self.first_text_only = first_text_only
+        self.keep_empty = keep_empty
+        self.strip_prefix = strip_prefix
+        self.child_keys = tuple(child_keys)
+        self.child_nodes = child_nodes
+        self.list_children = list_children
+        self.containers = containers
+        self.repeat_hyperlinks = repeat_hyperlinks
+        self.on_error = on_error
+
+    def _is_container(self, node):
+        if self.containers is None:
+            return isinstance(node, Iterable) and not isinstance(node, str)
+        return isinstance(node, self.containers)
+
+    def _children(self, node, value):
+        """Iterator over a child value, or None when there is nothing to descend into."""
+        if self.child_nodes:
+            return iter((value,))
+        if self.list_children and not isinstance(value, list):
+            return None
+        try:
+            return iter(value)
+        except TypeError as e:
+            if self.on_error is None:
+                raise
+            self.on_error(node, e)
+            return None
+
+    def extract(self, block, out=None):
+        """Append the texts of `block` and everything below it to `out` (a new list by default) and return it."""
+        if out is None:
+            out = []
+        append = out.append
+        start = len(out)
+        dropped = False
+        text_keys, first_only, keep_empty = self.text_keys, self.first_text_only, self.keep_empty
+        strip_prefix, child_keys = self.strip_prefix, self.child_keys
+        children, is_container = self._children, self._is_container
+        hyperlinks = self.repeat_hyperlinks and "content" in child_keys
+        single_child_key = child_keys[0] if len(child_keys) == 1 and not hyperlinks else None
+        walk_lists = self.containers is None or issubclass(list, self.containers)
+
+        stack = [iter((block,))]
+        push, pop = stack.append, stack.pop
+        while stack:
+            # Consume the top iterator until a node has children to descend into; its
+            # iterator stays on the stack and resumes once the children are done
+            for node in stack[-1]:
+                if isinstance(node, dict):
+                    for key in text_keys:
+                        value = node.get(key)
+                        if isinstance(value, str):
+                            text = value.strip()
+                            if strip_prefix and key == "value" and text.startswith(CONTENTFUL_PREFIX):
+                                text = text.replace(CONTENTFUL_PREFIX, "", 1)
+                            if text or keep_empty:
+                                append(text)
+                                if first_only:
+                                    break
+
+                    if single_child_key is not None:
+                        if single_child_key not in node:
+                            continue
+                        value = node[single_child_key]
+                        child_iter = iter(value) if isinstance(value, list) else children(node, value)
+                        if child_iter is not None:
+                            push(child_iter)
+                            break
+                        continue
+
+                    pending = []
+                    for key in child_keys:
+                        if key in node:
+                            value = node[key]
+                            # A list is walked item by item in every mode
+                            child_iter = iter(value) if isinstance(value, list) else children(node, value)
+                            if child_iter is not None:
+                                pending.append(child_iter)
+                            if key == "content" and hyperlinks and node.get("nodeType") == "hyperlink":
+                                append(None)  # Slot for the link text, filled once its content is walked
+                                pending.append(iter((_Fill(len(out) - 1),)))
+                    if pending:
+                        pending.reverse()
+                        stack.extend(pending)
+                        break
+                elif isinstance(node, str):
+                    continue
+                elif walk_lists and isinstance(node, list):
+                    push(iter(node))
+                    break
+                elif isinstance(node, _Fill):
+                    link_text = " ".join(text for text in out[node.slot + 1:] if text is not None)
+                    out[node.slot] = link_text or None
+                    dropped = dropped or not link_text
+                elif is_container(node):
+                    push(iter(node))
+                    break
+            else:
+                pop()
+
+        if dropped:
+            out[start:] = [text for text in out[start:] if text is not None]
+        return out
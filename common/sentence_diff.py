@@ -0,0 +1,207 @@
+"""
+Sentence-level diff with the output of difflib.ndiff, without its quadratic cost.
+
+difflib.ndiff aligns the two sentence lists with SequenceMatcher and then,
+inside every replaced block, scores every removed sentence against every
+added one character by character to find the most similar pairs. On long
+articles that inner search dominates the run time.
+
+`sentence_ndiff(a, b)` yields the same kind of lines ("  ", "- ", "+ " and
+"? " guide lines) from a different plan:
+
+    1. every sentence is mapped to an integer id (equal sentences share one)
+    2. the id arrays are aligned with a patience diff: sentences that occur
+       exactly once on each side are anchors, the longest increasing run of
+       anchors is matched, and the gaps between anchors are solved the same
+       way; a gap without unique sentences falls back to SequenceMatcher on
+       its ids (plain integers, so it stays cheap)
+    3. only inside a replaced block is text compared character by character,
+       the way ndiff does it: the most similar removed/added pair is synced
+       (shown with "? " guide lines) and both sides of it are solved the same
+       way. A block larger than WINDOW x WINDOW sentences is only searched
+       WINDOW sentences ahead from its start, so a rewritten section costs
+       linear rather than quadratic time
+
+For the usual report (a few sentences edited, dropped or added) the lines
+are the ones ndiff produces. They can differ in rewritten sections larger
+than the window, and where the sentence lists repeat a lot and
+SequenceMatcher would have aligned the repeats differently.
+"""
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher, IS_CHARACTER_JUNK
+
+WINDOW = 10  # Blocks up to WINDOW x WINDOW sentences are searched for their most similar pair
+CUTOFF = 0.75  # Pairs less similar than this are not synced (same as difflib.Differ)
+
+
+def _hash_sentences(a, b):
+    ids = {}
+    return [ids.setdefault(s, len(ids)) for s in a], [ids.setdefault(s, len(ids)) for s in b]
+
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi, a_count, b_count):
+    """Longest increasing run of (i, j) pairs of sentences unique on both sides of the region."""
+    b_index = {b[j]: j for j in range(blo, bhi) if b_count[b[j]] == 1}
+    pairs = [(i, b_index[a[i]]) for i in range(alo, ahi) if a_count[a[i]] == 1 and a[i] in b_index]
+
+    # Patience sorting on j: tails[k] is the smallest j ending an increasing run of length k + 1
+    tails, tail_at, previous = [], [], []
+    for idx, (_, j) in enumerate(pairs):
+        k = bisect_left(tails, j)
+        if k == len(tails):
+            tails.append(j)
+            tail_at.append(idx)
+        else:
+            tails[k] = j
+            tail_at[k] = idx
+        previous.append(tail_at[k - 1] if k else -1)
+    run = []
+    idx = tail_at[-1] if tail_at else -1
+    while idx >= 0:
+        run.append(pairs[idx])
+        idx = previous[idx]
+    run.reverse()
+    return run
+
+
+def matching_pairs(a, b):
+    """(i, j) pairs of equal elements of the id arrays a and b, in order (patience diff)."""
+    matches = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        a_count = Counter(a[alo:ahi])
+        b_count = Counter(b[blo:bhi])
+        if a_count.keys().isdisjoint(b_count):
+            continue  # Nothing in common: the whole region is a replaced block
+
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi, a_count, b_count)
+        if anchors:
+            matches.extend(anchors)
+            edges = [(alo - 1, blo - 1)] + anchors + [(ahi, bhi)]
+            for (i1, j1), (i2, j2) in zip(edges, edges[1:]):
+                if i1 + 1 < i2 and j1 + 1 < j2:
+                    stack.append((i1 + 1, i2, j1 + 1, j2))
+        else:
+            matcher = SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            matches.extend((alo + i + k, blo + j + k) for i, j, size in matcher.get_matching_blocks()
+                           for k in range(size))
+    matches.sort()
+    return matches
+
+
+def _keep_original_ws(s, tag_s):
+    return "".join(c if tag_c == " " and c.isspace() else tag_c for c, tag_c in zip(s, tag_s))
+
+
+def _synced_pair(matcher, a_line, b_line):
+    """ndiff's lines for a removed/added pair similar enough to be shown with guide lines."""
+    matcher.set_seqs(a_line, b_line)  # No-op when the matcher just scored this pair
+    atags = btags = ""
+    for tag, ai1, ai2, bj1, bj2 in matcher.get_opcodes():
+        la, lb = ai2 - ai1, bj2 - bj1
+        if tag == "replace":
+            atags += "^" * la
+            btags += "^" * lb
+        elif tag == "delete":
+            atags += "-" * la
+        elif tag == "insert":
+            btags += "+" * lb
+        else:
+            atags += " " * la
+            btags += " " * lb
+    atags = _keep_original_ws(a_line, atags).rstrip()
+    btags = _keep_original_ws(b_line, btags).rstrip()
+    yield "- " + a_line
+    if atags:
+        yield f"? {atags}\n"
+    yield "+ " + b_line
+    if btags:
+        yield f"? {btags}\n"
+
+
+def _plain_replace(a, alo, ahi, b, blo, bhi):
+    # Same order as difflib.Differ: the shorter side's lines first
+    first = [("+ ", b, blo, bhi), ("- ", a, alo, ahi)] if bhi - blo < ahi - alo else \
+        [("- ", a, alo, ahi), ("+ ", b, blo, bhi)]
+    for prefix, x, lo, hi in first:
+        for i in range(lo, hi):
+            yield prefix + x[i]
+
+
+def _best_pair(matcher, a, alo, ahi, b, blo, bhi):
+    """(i, j) of the most similar pair at or above CUTOFF, scored like difflib.Differ, or None."""
+    best_ratio, best = CUTOFF - 0.01, None
+    for j in range(blo, bhi):
+        matcher.set_seq2(b[j])
+        for i in range(alo, ahi):
+            matcher.set_seq1(a[i])
+            if matcher.real_quick_ratio() > best_ratio and matcher.quick_ratio() > best_ratio:
+                ratio = matcher.ratio()
+                if ratio > best_ratio:
+                    best_ratio, best = ratio, (i, j)
+    return best if best_ratio >= CUTOFF else None
+
+
+def _replace(a, alo, ahi, b, blo, bhi):
+    """Lines for a replaced block: the most similar pair synced, the rest solved on either side of it."""
+    matcher = SequenceMatcher(IS_CHARACTER_JUNK)
+    stack = [(alo, ahi, blo, bhi)]  # Regions still to solve, or lists of finished lines, in reverse order
+    while stack:
+        top = stack.pop()
+        if isinstance(top, list):
+            yield from top
+            continue
+        alo, ahi, blo, bhi = top
+        if alo == ahi or blo == bhi:
+            yield from _plain_replace(a, alo, ahi, b, blo, bhi)
+            continue
+
+        if (ahi - alo) * (bhi - blo) <= WINDOW * WINDOW:
+            best = _best_pair(matcher, a, alo, ahi, b, blo, bhi)
+            if best is None:
+                yield from _plain_replace(a, alo, ahi, b, blo, bhi)
+                continue
+        else:
+            # Too big to score every pair: only look for a pair near the start of the block
+            a_end, b_end = min(ahi, alo + WINDOW), min(bhi, blo + WINDOW)
+            best = _best_pair(matcher, a, alo, a_end, b, blo, b_end)
+            if best is None:
+                yield from _plain_replace(a, alo, a_end, b, blo, b_end)
+                stack.append((a_end, ahi, b_end, bhi))
+                continue
+
+        # Left part, then the synced pair, then the right part
+        best_i, best_j = best
+        stack.append((best_i + 1, ahi, best_j + 1, bhi))
+        stack.append(list(_synced_pair(matcher, a[best_i], b[best_j])))
+        stack.append((alo, best_i, blo, best_j))
+
+
+def sentence_ndiff(a, b):
+    """ndiff-style lines for two lists of sentences, aligned on sentence hashes."""
+    a_ids, b_ids = _hash_sentences(a, b)
+    i = j = 0
+    for mi, mj in matching_pairs(a_ids, b_ids) + [(len(a), len(b))]:
+        if i < mi and j < mj:
+            yield from _replace(a, i, mi, b, j, mj)
+        else:
+            for k in range(i, mi):
+                yield "- " + a[k]
+            for k in range(j, mj):
+                yield "+ " + b[k]
+        if mi < len(a):
+            yield "  " + a[mi]
+        i, j = mi + 1, mj + 1
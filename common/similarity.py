@@ -0,0 +1,214 @@
+"""
+Field similarity scoring shared by the compare scripts.
+
+`calculate_field_similarity` is the per-pair scorer the scripts have always used:
+SequenceMatcher for short values, TF-IDF cosine for long ones, with a brand new
+TfidfVectorizer fitted on just the two texts.
+
+`batch_similarity` scores a whole column of pairs at once. Long values are
+vectorized with a single TfidfVectorizer fitted on every Contentful and Strapi
+value of the field, and the paired cosine is taken row by row on the sparse
+matrices. Because IDF is computed over the corpus instead of over two texts the
+scores differ slightly from the per-pair path (shared rare words weigh more,
+common boilerplate less), but identical texts still score 1.0 and disjoint
+texts 0.0.
+
+`threshold_similarity` answers "is the score at least `threshold`?" and only
+computes the exact score when cheap upper bounds cannot settle it:
+  * short texts: SequenceMatcher's real_quick_ratio (length ratio) and quick_ratio
+    (character multiset overlap), both upper bounds of ratio();
+  * long texts: the two-document TF-IDF cosine evaluated directly on token counts,
+    which skips building a TfidfVectorizer for pairs that are clearly different.
+A verdict settled by a bound carries the bound as its score and `exact=False`.
+
+`precompute_similarities` leaves out pairs whose fingerprints already match
+(see common.fingerprint); callers record those as 1.0 without a score. Given
+`score_urls` it still fits on every URL's values but only scores those URLs, so
+an incremental run gets the same scores as a full one.
+"""
+import difflib
+import math
+import re
+from collections import Counter, namedtuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from common.fingerprint import fingerprints_match
+
+SIMILARITY_ENGINES = ("pair", "batch")
+SHORT_TEXT_LENGTH = 50  # Below this (on both sides) SequenceMatcher is used instead of TF-IDF
+TOKEN_PATTERN = re.compile(TfidfVectorizer().token_pattern)  # Taken from the vectorizer so the bound tokenizes alike
+BOUND_SLACK = 1e-9  # Headroom so floating-point noise never lets a bound reject a passing pair
+
+# Outcome of a threshold check; `exact` is False when `score` is only an upper bound
+Verdict = namedtuple("Verdict", ["score", "passed", "exact"])
+
+
+def calculate_field_similarity(text1, text2):
+    if not text1 and not text2:
+        return 1.0
+    if not text1 or not text2:
+        return 0.0
+
+    if len(text1) < SHORT_TEXT_LENGTH and len(text2) < SHORT_TEXT_LENGTH:
+        return difflib.SequenceMatcher(None, text1, text2).ratio()
+
+    vectorizer = TfidfVectorizer()
+    try:
+        tfidf = vectorizer.fit_transform([text1, text2])
+        return cosine_similarity(tfidf[0], tfidf[1])[0][0]
+    except ValueError:
+        return difflib.SequenceMatcher(None, text1, text2).ratio()
+
+
+def _tfidf_cosine_bound(text1, text2):
+    """
+    Upper bound of calculate_field_similarity for long texts, from token counts alone.
+
+    This is the cosine TfidfVectorizer computes with its defaults (lowercasing
+    with str.lower, TOKEN_PATTERN tokens, no accent stripping, raw counts,
+    smoothed IDF, L2 norm), worked out in closed form for two documents, plus
+    BOUND_SLACK for the floating-point difference between the two computations.
+    It only bounds the real score while calculate_field_similarity keeps those
+    defaults; tests/test_similarity_bounds.py checks it on mixed-case,
+    punctuation-heavy and non-ASCII texts.
+    """
+    counts1 = Counter(TOKEN_PATTERN.findall(text1.lower()))
+    counts2 = Counter(TOKEN_PATTERN.findall(text2.lower()))
+    if not counts1 and not counts2:
+        return None  # The vectorizer would fail and fall back to SequenceMatcher
+    if not counts1 or not counts2:
+        return BOUND_SLACK  # One side has no terms at all: cosine is 0
+
+    # Smoothed IDF over two documents: 1 for shared terms, 1 + ln(3/2) for the rest
+    unique_idf = 1.0 + math.log(1.5)
+    dot = sum(count * counts2[token] for token, count in counts1.items() if token in counts2)
+    norm1 = math.sqrt(sum((count if token in counts2 else count * unique_idf) ** 2
+                          for token, count in counts1.items()))
+    norm2 = math.sqrt(sum((count if token in counts1 else count * unique_idf) ** 2
+                          for token, count in counts2.items()))
+    return dot / (norm1 * norm2) + BOUND_SLACK
+
+
+def threshold_similarity(text1, text2, threshold, digits=None):
+    """
+    Verdict for `calculate_field_similarity(text1, text2) >= threshold`, using bounds first.
+
+    Pass `digits` when the caller rounds the score before comparing it to the
+    threshold, so bounds are judged the same way.
+    """
+    def below(bound):
+        return (round(bound, digits) if digits is not None else bound) < threshold
+
+    if text1 == text2:
+        return Verdict(1.0, not below(1.0), True)
+    if not text1 or not text2:
+        return Verdict(0.0, not below(0.0), True)
+
+    if len(text1) < SHORT_TEXT_LENGTH and len(text2) < SHORT_TEXT_LENGTH:
+        matcher = difflib.SequenceMatcher(None, text1, text2)
+        for bound in (matcher.real_quick_ratio(), matcher.quick_ratio()):
+            if below(bound):
+                return Verdict(bound, False, False)
+        score = matcher.ratio()
+        return Verdict(score, not below(score), True)
+
+    bound = _tfidf_cosine_bound(text1, text2)
+    if bound is not None and below(bound):
+        return Verdict(bound, False, False)
+    score = calculate_field_similarity(text1, text2)
+    return Verdict(score, not below(score), True)
+
+
+def batch_similarity(pairs, wanted=None):
+    """
+    Scores for a list of (text1, text2) pairs, same rules as calculate_field_similarity.
+
+    With `wanted` (a set of indices) only those pairs are scored, the rest stay
+    None; the TF-IDF model is still fitted on every pair.
+    """
+    scores = [None] * len(pairs)
+    long_idx = []
+    fit_idx = []
+
+    for idx, (text1, text2) in enumerate(pairs):
+        short = len(text1) < SHORT_TEXT_LENGTH and len(text2) < SHORT_TEXT_LENGTH
+        if text1 and text2 and not short:
+            fit_idx.append(idx)
+        if wanted is not None and idx not in wanted:
+            continue
+        if not text1 and not text2:
+            scores[idx] = 1.0
+        elif not text1 or not text2:
+            scores[idx] = 0.0
+        elif short:
+            scores[idx] = difflib.SequenceMatcher(None, text1, text2).ratio()
+        else:
+            long_idx.append(idx)
+
+    if long_idx:
+        left = [pairs[idx][0] for idx in long_idx]
+        right = [pairs[idx][1] for idx in long_idx]
+        try:
+            # One vocabulary for the whole field; rows come out L2-normalized,
+            # so the paired cosine is just the row-wise dot product.
+            vectorizer = TfidfVectorizer()
+            vectorizer.fit([pairs[idx][0] for idx in fit_idx] + [pairs[idx][1] for idx in fit_idx])
+            left_matrix = vectorizer.transform(left)
+            right_matrix = vectorizer.transform(right)
+            cosines = np.asarray(left_matrix.multiply(right_matrix).sum(axis=1)).ravel()
+            empty = (left_matrix.getnnz(axis=1) == 0) | (right_matrix.getnnz(axis=1) == 0)
+        except ValueError:
+            # No token in the whole column survived the tokenizer
+            cosines = np.zeros(len(long_idx))
+            empty = np.ones(len(long_idx), dtype=bool)
+
+        for pos, idx in enumerate(long_idx):
+            if empty[pos]:
+                # Per-pair path falls back to SequenceMatcher when TF-IDF has nothing to work with
+                scores[idx] = difflib.SequenceMatcher(None, *pairs[idx]).ratio()
+            else:
+                scores[idx] = float(min(cosines[pos], 1.0))
+
+    return scores
+
+
+def precompute_similarities(contentful_data, strapi_data, urls, field_mappings, skip_values=('MISSING',),
+                            score_urls=None):
+    """
+    Batch-score every field present on both sides whose fingerprints differ.
+
+    `contentful_data` / `strapi_data` are the `{url: {field: value}}` dicts the
+    compare scripts load; `field_mappings` maps Contentful field -> Strapi field.
+    The model is fitted on all of `urls`; `score_urls`, when given, limits the
+    scores computed to those URLs. Returns `{(url, contentful_field): score}`.
+    """
+    score_urls = set(score_urls) if score_urls is not None else None
+    scores = {}
+    for contentful_field, strapi_field in field_mappings.items():
+        keys, pairs = [], []
+        for url in urls:
+            if url not in contentful_data or url not in strapi_data:
+                continue
+            c_value = contentful_data[url].get(contentful_field, 'MISSING')
+            s_value = strapi_data[url].get(strapi_field, 'MISSING')
+            if c_value in skip_values or s_value in skip_values:
+                continue
+            if fingerprints_match(contentful_data[url], strapi_data[url], contentful_field, strapi_field):
+                continue  # Identical values: the caller's exact-match fast path covers them
+            keys.append((url, contentful_field))
+            pairs.append((c_value, s_value))
+        wanted = None
+        if score_urls is not None:
+            wanted = {idx for idx, (url, _) in enumerate(keys) if url in score_urls}
+        scores.update((key, score) for key, score in zip(keys, batch_similarity(pairs, wanted))
+                      if score is not None)
+    return scores
+
+
+def add_similarity_argument(parser):
+    """--similarity, the one switch between the engines in every compare script (unknown names are rejected)."""
+    parser.add_argument("--similarity", choices=SIMILARITY_ENGINES, default="pair",
+                        help="pair = new TF-IDF model per pair, batch = one TF-IDF model per field for the corpus")
@@ -0,0 +1,137 @@
+"""
+Stage outputs cached under a hash of everything the stage depends on.
+
+A stage's key is the blake2b digest of:
+
+    - the content of every input file (upstream outputs included)
+    - the source of the script that runs the stage and of every `common`
+      module it imports, followed transitively (thresholds and field mappings
+      are constants in those files, so editing one changes the key)
+    - the stage's config (the command-line options it is run with)
+
+Outputs live in `<cache dir>/<stage>/<key>/` next to a manifest.json. A stage
+whose key already has a directory is skipped and its outputs reused; a run
+writes to `<key>.tmp/` and is moved into place only when it succeeds, so an
+interrupted stage never looks cached. A failed or interrupted run leaves its
+`<key>.tmp/` behind and the next run of the same key starts in it, so a stage
+script that journals its progress next to its output (prod_strapi_new.py)
+resumes instead of starting over.
+
+Hashing a file reads it whole, so digests are remembered in a StateStore
+(stage "file_hashes") next to the cache, keyed by path and checked against
+the file's size and mtime; a file only gets read again when one of those
+changes.
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from common.state_store import StateStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HASH_CHUNK = 1024 * 1024
+MANIFEST = "manifest.json"
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def common_imports(path):
+    """Paths of the `common` modules a script imports directly."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            if node.module == "common":
+                modules.update(f"common.{alias.name}" for alias in node.names)
+            elif node.module.startswith("common."):
+                modules.add(node.module)
+        elif isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names if alias.name.startswith("common."))
+    paths = [os.path.join(ROOT, *module.split(".")) + ".py" for module in sorted(modules)]
+    return [p for p in paths if os.path.exists(p)]
+
+
+def source_closure(script):
+    """The script, common/__init__.py and every common module reachable from the script's imports."""
+    seen = {os.path.abspath(script): None, os.path.join(ROOT, "common", "__init__.py"): None}
+    pending = [os.path.abspath(script)]
+    while pending:
+        for path in common_imports(pending.pop()):
+            if path not in seen:
+                seen[path] = None
+                pending.append(path)
+    return sorted(seen)
+
+
+class StageCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hashes = StateStore(os.path.join(cache_dir, "file_hashes.sqlite"))
+        self.known = self.hashes.snapshot("file_hashes")
+        self.changed = {}
+
+    def file_hash(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        known = self.known.get(path)
+        if known and known[0] == signature:
+            return known[1]
+        digest = _file_digest(path)
+        self.known[path] = self.changed[path] = (signature, digest)
+        return digest
+
+    def stage_key(self, stage, script, inputs, config):
+        """Key of a stage run: `inputs` is {role: path}, `config` any JSON-serializable dict."""
+        description = {
+            "stage": stage,
+            "inputs": {role: self.file_hash(path) for role, path in sorted(inputs.items())},
+            "sources": {os.path.relpath(path, ROOT): self.file_hash(path) for path in source_closure(script)},
+            "config": config,
+        }
+        blob = json.dumps(description, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(blob, digest_size=16).hexdigest(), description
+
+    def stage_dir(self, stage, key):
+        return os.path.join(self.cache_dir, stage, key)
+
+    def lookup(self, stage, key):
+        """Output directory of a cached run, or None."""
+        directory = self.stage_dir(stage, key)
+        return directory if os.path.exists(os.path.join(directory, MANIFEST)) else None
+
+    def partial(self, stage, key):
+        """Whether a failed or interrupted run of this key left its work directory behind."""
+        return os.path.isdir(f"{self.stage_dir(stage, key)}.tmp")
+
+    def run(self, stage, key, description, produce):
+        """Call produce(work_dir) to write the stage's outputs, then publish them under the key."""
+        directory = self.stage_dir(stage, key)
+        work_dir = f"{directory}.tmp"
+        os.makedirs(work_dir, exist_ok=True)  # Kept from a failed run of the same key: produce resumes in it
+        start = time.time()
+        produce(work_dir)
+        manifest = dict(description, key=key, seconds=round(time.time() - start, 3),
+                        finished_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        with open(os.path.join(work_dir, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        shutil.rmtree(directory, ignore_errors=True)  # A forced rerun replaces the previous entry
+        os.replace(work_dir, directory)
+        return directory
+
+    def close(self):
+        if self.changed:
+            entries = dict(self.hashes.snapshot("file_hashes"), **self.changed)
+            self.hashes.replace_stage("file_hashes", entries)
+        self.hashes.close()
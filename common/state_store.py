@@ -0,0 +1,55 @@
+"""
+State store for incremental validation runs.
+
+Records, per stage ("extract", "fetch", "compare") and per linkUrl, the source
+timestamp and a content hash from the last successful run. A stage compares
+the current timestamps/hashes against these to decide which entries actually
+need to be re-extracted, re-fetched or re-compared.
+"""
+import hashlib
+import os
+import sqlite3
+
+
+def row_hash(values):
+    """Stable hash of a sequence of values (unlike hash(), identical across processes)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        digest.update(str(value).encode("utf-8"))
+        digest.update(b"\x1f")  # Field separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+class StateStore:
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " stage TEXT NOT NULL, key TEXT NOT NULL, updated_at TEXT, content_hash TEXT,"
+            " PRIMARY KEY (stage, key))"
+        )
+        self.conn.commit()
+
+    def snapshot(self, stage):
+        """All recorded entries of a stage: key -> (updated_at, content_hash)."""
+        cursor = self.conn.execute("SELECT key, updated_at, content_hash FROM entries WHERE stage = ?", (stage,))
+        return {key: (updated_at, content_hash) for key, updated_at, content_hash in cursor}
+
+    def replace_stage(self, stage, entries):
+        """Replace a stage's state with `entries` ({key: (updated_at, content_hash)}) in one transaction."""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE stage = ?", (stage,))
+            self.conn.executemany(
+                "INSERT INTO entries (stage, key, updated_at, content_hash) VALUES (?, ?, ?, ?)",
+                ((stage, key, updated_at, content_hash) for key, (updated_at, content_hash) in entries.items())
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def default_state_path(output_path):
+    """State file kept next to a stage's output file."""
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), "validation_state.sqlite")
@@ -0,0 +1,321 @@
+import asyncio
+import json
+import time
+from collections import defaultdict, namedtuple
+from urllib.parse import urlencode
+
+import requests
+
+from common.fetch_policy import CircuitOpenError, FetchPolicy, THROTTLE_STATUSES
+from common.http_cache import updated_at_of
+
+# One fetched URL: `key` is whatever the caller uses to identify it (usually the linkUrl)
+FetchResult = namedtuple("FetchResult", ["key", "url", "status", "payload", "error"])
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _cached_result(cache, key, url):
+    """FetchResult served straight from cache (entry known to be unchanged), or None."""
+    if cache is not None and cache.is_fresh(url):
+        payload = cache.load(url)
+        if payload is not None:
+            return FetchResult(key, url, 200, payload, None)
+    return None
+
+
+def _request_headers(headers, cache, url):
+    if cache is None:
+        return headers
+    return {**headers, **cache.conditional_headers(url)}
+
+
+def _handle_response(cache, key, url, status, body, response_headers):
+    """Turn a raw response into a FetchResult, consulting/updating the cache."""
+    if status == 304 and cache is not None:
+        payload = cache.load(url, stat="revalidated")
+        if payload is not None:
+            return FetchResult(key, url, 200, payload, None)
+    if status != 200:
+        return FetchResult(key, url, status, None, None)
+
+    payload = json.loads(body)
+    if cache is not None:
+        cache.store(url, body, etag=response_headers.get("ETag"),
+                    last_modified=response_headers.get("Last-Modified"),
+                    updated_at=updated_at_of(payload))
+    return FetchResult(key, url, 200, payload, None)
+
+
+def _lost_body(cache, url, result):
+    """
+    True for a 304 whose cached body is gone (evicted or deleted): the entry and its
+    validators are dropped, so repeating the request makes it unconditional.
+    """
+    if result.status == 304 and cache is not None:
+        cache.forget(url)
+        return True
+    return False
+
+
+def _get_with_retries(session, key, url, headers, timeout, cache, policy):
+    """GET one URL, retrying transient failures as `policy` says; returns the final FetchResult."""
+    attempt = 0
+    refetched = False
+    while True:
+        try:
+            wait = policy.breaker.wait_time()
+        except CircuitOpenError as e:
+            policy.stats.give_up(key)
+            return FetchResult(key, url, None, None, e)
+        if wait:
+            time.sleep(wait)
+            continue
+
+        start = time.perf_counter()
+        retry_after = None
+        try:
+            response = session.get(url, headers=_request_headers(headers, cache, url), timeout=timeout)
+            retry_after = response.headers.get("Retry-After")
+            result = _handle_response(cache, key, url, response.status_code, response.content, response.headers)
+        except (requests.RequestException, ValueError) as e:
+            result = FetchResult(key, url, None, None, e)
+
+        latency = time.perf_counter() - start
+        if not refetched and _lost_body(cache, url, result):
+            policy.stats.record_attempt(latency)
+            refetched = True
+            continue
+        delay = policy.after_attempt(key, attempt, result.status, result.error, retry_after, latency)
+        if delay is None:
+            return result
+        time.sleep(delay)
+        attempt += 1
+
+
+# Sequential fetch (original behaviour: one request at a time with a fixed pause)
+def fetch_sequential(url_items, headers, timeout=10, delay=1.0, cache=None, policy=None):
+    """
+    Yield a FetchResult for every (key, url) pair, in order.
+
+    Transient failures are retried per `policy` (common.fetch_policy.FetchPolicy,
+    a default one when omitted); the result is the last attempt's.
+    """
+    policy = policy or FetchPolicy()
+    with requests.Session() as session:
+        for key, url in url_items:
+            cached = _cached_result(cache, key, url)
+            if cached is not None:
+                yield cached
+                continue
+
+            yield _get_with_retries(session, key, url, headers, timeout, cache, policy)
+
+            if delay:
+                time.sleep(delay)
+
+
+async def _fetch_one(session, limiter, bucket, key, url, timeout, cache, policy):
+    import aiohttp
+
+    cached = _cached_result(cache, key, url)
+    if cached is not None:
+        return cached
+
+    attempt = 0
+    refetched = False
+    while True:
+        # A slot is held for the request only, not while backing off; the breaker is consulted once a slot
+        # is free, so queued requests wait out an open breaker too
+        await limiter.acquire()
+        try:
+            wait = policy.breaker.wait_time()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = policy.breaker.wait_time()
+            if bucket is not None:
+                await bucket.acquire()
+            start = time.perf_counter()
+            retry_after = None
+            try:
+                async with session.get(url, headers=_request_headers({}, cache, url),
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    body = await response.read()  # Always drain so the connection goes back to the pool
+                    retry_after = response.headers.get("Retry-After")
+                    result = _handle_response(cache, key, url, response.status, body, response.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                result = FetchResult(key, url, None, None, e)
+            latency = time.perf_counter() - start
+        except CircuitOpenError as e:
+            policy.stats.give_up(key)
+            return FetchResult(key, url, None, None, e)
+        finally:
+            await limiter.release()
+
+        if not refetched and _lost_body(cache, url, result):
+            policy.stats.record_attempt(latency)
+            refetched = True
+            continue
+        delay = policy.after_attempt(key, attempt, result.status, result.error, retry_after, latency)
+        if result.error is not None or result.status in THROTTLE_STATUSES or (result.status or 0) >= 500:
+            limiter.on_failure()
+        else:
+            limiter.on_success(latency)
+        if delay is None:
+            return result
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _fetch_all(url_items, headers, concurrency, rate, timeout, on_result, cache, policy):
+    import aiohttp
+
+    limiter = policy.limiter_for(concurrency)
+    bucket = TokenBucket(rate) if rate else None
+    # One pooled keep-alive connector shared by every request
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60)
+    results = [None] * len(url_items)
+
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        tasks = [
+            asyncio.ensure_future(_fetch_one(session, limiter, bucket, key, url, timeout, cache, policy))
+            for key, url in url_items
+        ]
+        index_of = {task: idx for idx, task in enumerate(tasks)}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if on_result is not None:
+                    result = on_result(result)
+                results[index_of[task]] = result
+    return results
+
+
+def fetch_concurrent(url_items, headers, concurrency=8, rate=None, timeout=10, on_result=None, cache=None,
+                     policy=None):
+    """
+    Fetch every (key, url) pair with up to `concurrency` requests in flight and at most
+    `rate` requests per second (None = unlimited). Results come back in input order.
+
+    Transient failures are retried per `policy` (common.fetch_policy.FetchPolicy); unless
+    it is built with adaptive=False, the number of requests in flight is lowered when
+    Strapi throttles, fails or slows down and raised back towards `concurrency` after.
+
+    `on_result` is called with each FetchResult as soon as it completes; whatever it returns
+    is stored instead of the raw result, so callers can turn payloads into rows early and
+    avoid holding every JSON response in memory.
+
+    With a `cache` (common.http_cache.ResponseCache), fresh entries are served
+    locally and everything else is fetched with conditional request headers.
+    """
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        raise SystemExit("❌ Async fetch mode needs aiohttp (pip install aiohttp)")
+
+    url_items = list(url_items)
+    policy = policy or FetchPolicy()
+    return asyncio.run(_fetch_all(url_items, headers, concurrency, rate, timeout, on_result, cache, policy))
+
+
+def fetch_many(url_items, headers, concurrency=1, rate=None, timeout=10, delay=0, cache=None, policy=None):
+    """Fetch (key, url) pairs sequentially (concurrency=1) or concurrently; results in input order."""
+    if concurrency > 1:
+        return fetch_concurrent(url_items, headers, concurrency=concurrency, rate=rate, timeout=timeout, cache=cache,
+                                policy=policy)
+    return list(fetch_sequential(url_items, headers, timeout=timeout, delay=delay, cache=cache, policy=policy))
+
+
+def build_query_url(base_url, params):
+    """Build a Strapi query URL from (name, value) pairs, e.g. ("pagination[page]", 2)."""
+    return f"{base_url}?{urlencode(params)}"
+
+
+def _collect_entries(results, label):
+    entries = []
+    for result in results:
+        if result.error is not None:
+            print(f"⚠️ Error fetching {label} {result.key}: {result.error}")
+        elif result.status != 200:
+            print(f"❌ Failed to fetch {label} {result.key} - HTTP {result.status}")
+        else:
+            entries.extend(result.payload.get("data", []))
+    return entries
+
+
+# Bulk listing: walk the whole collection page by page
+def fetch_collection(base_url, headers, params=(), page_size=100, concurrency=1, rate=None, timeout=10, delay=0,
+                     cache=None, policy=None):
+    """
+    Return (entries, request_count) for every entry of a Strapi collection.
+
+    The first page tells us `pageCount`; the remaining pages are then fetched
+    sequentially or concurrently depending on `concurrency`.
+    """
+    params = list(params)
+    policy = policy or FetchPolicy()
+
+    def page_url(page):
+        return build_query_url(base_url, params + [("pagination[page]", page), ("pagination[pageSize]", page_size)])
+
+    first = next(fetch_sequential([(1, page_url(1))], headers, timeout=timeout, delay=0, cache=cache, policy=policy))
+    if first.status != 200:
+        _collect_entries([first], "page")
+        return [], 1
+
+    entries = list(first.payload.get("data", []))
+    page_count = first.payload.get("meta", {}).get("pagination", {}).get("pageCount", 1)
+    rest = [(page, page_url(page)) for page in range(2, page_count + 1)]
+    results = fetch_many(rest, headers, concurrency, rate, timeout, delay, cache, policy)
+    entries.extend(_collect_entries(results, "page"))
+    return entries, 1 + len(rest)
+
+
+# Batched lookup: one `$in` filter per batch of links
+def fetch_by_values(base_url, headers, field, values, params=(), batch_size=50, concurrency=1, rate=None,
+                    timeout=10, delay=0, cache=None, policy=None):
+    """Return (entries, request_count) for all entries whose `field` is in `values`."""
+    params = list(params)
+    url_items = []
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        batch_params = [(f"filters[{field}][$in][{idx}]", value) for idx, value in enumerate(batch)]
+        # pageSize must cover the batch, otherwise Strapi's default of 25 truncates it
+        batch_params += [("pagination[page]", 1), ("pagination[pageSize]", len(batch))]
+        url_items.append((f"batch {start // batch_size + 1}", build_query_url(base_url, params + batch_params)))
+
+    entries = _collect_entries(fetch_many(url_items, headers, concurrency, rate, timeout, delay, cache, policy),
+                               "links")
+    return entries, len(url_items)
+
+
+def index_entries(entries, field="linkUrl"):
+    """Hash index of Strapi entries by one of their attributes: value -> [entries]."""
+    index = defaultdict(list)
+    for entry in entries:
+        value = entry.get("attributes", {}).get(field)
+        if value is not None:
+            index[value].append(entry)
+    return index
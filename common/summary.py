@@ -0,0 +1,101 @@
+"""
+Compare-report summaries computed from the status and similarity columns only.
+
+compareV5 used to count mismatching and missing URLs with
+`df.apply(lambda row: 'MISMATCH' in row.values, axis=1)`, a Python call per
+row that scans every cell, content included. `summarize_frame` selects the
+`<field>_status` columns once and counts with vectorized comparisons, so the
+cost depends on the number of rows and fields, not on the size of the texts.
+The same pass gives:
+
+    - per field: how many URLs matched, mismatched or had the value missing
+    - per field: a histogram of the scored `<field>_similarity` values
+
+`SummaryCounter` builds the same summary one row at a time, for reports that
+are written as they are produced (compareV5 --stream).
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+STATUSES = ("MATCH", "MISMATCH", "MISSING")
+# Left edges of the similarity histogram bins; the last bin holds exact 1.0 scores only
+BIN_EDGES = (0.0, 0.5, 0.8, 0.9, 0.95, 0.98, 1.0)
+BIN_LABELS = ("<0.5", "0.5-0.8", "0.8-0.9", "0.9-0.95", "0.95-0.98", "0.98-1", "1.0")
+
+
+def _empty_summary(fields):
+    return {
+        "total": 0, "mismatches": 0, "missing": 0,
+        "fields": {field: dict.fromkeys(STATUSES, 0) for field in fields},
+        "histograms": {field: [0] * len(BIN_LABELS) for field in fields},
+        "bins": list(BIN_LABELS),
+    }
+
+
+def _bin_index(scores):
+    """Histogram bin of each score (array of floats in [0, 1])."""
+    return np.searchsorted(BIN_EDGES, scores, side="right") - 1
+
+
+def summarize_frame(df, fields):
+    """Summary of a report DataFrame with <field>_status / <field>_similarity columns."""
+    summary = _empty_summary(fields)
+    summary["total"] = len(df)
+    if not len(df):
+        return summary
+
+    status = df[[f"{field}_status" for field in fields]].to_numpy(dtype=object)
+    for name, key in (("MISMATCH", "mismatches"), ("MISSING", "missing")):
+        summary[key] = int((status == name).any(axis=1).sum())
+    for name in STATUSES:
+        for field, count in zip(fields, (status == name).sum(axis=0)):
+            summary["fields"][field][name] = int(count)
+
+    for field in fields:
+        scores = pd.to_numeric(df[f"{field}_similarity"], errors="coerce").to_numpy(dtype=float)
+        scores = scores[~np.isnan(scores)]
+        counts = np.bincount(_bin_index(scores).clip(0, len(BIN_LABELS) - 1), minlength=len(BIN_LABELS))
+        summary["histograms"][field] = [int(count) for count in counts]
+    return summary
+
+
+class SummaryCounter:
+    """Row-at-a-time version of summarize_frame; rows are dicts like the ones written to the report."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.summary = _empty_summary(fields)
+
+    def add(self, row):
+        summary = self.summary
+        summary["total"] += 1
+        statuses = set()
+        for field in self.fields:
+            status = row.get(f"{field}_status")
+            if status in summary["fields"][field]:
+                summary["fields"][field][status] += 1
+                statuses.add(status)
+            try:
+                score = float(row.get(f"{field}_similarity"))
+            except (TypeError, ValueError):
+                continue  # Not scored (MISSING) or field skipped
+            summary["histograms"][field][min(int(_bin_index(score)), len(BIN_LABELS) - 1)] += 1
+        summary["mismatches"] += "MISMATCH" in statuses
+        summary["missing"] += "MISSING" in statuses
+
+
+def print_breakdown(summary):
+    """Per-field counts and similarity histograms, under the report's headline numbers."""
+    print(f"{'Field':<18} {'Match':>7} {'Mismatch':>9} {'Missing':>8}   Similarity " + " ".join(summary["bins"]))
+    for field, counts in summary["fields"].items():
+        histogram = " ".join(f"{count:>{len(label)}}" for label, count in zip(summary["bins"],
+                                                                                summary["histograms"][field]))
+        print(f"{field:<18} {counts['MATCH']:>7} {counts['MISMATCH']:>9} {counts['MISSING']:>8}   "
+              f"{'':<10} {histogram}")
+
+
+def save_summary(summary, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
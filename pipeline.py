@@ -0,0 +1,224 @@
+"""
+One command for a whole validation run: extract -> fetch -> compare -> report.
+
+    extract   Prod/prod_new_content.py   Contentful export JSON -> contentful.csv
+    fetch     Prod/prod_strapi_new.py    Contentful export JSON -> strapi.csv (one Strapi query per linkUrl)
+    compare   Prod/compareV5.py          contentful.csv + strapi.csv -> report.csv, summary.json
+    report    (this file)                report.csv + summary.json -> report.txt
+
+Every stage's outputs are cached in .pipeline_cache/ under a hash of its input
+files, its script's source (and the common modules it imports) and its options
+(see common.stage_cache), so a rerun skips every stage whose inputs did not
+change: editing a threshold in compareV5.py reruns compare and report only, a
+new Contentful export reruns everything. The final outputs are copied to
+--output-dir.
+
+The fetch stage reads a remote API the cache can't see into; use --force fetch
+to fetch again (later stages rerun only if the fetched data actually changed).
+A fetch that fails or is interrupted keeps what it got (see common.stage_cache),
+so running the pipeline again only fetches the links still missing.
+
+    python pipeline.py --contentful-json Prod/new.json
+    python pipeline.py compare --scoring bounded         # stop after compare
+    python pipeline.py --force fetch --strapi-mode async
+    python pipeline.py --dry-run                          # which stages would run
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from common.columnar import read_frame
+from common.similarity import add_similarity_argument
+from common.stage_cache import StageCache
+from common.summary import print_breakdown, summarize_frame
+
+sys.path.insert(0, os.path.join(ROOT, "Prod"))
+from compareV5 import content_fields
+from prod_strapi_new import (
+    DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, DEFAULT_RATE, STRAPI_API_BASE_URL
+)
+
+CACHE_DIR = os.path.join(ROOT, ".pipeline_cache")
+CONTENTFUL_JSON = os.path.join(ROOT, "Prod/data/content.json")
+OUTPUT_DIR = os.path.join(ROOT, "Prod/data/pipeline")
+
+# needs: upstream stages; inputs(args, upstream) -> {role: path}; config(args) -> options that change the output;
+# produce(args, inputs, work_dir) writes `outputs` into work_dir
+Stage = namedtuple("Stage", ["name", "script", "needs", "outputs", "inputs", "config", "produce"])
+
+
+def run_script(script, *options):
+    command = [sys.executable, os.path.join(ROOT, script), *options]
+    result = subprocess.run(command, cwd=ROOT)
+    if result.returncode != 0:
+        raise SystemExit(f"❌ {script} exited with status {result.returncode}")
+
+
+def produce_extract(args, inputs, work_dir):
+    run_script("Prod/prod_new_content.py", "--input", inputs["contentful_json"],
+               "--output", os.path.join(work_dir, "contentful.csv"))
+
+
+def fetch_config(args):
+    return {"base_url": args.strapi_base_url, "mode": args.strapi_mode, "page_size": args.page_size,
+            "batch_size": args.batch_size}
+
+
+def produce_fetch(args, inputs, work_dir):
+    options = ["--input", inputs["contentful_json"], "--output", os.path.join(work_dir, "strapi.csv"),
+               "--base-url", args.strapi_base_url, "--mode", args.strapi_mode,
+               "--concurrency", str(args.concurrency), "--rate", str(args.rate),
+               "--page-size", str(args.page_size), "--batch-size", str(args.batch_size)]
+    if args.strapi_cache_dir:
+        options += ["--cache-dir", args.strapi_cache_dir]
+    run_script("Prod/prod_strapi_new.py", *options)
+
+
+def produce_compare(args, inputs, work_dir):
+    options = ["--contentful", inputs["contentful"], "--strapi", inputs["strapi"],
+               "--output", os.path.join(work_dir, "report.csv"),
+               "--summary-json", os.path.join(work_dir, "summary.json"),
+               "--similarity", args.similarity, "--scoring", args.scoring, "--workers", str(args.workers)]
+    run_script("Prod/compareV5.py", *options)
+
+
+def produce_report(args, inputs, work_dir):
+    df = read_frame(inputs["report"])
+    summary = summarize_frame(df, content_fields)
+    status_columns = [f"{field}_status" for field in content_fields]
+    failing = df[(df[status_columns] == 'MISMATCH').any(axis=1) | (df[status_columns] == 'MISSING').any(axis=1)]
+
+    with open(os.path.join(work_dir, "report.txt"), "w", encoding="utf-8") as f, contextlib.redirect_stdout(f):
+        print("DATA VALIDATION REPORT")
+        print(f"Total URLs Compared: {summary['total']}")
+        print(f"Perfect Matches: {summary['total'] - summary['mismatches'] - summary['missing']}")
+        print(f"Mismatches Found: {summary['mismatches']}")
+        print(f"Missing Data Points: {summary['missing']}")
+        print()
+        print_breakdown(summary)
+        print()
+        print(f"URLs with a mismatching or missing field ({len(failing)}):")
+        for _, row in failing.iterrows():
+            fields = [field for field in content_fields if row[f"{field}_status"] in ('MISMATCH', 'MISSING')]
+            print(f"  {row['linkUrl']}: {', '.join(fields)}")
+    shutil.copyfile(inputs["report"], os.path.join(work_dir, "report.csv"))
+    shutil.copyfile(inputs["summary"], os.path.join(work_dir, "summary.json"))
+
+
+STAGES = {
+    "extract": Stage("extract", "Prod/prod_new_content.py", [], ["contentful.csv"],
+                     lambda args, up: {"contentful_json": args.contentful_json},
+                     lambda args: {}, produce_extract),
+    "fetch": Stage("fetch", "Prod/prod_strapi_new.py", [], ["strapi.csv"],
+                   lambda args, up: {"contentful_json": args.contentful_json},
+                   fetch_config, produce_fetch),
+    "compare": Stage("compare", "Prod/compareV5.py", ["extract", "fetch"], ["report.csv", "summary.json"],
+                     lambda args, up: {"contentful": os.path.join(up["extract"], "contentful.csv"),
+                                       "strapi": os.path.join(up["fetch"], "strapi.csv")},
+                     # --workers only changes how fast the same report is written
+                     lambda args: {"similarity": args.similarity, "scoring": args.scoring}, produce_compare),
+    "report": Stage("report", "pipeline.py", ["compare"], ["report.txt", "report.csv", "summary.json"],
+                    lambda args, up: {"report": os.path.join(up["compare"], "report.csv"),
+                                      "summary": os.path.join(up["compare"], "summary.json")},
+                    lambda args: {}, produce_report),
+}
+
+
+def plan(targets):
+    """Stages needed for `targets`, upstream first."""
+    order = []
+
+    def visit(name):
+        for need in STAGES[name].needs:
+            visit(need)
+        if name not in order:
+            order.append(name)
+
+    for target in targets:
+        visit(target)
+    return order
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Contentful -> Strapi validation with cached stages")
+    parser.add_argument("stages", nargs="*", metavar="stage",
+                        help=f"Stages to bring up to date, with what they depend on: {', '.join(STAGES)} (default: all)")
+    parser.add_argument("--contentful-json", default=CONTENTFUL_JSON, help="Contentful export JSON")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Where the last stage's outputs are copied")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--force", nargs="+", choices=list(STAGES), default=[],
+                        help="Rerun these stages even when cached")
+    parser.add_argument("--dry-run", action="store_true", help="Only show which stages are cached")
+    parser.add_argument("--strapi-base-url", default=STRAPI_API_BASE_URL)
+    parser.add_argument("--strapi-mode", choices=["sequential", "async", "bulk", "batch"], default="sequential")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--strapi-cache-dir", help="Persistent Strapi response cache (see prod_strapi_new.py)")
+    add_similarity_argument(parser)
+    parser.add_argument("--scoring", choices=["exact", "bounded"], default="exact")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    args.contentful_json = os.path.abspath(args.contentful_json)
+    if not os.path.exists(args.contentful_json):
+        parser.error(f"Contentful export not found: {args.contentful_json}")
+    return args
+
+
+def main():
+    args = parse_args()
+    order = plan(args.stages or list(STAGES))
+    cache = StageCache(args.cache_dir)
+    done = {}
+
+    print("\n" + "=" * 50)
+    try:
+        for name in order:
+            stage = STAGES[name]
+            if any(need not in done for need in stage.needs):
+                print(f"⏭️ {name}: waits for {', '.join(need for need in stage.needs if need not in done)}")
+                continue
+            inputs = stage.inputs(args, done)
+            key, description = cache.stage_key(name, os.path.join(ROOT, stage.script), inputs, stage.config(args))
+            cached = cache.lookup(name, key)
+
+            if cached and name not in args.force:
+                print(f"♻️ {name}: cached ({key[:12]})")
+                done[name] = cached
+            elif args.dry_run:
+                print(f"▶️ {name}: would run ({key[:12]})")
+            else:
+                print(f"▶️ {name}: {'resuming' if cache.partial(name, key) else 'running'} ({key[:12]})")
+                start = time.time()
+                done[name] = cache.run(name, key, description,
+                                       lambda work_dir: stage.produce(args, inputs, work_dir))
+                missing = [output for output in stage.outputs if not os.path.exists(os.path.join(done[name], output))]
+                if missing:
+                    shutil.rmtree(done[name])
+                    raise SystemExit(f"❌ {name} did not write {', '.join(missing)}")
+                print(f"✅ {name}: done in {time.time() - start:.1f}s")
+    finally:
+        cache.close()
+
+    last = order[-1]
+    if last in done and not args.dry_run:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for output in STAGES[last].outputs:
+            shutil.copyfile(os.path.join(done[last], output), os.path.join(args.output_dir, output))
+        print(f"📁 {last} outputs copied to {args.output_dir}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+A fetch stage that fails or is killed partway must resume on the next
+pipeline run instead of fetching everything again.
+
+    python -m pytest tests/test_pipeline_resume.py
+"""
+import glob
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from common.stage_cache import StageCache  # noqa: E402
+from mock_strapi import start_server  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+ENTRIES = 120
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("corpus")
+    write_corpus(str(directory), ENTRIES, seed=1)
+    with open(directory / "strapi.json", encoding="utf-8") as f:
+        entries = json.load(f)["data"]
+    return str(directory / "contentful.json"), entries
+
+
+def pipeline_fetch(contentful_json, base_url, cache_dir, output_dir, **popen):
+    command = [sys.executable, os.path.join(ROOT, "pipeline.py"), "fetch",
+               "--contentful-json", contentful_json, "--cache-dir", cache_dir, "--output-dir", output_dir,
+               "--strapi-base-url", base_url, "--strapi-mode", "async", "--concurrency", "1", "--rate", "0"]
+    return subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                            **popen)
+
+
+def journal_lines(cache_dir):
+    total = 0
+    for path in glob.glob(os.path.join(cache_dir, "fetch", "*.tmp", "strapi.csv.journal")):
+        with open(path, "rb") as f:
+            total += sum(1 for _ in f) - 1  # Minus the header
+    return total
+
+
+def test_killed_fetch_resumes(corpus, tmp_path):
+    contentful_json, entries = corpus
+    server, mock, base_url = start_server(entries=entries, latency=0.02)
+    try:
+        cache_dir, output_dir = str(tmp_path / "cache"), str(tmp_path / "out")
+
+        # Kill the whole run (pipeline.py and the fetch script it started) once part of it is journaled
+        first = pipeline_fetch(contentful_json, base_url, cache_dir, output_dir, start_new_session=True)
+        deadline = time.monotonic() + 60
+        while journal_lines(cache_dir) < ENTRIES // 4:
+            assert first.poll() is None, first.stdout.read()
+            assert time.monotonic() < deadline, "fetch made no progress"
+            time.sleep(0.05)
+        os.killpg(first.pid, signal.SIGKILL)
+        first.wait()
+        journaled = journal_lines(cache_dir)
+        assert glob.glob(os.path.join(cache_dir, "fetch", "*.tmp"))
+
+        before = mock.request_count
+        second = pipeline_fetch(contentful_json, base_url, cache_dir, output_dir)
+        log = second.communicate()[0]
+        assert second.returncode == 0, log
+        assert "fetch: resuming" in log
+        assert f"Resuming: {journaled} links already fetched" in log
+        assert mock.request_count - before <= ENTRIES - journaled + 2  # + the updatedAt listing, if any
+        assert not glob.glob(os.path.join(cache_dir, "fetch", "*.tmp"))
+
+        # Same output as a run that was never interrupted
+        clean_cache, clean_output = str(tmp_path / "clean_cache"), str(tmp_path / "clean_out")
+        clean = pipeline_fetch(contentful_json, base_url, clean_cache, clean_output)
+        assert clean.wait() == 0
+        with open(os.path.join(output_dir, "strapi.csv"), "rb") as resumed, \
+                open(os.path.join(clean_output, "strapi.csv"), "rb") as expected:
+            assert resumed.read() == expected.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_failed_stage_keeps_its_work_dir(tmp_path):
+    cache = StageCache(str(tmp_path))
+    description = {"stage": "fetch"}
+
+    def failing(work_dir):
+        with open(os.path.join(work_dir, "progress"), "w") as f:
+            f.write("half")
+        raise SystemExit("fetch failed")
+
+    with pytest.raises(SystemExit):
+        cache.run("fetch", "k", description, failing)
+    assert cache.partial("fetch", "k")
+    assert cache.lookup("fetch", "k") is None
+
+    def resuming(work_dir):
+        with open(os.path.join(work_dir, "progress")) as f:
+            assert f.read() == "half"
+        with open(os.path.join(work_dir, "strapi.csv"), "w") as f:
+            f.write("done")
+
+    directory = cache.run("fetch", "k", description, resuming)
+    assert cache.lookup("fetch", "k") == directory
+    assert not cache.partial("fetch", "k")
+    cache.close()
@@ -0,0 +1,65 @@
+"""
+The cheap bounds in common.similarity must never sit below the exact score,
+otherwise bounded scoring reports a field as a mismatch when it passes.
+
+    python -m pytest tests/test_similarity_bounds.py
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.similarity import (  # noqa: E402
+    SHORT_TEXT_LENGTH, _tfidf_cosine_bound, calculate_field_similarity, threshold_similarity
+)
+
+WORDS = [
+    "Steel", "STEEL", "steel", "TMT-bars", "bars!", "don't", "e-mail", "snake_case", "x", "a1", "42",
+    "Ünïcödé", "ÜNÏCÖDÉ", "Straße", "STRASSE", "İstanbul", "naïve", "café", "CAFÉ", "Ωmega", "ωμέγα",
+    "日本語", "テキスト", "संस्कृत", "١٢٣", "emoji😀", "😀😀", "—", "...", "«quoted»", "(paren)", "$5.00", "#tag",
+]
+
+
+def random_text(rng, words):
+    return rng.choice(["", " ", "\n", ", ", "; "]).join(rng.choice(words) for _ in range(rng.randint(1, 60)))
+
+
+def text_pairs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text1 = random_text(rng, WORDS)
+        if rng.random() < 0.5:
+            # A small edit of the first text, where the scores land close to the thresholds
+            tokens = text1.split(" ")
+            for _ in range(rng.randint(1, 3)):
+                tokens[rng.randrange(len(tokens))] = rng.choice(WORDS)
+            text2 = " ".join(tokens)
+        else:
+            text2 = random_text(rng, WORDS)
+        yield text1, text2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tfidf_bound_is_never_below_the_exact_score(seed):
+    checked = 0
+    for text1, text2 in text_pairs(200, seed):
+        if len(text1) < SHORT_TEXT_LENGTH and len(text2) < SHORT_TEXT_LENGTH:
+            continue  # Short pairs are scored by SequenceMatcher, not TF-IDF
+        bound = _tfidf_cosine_bound(text1, text2)
+        if bound is None:
+            continue  # No token on either side: the exact path falls back to SequenceMatcher too
+        assert bound >= calculate_field_similarity(text1, text2), (text1, text2)
+        checked += 1
+    assert checked > 50
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.9, 0.95, 0.98, 0.99])
+def test_threshold_verdict_matches_the_exact_score(threshold):
+    for text1, text2 in text_pairs(300, seed=int(threshold * 100)):
+        verdict = threshold_similarity(text1, text2, threshold, digits=3)
+        exact = calculate_field_similarity(text1, text2)
+        assert verdict.passed == (round(exact, 3) >= threshold), (text1, text2)
+        if not verdict.exact:
+            assert verdict.score >= exact, (text1, text2)